@@ -4,9 +4,22 @@ varianza y desviación estándar a partir de un archivo de entrada.
 Guarda los resultados en un archivo y muestra el tiempo de ejecución.
 """
 
-import sys
+import argparse
+import glob
+import hashlib
+import json
 import time
 import math
+import mmap
+import os
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él se usa array('d').
+    np = None
 
 def read_numbers(filename):
     """Lee números de un archivo, ignora valores inválidos y devuelve una lista de números."""
@@ -36,25 +49,690 @@ def compute_statistics(numbers):
 
     return mean, median, mode, variance, std_dev
 
+def pick_mode(frequencies):
+    """
+    Devuelve el valor más frecuente de una tabla {valor: frecuencia}
+    ordenada por primera aparición, o "#N/A" si la tabla quedó vacía
+    (en modo aproximado ningún valor se repite lo suficiente).
+    """
+    if not frequencies:
+        return "#N/A"
+    # Se recorre un set construido elemento a elemento para que los empates
+    # se resuelvan igual que max(set(numbers), key=numbers.count).
+    return max(set(iter(frequencies)), key=frequencies.__getitem__)
+
+class QuantileSketch:
+    """
+    Sketch de cuantiles aproximado con error relativo acotado (estilo DDSketch).
+    Agrupa los valores en cubetas logarítmicas, usa memoria acotada por
+    max_buckets y dos sketches con la misma precisión se pueden combinar.
+    """
+
+    def __init__(self, relative_accuracy=0.01, max_buckets=2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.log_gamma = math.log((1 + relative_accuracy) / (1 - relative_accuracy))
+        self.positive = {}
+        self.negative = {}
+        self.zero_count = 0
+        self.count = 0
+
+    @property
+    def gamma(self):
+        """Razón entre los límites de dos cubetas consecutivas."""
+        return (1 + self.relative_accuracy) / (1 - self.relative_accuracy)
+
+    def _index(self, magnitude):
+        """Devuelve la cubeta logarítmica que contiene una magnitud positiva."""
+        return math.ceil(math.log(magnitude) / self.log_gamma)
+
+    def _bucket_value(self, index):
+        """Devuelve el valor representativo de una cubeta."""
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def _collapse(self, buckets):
+        """Une las cubetas de menor magnitud hasta respetar max_buckets."""
+        if len(buckets) <= self.max_buckets:
+            return
+        indexes = sorted(buckets)
+        excess = len(indexes) - self.max_buckets
+        target = indexes[excess]
+        for index in indexes[:excess]:
+            buckets[target] += buckets.pop(index)
+
+    def add(self, value, weight=1):
+        """Agrega un valor al sketch."""
+        self.count += weight
+        if value > 0:
+            buckets = self.positive
+        elif value < 0:
+            buckets = self.negative
+        else:
+            self.zero_count += weight
+            return
+        index = self._index(abs(value))
+        if index in buckets:
+            buckets[index] += weight
+        else:
+            buckets[index] = weight
+            self._collapse(buckets)
+
+    def merge(self, other):
+        """Combina otro sketch con la misma precisión en este."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Los sketches deben tener la misma precisión.")
+        for mine, theirs in ((self.positive, other.positive),
+                             (self.negative, other.negative)):
+            for index, weight in theirs.items():
+                mine[index] = mine.get(index, 0) + weight
+            self._collapse(mine)
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def to_dict(self):
+        """Convierte el sketch en un diccionario serializable a JSON."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_buckets": self.max_buckets,
+            "positive": list(self.positive.items()),
+            "negative": list(self.negative.items()),
+            "zero_count": self.zero_count,
+            "count": self.count
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Reconstruye un sketch a partir de to_dict()."""
+        sketch = cls(data["relative_accuracy"], data["max_buckets"])
+        sketch.positive = dict(data["positive"])
+        sketch.negative = dict(data["negative"])
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        return sketch
+
+    def value_at_rank(self, rank):
+        """Devuelve el valor aproximado en la posición rank (base 0) del orden."""
+        cumulative = 0
+        for index in sorted(self.negative, reverse=True):
+            cumulative += self.negative[index]
+            if cumulative > rank:
+                return -self._bucket_value(index)
+        cumulative += self.zero_count
+        if cumulative > rank:
+            return 0.0
+        for index in sorted(self.positive):
+            cumulative += self.positive[index]
+            if cumulative > rank:
+                return self._bucket_value(index)
+        raise IndexError("Posición fuera del rango del sketch.")
+
+
+class StreamingStats:
+    """
+    Acumulador de una sola pasada: cuenta, suma y M2 con el método de Welford,
+    más una tabla de frecuencias por hash para la moda y la mediana exacta.
+    Con approximate=True la mediana sale de un QuantileSketch y la tabla de
+    frecuencias se limita a max_distinct valores (resumen Misra-Gries), de modo
+    que la memoria queda acotada sin importar el tamaño de la entrada.
+    """
+
+    def __init__(self, approximate=False, max_distinct=100_000):
+        self.max_distinct = max_distinct
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.frequencies = {}
+        self.sketch = QuantileSketch() if approximate else None
+
+    @property
+    def approximate(self):
+        """Indica si la mediana y la moda son aproximadas (hay sketch)."""
+        return self.sketch is not None
+
+    def add(self, value):
+        """Actualiza los agregados con un nuevo valor."""
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+        frequencies = self.frequencies
+        if value in frequencies:
+            frequencies[value] += 1
+        elif not self.approximate or len(frequencies) < self.max_distinct:
+            frequencies[value] = 1
+        else:
+            # Paso de Misra-Gries: descuenta una unidad a todos los candidatos.
+            for key in list(frequencies):
+                frequencies[key] -= 1
+                if not frequencies[key]:
+                    del frequencies[key]
+        if self.sketch is not None:
+            self.sketch.add(value)
+
+    def merge(self, other):
+        """Combina los agregados de otro acumulador (fórmula de Chan)."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.mean, self.m2 = other.mean, other.m2
+        else:
+            count = self.count + other.count
+            delta = other.mean - self.mean
+            self.m2 += other.m2 + delta * delta * self.count * other.count / count
+            self.mean += delta * other.count / count
+        self.count += other.count
+        self.total += other.total
+
+        for value, weight in other.frequencies.items():
+            self.frequencies[value] = self.frequencies.get(value, 0) + weight
+        if self.approximate and len(self.frequencies) > self.max_distinct:
+            weights = sorted(self.frequencies.values(), reverse=True)
+            threshold = weights[self.max_distinct]
+            self.frequencies = {
+                value: weight - threshold
+                for value, weight in self.frequencies.items()
+                if weight > threshold
+            }
+        if self.sketch is not None and other.sketch is not None:
+            self.sketch.merge(other.sketch)
+
+    def to_dict(self):
+        """Convierte los agregados en un diccionario serializable a JSON."""
+        return {
+            "approximate": self.approximate,
+            "max_distinct": self.max_distinct,
+            "count": self.count,
+            "total": self.total,
+            "mean": self.mean,
+            "m2": self.m2,
+            "frequencies": list(self.frequencies.items()),
+            "sketch": self.sketch.to_dict() if self.sketch is not None else None
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Reconstruye un acumulador a partir de to_dict()."""
+        accumulator = cls(data["approximate"], data["max_distinct"])
+        accumulator.count = data["count"]
+        accumulator.total = data["total"]
+        accumulator.mean = data["mean"]
+        accumulator.m2 = data["m2"]
+        accumulator.frequencies = dict(data["frequencies"])
+        if data["sketch"] is not None:
+            accumulator.sketch = QuantileSketch.from_dict(data["sketch"])
+        return accumulator
+
+    def _median(self):
+        """Calcula la mediana exacta seleccionando sobre la tabla de frecuencias."""
+        lower_rank = (self.count - 1) // 2
+        upper_rank = self.count // 2
+        if self.sketch is not None:
+            lower = self.sketch.value_at_rank(lower_rank)
+            upper = self.sketch.value_at_rank(upper_rank)
+        else:
+            lower = upper = None
+            cumulative = 0
+            for value in sorted(self.frequencies):
+                cumulative += self.frequencies[value]
+                if lower is None and cumulative > lower_rank:
+                    lower = value
+                if cumulative > upper_rank:
+                    upper = value
+                    break
+        if lower_rank == upper_rank:
+            return lower
+        return (lower + upper) / 2
+
+    def result(self):
+        """Devuelve media, mediana, moda, varianza y desviación estándar."""
+        if self.count == 0:
+            return None
+        mean = self.total / self.count
+        variance = self.m2 / self.count
+        return (
+            mean, self._median(), pick_mode(self.frequencies),
+            variance, math.sqrt(variance)
+        )
+
+
+def stream_numbers(filename):
+    """Genera los números de un archivo uno a uno, sin guardarlos en memoria."""
+    with open(filename, "r", encoding="utf-8") as file:
+        for line in file:
+            try:
+                yield float(line.strip())
+            except ValueError:
+                print(f"Error: '{line.strip()}' no es un número válido.")
+
+def compute_statistics_streaming(filename, approximate=False):
+    """Calcula las estadísticas leyendo el archivo una sola vez."""
+    accumulator = StreamingStats(approximate=approximate)
+    for number in stream_numbers(filename):
+        accumulator.add(number)
+    return accumulator.result()
+
+def read_numbers_buffer(filename, max_invalid_details=0):
+    """
+    Lee el archivo completo en un buffer contiguo array('d') en bloque.
+    Devuelve el buffer, la cantidad de valores inválidos y una lista con
+    a lo más max_invalid_details de ellos.
+    """
+    with open(filename, "r", encoding="utf-8") as file:
+        tokens = file.read().split("\n")
+    if tokens[-1] == "":
+        tokens.pop()
+    try:
+        return array("d", map(float, tokens)), 0, []
+    except ValueError:
+        pass
+
+    buffer = array("d")
+    invalid_count = 0
+    invalid_details = []
+    for token in tokens:
+        try:
+            buffer.append(float(token))
+        except ValueError:
+            invalid_count += 1
+            if len(invalid_details) < max_invalid_details:
+                invalid_details.append(token.strip())
+    return buffer, invalid_count, invalid_details
+
+def numpy_mode(values):
+    """Calcula la moda de un arreglo de NumPy con los empates de pick_mode."""
+    uniques, first_index, counts = np.unique(
+        values, return_index=True, return_counts=True
+    )
+    tied = np.flatnonzero(counts == counts.max())
+    if len(tied) == 1:
+        return float(uniques[tied[0]])
+    order = np.argsort(first_index)
+    return pick_mode(dict(zip(uniques[order].tolist(), counts[order].tolist())))
+
+def compute_statistics_vectorized(buffer):
+    """
+    Calcula las estadísticas sobre un buffer array('d') con operaciones en
+    bloque: NumPy si está instalado, o funciones nativas de Python si no.
+    Con NumPy, la media y la varianza se suman por pares, así que pueden
+    diferir del motor list en los últimos dígitos.
+    """
+    n = len(buffer)
+    if n == 0:
+        return None
+
+    if np is None:
+        mean = sum(buffer) / n
+        sorted_numbers = sorted(buffer)
+        lower, upper = sorted_numbers[(n - 1) // 2], sorted_numbers[n // 2]
+        mode = pick_mode(Counter(buffer))
+        variance = sum((x - mean) ** 2 for x in buffer) / n
+    else:
+        values = np.frombuffer(buffer, dtype=np.float64)
+        mean = float(values.sum()) / n
+        partitioned = np.partition(values, ((n - 1) // 2, n // 2))
+        lower, upper = float(partitioned[(n - 1) // 2]), float(partitioned[n // 2])
+        mode = numpy_mode(values)
+        variance = float(np.square(values - mean).sum()) / n
+
+    median = lower if n % 2 != 0 else (lower + upper) / 2
+    return mean, median, mode, variance, math.sqrt(variance)
+
+def split_chunks(filename, parts):
+    """
+    Divide el archivo en hasta parts rangos de bytes (inicio, fin)
+    que terminan siempre en un salto de línea.
+    """
+    size = os.path.getsize(filename)
+    if size == 0:
+        return []
+    boundaries = [0]
+    with open(filename, "rb") as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for part in range(1, parts):
+            position = max(size * part // parts, boundaries[-1])
+            newline = data.find(b"\n", position)
+            if newline == -1:
+                break
+            boundaries.append(newline + 1)
+    boundaries.append(size)
+    return [
+        (start, end)
+        for start, end in zip(boundaries, boundaries[1:])
+        if end > start
+    ]
+
+# Tamaño máximo de cada bloque que se copia del mmap para partirlo en líneas;
+# con líneas cortas cada MiB se convierte en unos 8 MB de objetos bytes.
+BLOCK_BYTES = 1024 * 1024
+
+def iter_blocks(data, start, end, block_bytes=BLOCK_BYTES):
+    """
+    Genera las líneas del rango [start, end) de un mmap en listas de a lo
+    más block_bytes bytes cortadas en saltos de línea, para que la memoria
+    no dependa del tamaño del rango.
+    """
+    position = start
+    while position < end:
+        block_end = min(position + block_bytes, end)
+        if block_end < end:
+            newline = data.rfind(b"\n", position, block_end)
+            if newline == -1:
+                newline = data.find(b"\n", block_end, end)
+            block_end = newline + 1 if newline != -1 else end
+        lines = data[position:block_end].split(b"\n")
+        if lines[-1] == b"":
+            lines.pop()
+        yield lines
+        position = block_end
+
+def reduce_chunk(filename, start, end, approximate=False, max_invalid_details=0):
+    """
+    Procesa un rango de bytes del archivo y devuelve sus agregados parciales
+    (StreamingStats), la cantidad de valores inválidos y algunos ejemplos.
+    """
+    accumulator = StreamingStats(approximate=approximate)
+    invalid_count = 0
+    invalid_details = []
+    with open(filename, "rb") as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for lines in iter_blocks(data, start, end):
+            for line in lines:
+                try:
+                    accumulator.add(float(line))
+                except ValueError:
+                    invalid_count += 1
+                    if len(invalid_details) < max_invalid_details:
+                        invalid_details.append(
+                            line.decode("utf-8", "replace").strip()
+                        )
+    return accumulator, invalid_count, invalid_details
+
+def compute_statistics_parallel(filename, workers, approximate=False,
+                                max_invalid_details=0):
+    """
+    Calcula las estadísticas repartiendo el archivo mapeado en memoria entre
+    varios procesos y combinando sus agregados parciales en orden.
+    """
+    chunks = split_chunks(filename, workers)
+    total = StreamingStats(approximate=approximate)
+    invalid_count = 0
+    invalid_details = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                reduce_chunk, filename, start, end,
+                approximate, max_invalid_details
+            )
+            for start, end in chunks
+        ]
+        for future in futures:
+            partial, partial_invalid, partial_details = future.result()
+            total.merge(partial)
+            invalid_count += partial_invalid
+            invalid_details.extend(partial_details)
+    report_invalid(invalid_count, invalid_details[:max_invalid_details])
+    return total.result()
+
+def reduce_file(filename, approximate=False, max_invalid_details=0):
+    """Procesa un archivo completo y devuelve sus agregados parciales."""
+    size = os.path.getsize(filename)
+    if size == 0:
+        return StreamingStats(approximate=approximate), 0, []
+    return reduce_chunk(filename, 0, size, approximate, max_invalid_details)
+
+def compute_statistics_batch(filenames, workers=None, approximate=False,
+                             max_invalid_details=0):
+    """
+    Procesa varios archivos en paralelo y devuelve una lista de filas
+    (nombre, cuenta, estadísticas) con una fila por archivo y una fila
+    TOTAL obtenida al combinar los agregados parciales, sin releer datos.
+    """
+    rows = []
+    total = StreamingStats(approximate=approximate)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(reduce_file, filename, approximate, max_invalid_details)
+            for filename in filenames
+        ]
+        for filename, future in zip(filenames, futures):
+            try:
+                partial, invalid_count, invalid_details = future.result()
+            except FileNotFoundError:
+                print(f"Error: El archivo {filename} no existe.")
+                continue
+            if invalid_count:
+                print(f"Archivo {filename}:")
+                report_invalid(invalid_count, invalid_details)
+            rows.append((filename, partial.count, partial.result()))
+            total.merge(partial)
+    rows.append(("TOTAL", total.count, total.result()))
+    return rows
+
+def format_batch_table(rows):
+    """Da formato a las filas del modo por lotes como una tabla en columnas."""
+    header = (
+        f"{'ARCHIVO':<25} {'N':<8} {'MEDIA':<24} {'MEDIANA':<24} "
+        f"{'MODA':<24} {'VARIANZA':<24} {'DESV. ESTÁNDAR':<24}"
+    )
+    lines = [header]
+    for name, count, stats in rows:
+        if stats is None:
+            lines.append(f"{name:<25} {count:<8}")
+            continue
+        mean, median, mode, variance, std_dev = stats
+        lines.append(
+            f"{name:<25} {count:<8} {mean:<24} {median:<24} "
+            f"{mode:<24} {variance:<24} {std_dev:<24}"
+        )
+    return "\n".join(lines)
+
+def expand_filenames(patterns):
+    """Expande los patrones glob; los que no coinciden se mantienen tal cual."""
+    filenames = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern))
+        filenames.extend(matches if matches else [pattern])
+    return filenames
+
+FINGERPRINT_BYTES = 4096
+
+def file_fingerprint(filename, offset):
+    """
+    Calcula un hash SHA-256 del inicio y del final del prefijo [0, offset)
+    para detectar si un archivo fue reescrito sin volver a leerlo completo.
+    """
+    digest = hashlib.sha256()
+    with open(filename, "rb") as file:
+        digest.update(file.read(min(offset, FINGERPRINT_BYTES)))
+        file.seek(max(0, offset - FINGERPRINT_BYTES))
+        digest.update(file.read(min(offset, FINGERPRINT_BYTES)))
+    return digest.hexdigest()
+
+def load_checkpoint(checkpoint_path, filename, approximate):
+    """
+    Carga el checkpoint si sigue siendo válido para el archivo; devuelve
+    None si no existe, está corrupto, el archivo se truncó o fue reescrito.
+    """
+    if not os.path.exists(checkpoint_path):
+        return None
+    try:
+        with open(checkpoint_path, "r", encoding="utf-8") as file:
+            checkpoint = json.load(file)
+        offset = checkpoint["offset"]
+        if (checkpoint["approximate"] != approximate
+                or os.path.getsize(filename) < offset
+                or file_fingerprint(filename, offset) != checkpoint["fingerprint"]):
+            return None
+        return offset, StreamingStats.from_dict(checkpoint["stats"])
+    except (json.JSONDecodeError, KeyError, TypeError):
+        return None
+
+def save_checkpoint(checkpoint_path, filename, offset, accumulator):
+    """Guarda el checkpoint de forma atómica (archivo temporal + rename)."""
+    checkpoint = {
+        "offset": offset,
+        "approximate": accumulator.approximate,
+        "fingerprint": file_fingerprint(filename, offset),
+        "stats": accumulator.to_dict()
+    }
+    temporary_path = checkpoint_path + ".tmp"
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        json.dump(checkpoint, file)
+    os.replace(temporary_path, checkpoint_path)
+
+def complete_lines_end(filename, offset, size):
+    """Devuelve la posición siguiente al último salto de línea desde offset."""
+    if size <= offset:
+        return offset
+    with open(filename, "rb") as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return data.rfind(b"\n", offset) + 1 or offset
+
+def compute_statistics_incremental(filename, approximate=False,
+                                   max_invalid_details=0):
+    """
+    Calcula las estadísticas de un archivo que solo crece al final.
+    Reanuda desde el checkpoint <archivo>.checkpoint.json y procesa solo las
+    líneas nuevas; si el archivo se truncó o reescribió, recalcula todo.
+    """
+    checkpoint_path = filename + ".checkpoint.json"
+    size = os.path.getsize(filename)
+    offset, accumulator = (
+        load_checkpoint(checkpoint_path, filename, approximate)
+        or (0, StreamingStats(approximate=approximate))
+    )
+
+    # Solo se guardan en el checkpoint las líneas completas; una última
+    # línea sin salto se cuenta en este resultado y se relee la próxima vez.
+    complete_end = complete_lines_end(filename, offset, size)
+
+    invalid_count = 0
+    invalid_details = []
+    if complete_end > offset:
+        partial, invalid_count, invalid_details = reduce_chunk(
+            filename, offset, complete_end, approximate, max_invalid_details
+        )
+        accumulator.merge(partial)
+    save_checkpoint(checkpoint_path, filename, complete_end, accumulator)
+
+    if size > complete_end:
+        partial, fragment_invalid, fragment_details = reduce_chunk(
+            filename, complete_end, size, approximate, max_invalid_details
+        )
+        result = StreamingStats(approximate=approximate)
+        result.merge(accumulator)
+        result.merge(partial)
+        invalid_count += fragment_invalid
+        invalid_details.extend(fragment_details)
+        accumulator = result
+
+    report_invalid(invalid_count, invalid_details[:max_invalid_details])
+    return accumulator.result()
+
+def report_invalid(invalid_count, invalid_details):
+    """Muestra el resumen de valores inválidos ignorados."""
+    if invalid_count:
+        print(f"Valores inválidos ignorados: {invalid_count}")
+        for token in invalid_details:
+            print(f"Error: '{token}' no es un número válido.")
+
+def format_statistics(stats):
+    """Da formato a las estadísticas como en StatisticsResults.txt."""
+    mean, median, mode, variance, std_dev = stats
+    return (
+        f"Media: {mean}\n"
+        f"Mediana: {median}\n"
+        f"Moda: {mode}\n"
+        f"Varianza: {variance}\n"
+        f"Desviación estándar: {std_dev}"
+    )
+
+def parse_arguments():
+    """Lee los argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(
+        description="Calcula estadísticas descriptivas de un archivo de números."
+    )
+    parser.add_argument(
+        "filenames", nargs="+", metavar="filename",
+        help=(
+            "archivo con un número por línea; con varios archivos o patrones "
+            "glob se genera una tabla por lotes con una fila por archivo"
+        )
+    )
+    parser.add_argument(
+        "--engine", choices=("list", "stream", "vector"), default="list",
+        help=(
+            "list: carga todo en una lista; stream: una sola pasada en memoria "
+            "acotada; vector: buffer contiguo y operaciones en bloque"
+        )
+    )
+    parser.add_argument(
+        "--approximate", action="store_true",
+        help="con --engine stream, estima la mediana con un sketch de cuantiles"
+    )
+    parser.add_argument(
+        "--invalid-details", type=int, default=0, metavar="N",
+        help="con --engine vector o --workers, muestra hasta N valores inválidos"
+    )
+    parser.add_argument(
+        "--checkpoint", action="store_true",
+        help=(
+            "guarda los agregados en <archivo>.checkpoint.json y en las "
+            "siguientes ejecuciones procesa solo las líneas agregadas al final"
+        )
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, metavar="N",
+        help=(
+            "procesa el archivo en N procesos sobre un mmap y combina "
+            "los agregados parciales del motor stream; en modo por lotes "
+            "limita la cantidad de procesos (por defecto, uno por CPU)"
+        )
+    )
+    return parser.parse_args()
+
 def main():
     """Función principal que ejecuta el programa."""
     start_time = time.time()
-    if len(sys.argv) != 2:
-        print("Uso: python compute_statistics.py fileWithData.txt")
+    args = parse_arguments()
+    filenames = expand_filenames(args.filenames)
+    if len(filenames) > 1:
+        rows = compute_statistics_batch(
+            filenames, args.workers, args.approximate, args.invalid_details
+        )
+        output = format_batch_table(rows)
+        print(output)
+        with open("StatisticsResults.txt", "w", encoding="utf-8") as file:
+            file.write(output)
+        elapsed_time = time.time() - start_time
+        print(f"Tiempo de ejecución: {elapsed_time:.2f} segundos")
         return
-    filename = sys.argv[1]
+
+    filename = filenames[0]
     try:
-        numbers = read_numbers(filename)
-        stats = compute_statistics(numbers)
-        if stats:
-            mean, median, mode, variance, std_dev = stats
-            output = (
-                f"Media: {mean}\n"
-                f"Mediana: {median}\n"
-                f"Moda: {mode}\n"
-                f"Varianza: {variance}\n"
-                f"Desviación estándar: {std_dev}"
+        if args.checkpoint:
+            stats = compute_statistics_incremental(
+                filename, args.approximate, args.invalid_details
+            )
+        elif args.workers is not None and args.workers > 1:
+            stats = compute_statistics_parallel(
+                filename, args.workers, args.approximate, args.invalid_details
             )
+        elif args.engine == "stream":
+            stats = compute_statistics_streaming(filename, args.approximate)
+        elif args.engine == "vector":
+            buffer, invalid_count, invalid_details = read_numbers_buffer(
+                filename, args.invalid_details
+            )
+            report_invalid(invalid_count, invalid_details)
+            stats = compute_statistics_vectorized(buffer)
+        else:
+            stats = compute_statistics(read_numbers(filename))
+        if stats:
+            output = format_statistics(stats)
             print(output)
 
             with open("StatisticsResults.txt", "w", encoding="utf-8") as file:
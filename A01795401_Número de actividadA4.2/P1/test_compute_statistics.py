@@ -0,0 +1,317 @@
+"""
+Pruebas unitarias para los motores de compute_statistics.
+"""
+
+import glob
+import io
+import json
+import math
+import mmap
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import compute_statistics as compute_statistics_module
+from compute_statistics import (
+    StreamingStats, compute_statistics, compute_statistics_batch,
+    compute_statistics_incremental, compute_statistics_parallel,
+    compute_statistics_streaming, compute_statistics_vectorized,
+    format_batch_table, format_statistics, iter_blocks, read_numbers,
+    read_numbers_buffer, reduce_chunk
+)
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+# Archivos de ejemplo pequeños: el motor list es O(n·d) por la moda.
+SMALL_FILES = [
+    os.path.join(DIRECTORY, name)
+    for name in ("fileWithData.txt", "fileWithData-2.txt")
+]
+
+
+def list_statistics(filenames):
+    """Cuenta y estadísticas del motor list sobre los archivos concatenados."""
+    numbers = []
+    with redirect_stdout(io.StringIO()):
+        for filename in filenames:
+            numbers.extend(read_numbers(filename))
+    return len(numbers), compute_statistics(numbers)
+
+
+class StatisticsCase(unittest.TestCase):
+    """
+    Crea dos archivos con valores repetidos entre sí, una línea inválida y
+    el último sin salto de línea final.
+    """
+
+    def setUp(self):
+        """Crea los archivos temporales."""
+        self.directory = tempfile.mkdtemp()
+        self.first = os.path.join(self.directory, "first.txt")
+        self.second = os.path.join(self.directory, "second.txt")
+        with open(self.first, "w", encoding="utf-8") as file:
+            file.write("1\n2\n2\nabc\n3.5\n")
+        with open(self.second, "w", encoding="utf-8") as file:
+            file.write("2\n-4\n10\n10\n10")
+
+    def tearDown(self):
+        """Elimina los archivos temporales."""
+        shutil.rmtree(self.directory)
+
+    def assert_same_statistics(self, stats, expected):
+        """
+        Mediana y moda exactas; media, varianza y desviación salvo por el
+        redondeo de la combinación de agregados parciales.
+        """
+        self.assertEqual(stats[1:3], expected[1:3])
+        for index in (0, 3, 4):
+            self.assertTrue(
+                math.isclose(stats[index], expected[index], rel_tol=1e-9),
+                (index, stats[index], expected[index])
+            )
+
+
+class TestApproximateMode(unittest.TestCase):
+    """Pruebas de la moda en modo aproximado (resumen Misra-Gries)."""
+
+    def setUp(self):
+        """Crea un archivo con más valores distintos que max_distinct."""
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, "numbers.txt")
+        with open(self.filename, "w", encoding="utf-8") as file:
+            file.writelines(f"{value}\n" for value in range(100_001))
+
+    def tearDown(self):
+        """Elimina los archivos temporales."""
+        shutil.rmtree(self.directory)
+
+    def test_empty_frequency_table(self):
+        """Si el descuento vacía la tabla la moda se reporta como #N/A."""
+        accumulator = StreamingStats(approximate=True, max_distinct=3)
+        for value in (1.0, 2.0, 3.0, 4.0):
+            accumulator.add(value)
+        self.assertEqual(accumulator.frequencies, {})
+        mean, _, mode, _, _ = accumulator.result()
+        self.assertEqual(mean, 2.5)
+        self.assertEqual(mode, "#N/A")
+        self.assertIn("Moda: #N/A", format_statistics(accumulator.result()))
+
+    def test_stream_engine_all_distinct(self):
+        """El motor stream aproximado no falla con 100001 valores distintos."""
+        stats = compute_statistics_streaming(self.filename, approximate=True)
+        self.assertEqual(stats[0], 50_000.0)
+        self.assertEqual(stats[2], "#N/A")
+
+    def test_checkpoint_all_distinct(self):
+        """El modo --checkpoint aproximado no falla con valores distintos."""
+        with redirect_stdout(io.StringIO()):
+            first = compute_statistics_incremental(self.filename, True)
+            second = compute_statistics_incremental(self.filename, True)
+        self.assertEqual(first[2], "#N/A")
+        self.assertEqual(second[0], first[0])
+
+
+class TestVectorEngine(unittest.TestCase):
+    """Pruebas del motor vector contra el motor list."""
+
+    def test_same_values_as_list_engine(self):
+        """
+        El motor vector da la misma mediana y moda que el motor list, y la
+        media, varianza y desviación salvo por el redondeo de las sumas de
+        NumPy; sin NumPy, exactamente los mismos valores.
+        """
+        filenames = sorted(glob.glob(os.path.join(DIRECTORY, "fileWithData*.txt")))
+        self.assertTrue(filenames)
+        for filename in filenames:
+            with self.subTest(filename=os.path.basename(filename)):
+                with redirect_stdout(io.StringIO()):
+                    expected = compute_statistics(read_numbers(filename))
+                buffer, _, _ = read_numbers_buffer(filename)
+                stats = compute_statistics_vectorized(buffer)
+                self.assertEqual(stats[1:3], expected[1:3])
+                for index in (0, 3, 4):
+                    self.assertTrue(
+                        math.isclose(stats[index], expected[index], rel_tol=1e-12),
+                        (index, stats[index], expected[index])
+                    )
+                with mock.patch.object(compute_statistics_module, "np", None):
+                    self.assertEqual(compute_statistics_vectorized(buffer), expected)
+
+
+class TestBlocks(unittest.TestCase):
+    """Pruebas de la lectura por bloques acotados del mmap."""
+
+    def setUp(self):
+        """Crea un archivo con líneas de distinto largo y sin salto final."""
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, "numbers.txt")
+        self.lines = [b"1", b"22.5", b"abc", b"333333333.25", b"-4", b"5"]
+        with open(self.filename, "wb") as file:
+            file.write(b"\n".join(self.lines))
+
+    def tearDown(self):
+        """Elimina los archivos temporales."""
+        shutil.rmtree(self.directory)
+
+    def test_blocks_end_on_newlines(self):
+        """Cada bloque termina en un salto de línea, aunque sea pequeño."""
+        with open(self.filename, "rb") as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for block_bytes in (1, 3, 8, 1024):
+                with self.subTest(block_bytes=block_bytes):
+                    blocks = list(iter_blocks(data, 0, len(data), block_bytes))
+                    self.assertEqual(sum(blocks, []), self.lines)
+                    if block_bytes < 8:
+                        self.assertGreater(len(blocks), 1)
+
+    def test_reduce_chunk_matches_stream(self):
+        """El rango completo da lo mismo que el motor stream."""
+        with redirect_stdout(io.StringIO()):
+            expected = compute_statistics_streaming(self.filename)
+        accumulator, invalid_count, details = reduce_chunk(
+            self.filename, 0, os.path.getsize(self.filename), False, 5
+        )
+        self.assertEqual(accumulator.result(), expected)
+        self.assertEqual((invalid_count, details), (1, ["abc"]))
+
+
+class TestParallel(StatisticsCase):
+    """Pruebas del motor paralelo por fragmentos contra el motor list."""
+
+    def test_same_values_as_list_engine(self):
+        """Con 1, 2 y 4 procesos da lo mismo que list y que stream."""
+        for filename in SMALL_FILES + [self.first, self.second]:
+            _, expected = list_statistics([filename])
+            with redirect_stdout(io.StringIO()):
+                streamed = compute_statistics_streaming(filename)
+            for workers in (1, 2, 4):
+                with self.subTest(filename=os.path.basename(filename), workers=workers):
+                    with redirect_stdout(io.StringIO()):
+                        stats = compute_statistics_parallel(filename, workers)
+                    self.assert_same_statistics(stats, expected)
+                    self.assert_same_statistics(stats, streamed)
+
+    def test_more_workers_than_lines(self):
+        """Un archivo con menos líneas que procesos no pierde valores."""
+        with redirect_stdout(io.StringIO()):
+            stats = compute_statistics_parallel(self.second, 16)
+        self.assert_same_statistics(stats, list_statistics([self.second])[1])
+
+
+class TestBatch(StatisticsCase):
+    """Pruebas del modo por lotes y de su fila TOTAL."""
+
+    def test_rows_match_list_engine(self):
+        """
+        Cada fila coincide con el motor list sobre su archivo y TOTAL con
+        el motor list sobre todos los archivos concatenados; un archivo
+        inexistente se reporta y no tiene fila.
+        """
+        filenames = SMALL_FILES + [self.first, self.second]
+        missing = os.path.join(self.directory, "missing.txt")
+        output = io.StringIO()
+        with redirect_stdout(output):
+            rows = compute_statistics_batch(filenames + [missing], workers=2)
+        self.assertIn(f"Error: El archivo {missing} no existe.", output.getvalue())
+        self.assertEqual([row[0] for row in rows], filenames + ["TOTAL"])
+        for filename, count, stats in rows[:-1]:
+            expected_count, expected = list_statistics([filename])
+            self.assertEqual(count, expected_count)
+            self.assert_same_statistics(stats, expected)
+        expected_count, expected = list_statistics(filenames)
+        self.assertEqual(rows[-1][1], expected_count)
+        self.assert_same_statistics(rows[-1][2], expected)
+
+    def test_format_table(self):
+        """La tabla muestra los valores de TOTAL y solo la cuenta sin datos."""
+        with redirect_stdout(io.StringIO()):
+            rows = compute_statistics_batch([self.first, self.second], workers=1)
+        rows.append(("empty.txt", 0, None))
+        lines = format_batch_table(rows).splitlines()
+        total = next(line for line in lines if line.startswith("TOTAL"))
+        self.assertEqual(total.split()[1], "9")
+        self.assertEqual(total.split()[2:], [str(value) for value in rows[-2][2]])
+        self.assertEqual(lines[-1].split(), ["empty.txt", "0"])
+
+
+class TestCheckpoint(StatisticsCase):
+    """Pruebas del modo --checkpoint de compute_statistics_incremental."""
+
+    def run_incremental(self, filename):
+        """
+        Ejecuta el modo incremental y devuelve (estadísticas, inicios de
+        los rangos que se leyeron, checkpoint guardado).
+        """
+        with mock.patch.object(
+                compute_statistics_module, "reduce_chunk", wraps=reduce_chunk
+        ) as reduce_mock, redirect_stdout(io.StringIO()):
+            stats = compute_statistics_incremental(filename)
+        starts = [call.args[1] for call in reduce_mock.call_args_list]
+        with open(filename + ".checkpoint.json", "r", encoding="utf-8") as file:
+            checkpoint = json.load(file)
+        return stats, starts, checkpoint
+
+    def test_resume_after_append(self):
+        """Tras agregar líneas solo se leen las nuevas y el total coincide."""
+        _, starts, checkpoint = self.run_incremental(self.first)
+        size = os.path.getsize(self.first)
+        self.assertEqual((starts, checkpoint["offset"]), ([0], size))
+        with open(self.first, "a", encoding="utf-8") as file:
+            file.write("7\n2\n")
+        stats, starts, checkpoint = self.run_incremental(self.first)
+        self.assertEqual(starts, [size])
+        self.assertEqual(checkpoint["offset"], os.path.getsize(self.first))
+        self.assert_same_statistics(stats, list_statistics([self.first])[1])
+
+    def test_incomplete_last_line(self):
+        """
+        Una última línea sin salto se cuenta pero no se guarda; al
+        completarse se relee entera.
+        """
+        stats, _, checkpoint = self.run_incremental(self.second)
+        self.assert_same_statistics(stats, list_statistics([self.second])[1])
+        offset = os.path.getsize(self.second) - len("10")
+        self.assertEqual(checkpoint["offset"], offset)
+        self.assertEqual(StreamingStats.from_dict(checkpoint["stats"]).count, 4)
+        with open(self.second, "a", encoding="utf-8") as file:
+            file.write("5\n")
+        stats, starts, _ = self.run_incremental(self.second)
+        self.assertEqual(starts, [offset])
+        self.assertEqual(stats[2], 10.0)
+        self.assert_same_statistics(stats, list_statistics([self.second])[1])
+
+    def test_rewrite_recomputes(self):
+        """
+        Un archivo reescrito con el mismo tamaño o truncado cambia la huella
+        del inicio y del final y se recalcula desde cero.
+        """
+        self.run_incremental(self.first)
+        with open(self.first, "w", encoding="utf-8") as file:
+            file.write("9\n8\n8\nabc\n0.5\n")
+        stats, starts, _ = self.run_incremental(self.first)
+        self.assertEqual(starts, [0])
+        self.assertEqual(stats[2], 8.0)
+        self.assert_same_statistics(stats, list_statistics([self.first])[1])
+        with open(self.first, "w", encoding="utf-8") as file:
+            file.write("4\n")
+        stats, starts, _ = self.run_incremental(self.first)
+        self.assertEqual((starts, stats[0]), ([0], 4.0))
+
+    def test_corrupt_checkpoint(self):
+        """Un checkpoint corrupto o incompleto se ignora y se reemplaza."""
+        expected = list_statistics([self.first])[1]
+        for content in ("{no es json", json.dumps({"offset": 3})):
+            with self.subTest(content=content):
+                with open(self.first + ".checkpoint.json", "w", encoding="utf-8") as file:
+                    file.write(content)
+                stats, starts, checkpoint = self.run_incremental(self.first)
+                self.assertEqual(starts, [0])
+                self.assert_same_statistics(stats, expected)
+                self.assertEqual(checkpoint["offset"], os.path.getsize(self.first))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,77 +4,192 @@ a sus representaciones en binario y hexadecimal,
 siguiendo el formato específico de salida en columnas.
 """
 
+import argparse
 import sys
 import time
+from itertools import islice
 
-def decimal_to_binary(n):
-    """Convierte un número decimal a binario, manejando números negativos en complemento a dos."""
-    if n == 0:
-        return "0"
-    is_negative = n < 0
-    n = abs(n)
-    binary = ""
-    while n > 0:
-        remainder = n % 2
-        binary = str(remainder) + binary
-        n //= 2
+# Cantidad de números convertidos por lote y tamaño del buffer de escritura.
+BATCH_SIZE = 4096
+WRITE_BUFFER_SIZE = 1 << 20
 
-    if is_negative:
-        binary = "-" + binary  # Para indicar que el número es negativo
-    return binary
+# Caracteres de una línea que se muestran en los avisos de error.
+ERROR_PREVIEW = 40
 
-def decimal_to_hexadecimal(n):
-    """Convierte un número decimal a hexadecimal, incluyendo negativos."""
-    if n == 0:
-        return "0"
+def check_bit_width(n, bits):
+    """Lanza ValueError si n no cabe en complemento a dos de bits bits."""
+    if not -(1 << (bits - 1)) <= n < (1 << (bits - 1)):
+        raise ValueError(f"Error: {n} no cabe en {bits} bits.")
 
-    is_negative = n < 0
-    n = abs(n)
+def decimal_to_binary(n, bits=None):
+    """
+    Convierte un número decimal a binario. Por defecto los negativos llevan
+    el signo '-'; con bits se devuelve el complemento a dos de ese ancho.
+    """
+    if bits is not None:
+        check_bit_width(n, bits)
+        return format(n & ((1 << bits) - 1), f"0{bits}b")
+    if n < 0:
+        return "-" + format(-n, "b")  # Para indicar que el número es negativo
+    return format(n, "b")
 
-    hex_chars = "0123456789ABCDEF"
-    hexadecimal = ""
-    while n > 0:
-        remainder = n % 16
-        hexadecimal = hex_chars[remainder] + hexadecimal
-        n //= 16
+def decimal_to_hexadecimal(n, bits=None):
+    """
+    Convierte un número decimal a hexadecimal, incluyendo negativos.
+    Con bits se devuelve el complemento a dos de ese ancho.
+    """
+    if bits is not None:
+        check_bit_width(n, bits)
+        return format(n & ((1 << bits) - 1), f"0{(bits + 3) // 4}X")
+    if n < 0:
+        return "-" + format(-n, "X")  # Agregar el signo negativo
+    return format(n, "X")
 
-    if is_negative:
-        hexadecimal = "-" + hexadecimal  # Agregar el signo negativo
-    return hexadecimal
+def convert_batch(numbers, bits=None):
+    """
+    Convierte una lista de enteros a binario y hexadecimal en bloque.
+    Con bits, cada número se valida una sola vez y la máscara y los
+    formatos de ancho fijo se calculan una vez por lote.
+    Devuelve dos listas: (binarios, hexadecimales).
+    """
+    if bits is None:
+        return _convert_batch_scalar(numbers, bits)
+    for number in numbers:
+        check_bit_width(number, bits)
+    mask = (1 << bits) - 1
+    binary_format = f"0{bits}b"
+    hex_format = f"0{(bits + 3) // 4}X"
+    unsigned = [number & mask for number in numbers]
+    return (
+        [format(value, binary_format) for value in unsigned],
+        [format(value, hex_format) for value in unsigned]
+    )
+
+def _convert_batch_scalar(numbers, bits):
+    """Convierte una lista de enteros número por número."""
+    return (
+        [decimal_to_binary(number, bits) for number in numbers],
+        [decimal_to_hexadecimal(number, bits) for number in numbers]
+    )
+
+def iter_numbers(lines):
+    """
+    Genera los números enteros de un iterable de líneas, ignorando los no
+    numéricos y los que pasan del límite de dígitos de Python
+    (sys.get_int_max_str_digits(), que --max-digits cambia).
+    """
+    for line in lines:
+        text = line.strip()
+        try:
+            yield int(text)  # Convertir a entero
+        except ValueError:
+            limit = sys.get_int_max_str_digits()
+            if limit and len(text) > limit and text.lstrip("+-").isdigit():
+                print(
+                    f"Error: '{text[:ERROR_PREVIEW]}...' tiene {len(text)} "
+                    f"dígitos, más que el límite de {limit}, y será ignorado "
+                    f"(use --max-digits)."
+                )
+            else:
+                print(f"Error: '{text}' no es un número válido y será ignorado.")
 
 def read_numbers(filename):
     """Lee números enteros desde un archivo, ignorando valores no numéricos."""
-    numbers = []
     with open(filename, "r", encoding="utf-8") as file:
-        for line in file:
-            try:
-                number = int(line.strip())  # Convertir a entero
-                numbers.append(number)
-            except ValueError:
-                print(f"Error: '{line.strip()}' no es un número válido y será ignorado.")
-    return numbers
+        return list(iter_numbers(file))
+
+def parse_arguments():
+    """Lee los argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(
+        description="Convierte números decimales a binario y hexadecimal."
+    )
+    parser.add_argument("filename", help="archivo con un número entero por línea")
+    parser.add_argument(
+        "--bits", type=int, default=None, metavar="N",
+        help=(
+            "muestra los números en complemento a dos de N bits en lugar "
+            "de usar el signo '-'; los que no caben se ignoran"
+        )
+    )
+    parser.add_argument(
+        "--max-digits", type=int, default=None, metavar="N",
+        help=(
+            "acepta números de hasta N dígitos decimales (0 = sin límite); "
+            "convertirlos a y desde decimal toma tiempo cuadrático"
+        )
+    )
+    parser.add_argument(
+        "--quiet", action="store_true",
+        help="no muestra la tabla en pantalla, solo la escribe en el archivo"
+    )
+    return parser.parse_args()
+
+def filter_bit_width(numbers, bits):
+    """Genera solo los números que caben en bits bits, avisando de los demás."""
+    for number in numbers:
+        try:
+            check_bit_width(number, bits)
+        except ValueError:
+            print(f"Error: '{number}' no cabe en {bits} bits y será ignorado.")
+            continue
+        yield number
+
+def iter_conversion_rows(numbers, bits=None, batch_size=BATCH_SIZE):
+    """
+    Genera las filas formateadas de la tabla, convirtiendo los números en
+    lotes de batch_size para no tener toda la entrada en memoria.
+    """
+    numbers = iter(numbers)
+    index = 0
+    while True:
+        batch = list(islice(numbers, batch_size))
+        if not batch:
+            return
+        binaries, hexadecimals = convert_batch(batch, bits)
+        for number, binary, hexadecimal in zip(batch, binaries, hexadecimals):
+            index += 1
+            yield f"{index:<5} {number:<10} {binary:<20} {hexadecimal:<10}"
+
+def write_conversion_table(rows, target, echo=True):
+    """
+    Escribe la cabecera y las filas en target a medida que se generan y,
+    si echo es True, las muestra también en pantalla. En pantalla cada
+    línea se termina de inmediato, porque los avisos de valores inválidos
+    se imprimen mientras se generan las filas.
+    """
+    # Formato de salida con cabecera
+    header = f"{'ITEM':<5} {'TC1':<10} {'BIN':<20} {'HEX':<10}"
+    target.write(header)
+    if echo:
+        sys.stdout.write(header + "\n")
+    for row in rows:
+        target.write("\n" + row)
+        if echo:
+            sys.stdout.write(row + "\n")
 
 def main():
     """Función principal que ejecuta la conversión de números a binario y hexadecimal."""
     start_time = time.time()
-    if len(sys.argv) != 2:
-        print("Uso: python convert_numbers.py fileWithData.txt")
+    args = parse_arguments()
+    if args.bits is not None and args.bits <= 0:
+        print("Error: --bits debe ser un entero positivo.")
         return
-    filename = sys.argv[1]
+    if args.max_digits is not None:
+        try:
+            sys.set_int_max_str_digits(args.max_digits)
+        except ValueError:
+            print("Error: --max-digits debe ser 0 o al menos 640.")
+            return
+    filename = args.filename
     try:
-        numbers = read_numbers(filename)
-        # Formato de salida con cabecera
-        header = f"{'ITEM':<5} {'TC1':<10} {'BIN':<20} {'HEX':<10}"
-        results = [header]
-        for index, number in enumerate(numbers, start=1):
-            binary = decimal_to_binary(number)
-            hexadecimal = decimal_to_hexadecimal(number)
-            formatted_line = f"{index:<5} {number:<10} {binary:<20} {hexadecimal:<10}"
-            results.append(formatted_line)
-        output = "\n".join(results)
-        print(output)
-        with open("ConversionResults.txt", "w", encoding="utf-8") as file:
-            file.write(output)
+        with open(filename, "r", encoding="utf-8") as source, \
+                open("ConversionResults.txt", "w", encoding="utf-8",
+                     buffering=WRITE_BUFFER_SIZE) as target:
+            numbers = iter_numbers(source)
+            if args.bits is not None:
+                numbers = filter_bit_width(numbers, args.bits)
+            rows = iter_conversion_rows(numbers, args.bits)
+            write_conversion_table(rows, target, echo=not args.quiet)
     except FileNotFoundError:
         print(f"Error: El archivo {filename} no existe.")
     elapsed_time = time.time() - start_time
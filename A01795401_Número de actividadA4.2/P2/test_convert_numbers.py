@@ -0,0 +1,121 @@
+"""
+Pruebas unitarias para convert_numbers.
+"""
+
+import io
+import random
+import sys
+import unittest
+from contextlib import redirect_stdout
+
+from convert_numbers import (
+    convert_batch, filter_bit_width, iter_conversion_rows, iter_numbers,
+    write_conversion_table
+)
+
+HEADER = f"{'ITEM':<5} {'TC1':<10} {'BIN':<20} {'HEX':<10}"
+
+
+class TestConversionTable(unittest.TestCase):
+    """Pruebas de la tabla que se escribe mientras se leen los números."""
+
+    def write_table(self, lines, bits=None):
+        """Escribe la tabla de lines y devuelve (archivo, pantalla)."""
+        target = io.StringIO()
+        output = io.StringIO()
+        with redirect_stdout(output):
+            numbers = iter_numbers(lines)
+            if bits is not None:
+                numbers = filter_bit_width(numbers, bits)
+            write_conversion_table(
+                iter_conversion_rows(numbers, bits, batch_size=1), target
+            )
+        return target.getvalue(), output.getvalue()
+
+    def test_invalid_line_on_its_own_line(self):
+        """El aviso de una línea inválida no queda dentro de una fila."""
+        table, output = self.write_table(["10\n", "abc\n", "-3\n"])
+        self.assertEqual(output.splitlines(), [
+            HEADER,
+            f"{1:<5} {10:<10} {'1010':<20} {'A':<10}",
+            "Error: 'abc' no es un número válido y será ignorado.",
+            f"{2:<5} {-3:<10} {'-11':<20} {'-3':<10}",
+        ])
+        self.assertTrue(output.endswith("\n"))
+        self.assertNotIn("Error", table)
+        self.assertEqual(table.splitlines()[0], HEADER)
+        self.assertFalse(table.endswith("\n"))
+
+    def test_value_out_of_range_on_its_own_line(self):
+        """El aviso de un número que no cabe en --bits ocupa su línea."""
+        _, output = self.write_table(["1\n", "300\n"], bits=8)
+        self.assertEqual(
+            output.splitlines()[2],
+            "Error: '300' no cabe en 8 bits y será ignorado."
+        )
+
+
+class TestConvertBatch(unittest.TestCase):
+    """Pruebas de la conversión en bloque."""
+
+    def test_signed_and_fixed_width(self):
+        """Convierte con signo y en complemento a dos."""
+        self.assertEqual(
+            convert_batch([0, 255, -255]), (["0", "11111111", "-11111111"],
+                                            ["0", "FF", "-FF"])
+        )
+        self.assertEqual(
+            convert_batch([-1, 5], bits=12),
+            (["111111111111", "000000000101"], ["FFF", "005"])
+        )
+        with self.assertRaises(ValueError):
+            convert_batch([8], bits=4)
+
+    def test_wide_integers(self):
+        """Convierte enteros de miles de bits, con signo y de ancho fijo."""
+        rng = random.Random(8)
+        numbers = [rng.getrandbits(4096) | 1 << 4095 for _ in range(4)]
+        numbers += [-number for number in numbers]
+        binaries, hexadecimals = convert_batch(numbers)
+        for number, binary, hexadecimal in zip(numbers, binaries, hexadecimals):
+            self.assertEqual(int(binary, 2), number)
+            self.assertEqual(int(hexadecimal, 16), number)
+        self.assertEqual(len(binaries[0]), 4096)
+        self.assertEqual(len(hexadecimals[0]), 1024)
+
+        binaries, hexadecimals = convert_batch([-1, 1 << 4095], bits=4097)
+        self.assertEqual(binaries[0], "1" * 4097)
+        self.assertEqual(hexadecimals[0], "1" + "F" * 1024)
+        self.assertEqual(hexadecimals[1], "0" + "8" + "0" * 1023)
+
+
+class TestDigitLimit(unittest.TestCase):
+    """Pruebas de números con más dígitos que el límite de Python."""
+
+    def setUp(self):
+        self.limit = sys.get_int_max_str_digits()
+        self.addCleanup(sys.set_int_max_str_digits, self.limit)
+        sys.set_int_max_str_digits(1000)
+
+    def test_over_limit_reported(self):
+        """Un número demasiado largo se ignora con un aviso claro."""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            numbers = list(iter_numbers(["7" * 1200 + "\n", "-12\n"]))
+        self.assertEqual(numbers, [-12])
+        self.assertIn("tiene 1200 dígitos, más que el límite de 1000", output.getvalue())
+        self.assertIn("--max-digits", output.getvalue())
+
+    def test_raised_limit(self):
+        """Con un límite mayor el número se lee y se convierte."""
+        sys.set_int_max_str_digits(2000)
+        with redirect_stdout(io.StringIO()):
+            numbers = list(iter_numbers(["7" * 1200 + "\n"]))
+        self.assertEqual(numbers, [int("7" * 1200)])
+        self.assertEqual(
+            int(convert_batch(numbers)[1][0], 16), numbers[0]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
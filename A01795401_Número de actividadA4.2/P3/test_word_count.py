@@ -0,0 +1,203 @@
+"""
+Pruebas unitarias para los motores de word_count.
+"""
+
+import glob
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from collections import Counter
+from contextlib import redirect_stdout
+from unittest import mock
+
+import word_count
+from word_count import (
+    CountMinSketch, HeavyHitters, bubble_sort, count_word_frequencies,
+    count_words, count_words_parallel, iter_file_words, iter_words,
+    read_words, read_words_translate, sort_word_counts, top_k_words
+)
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_FILES = sorted(glob.glob(os.path.join(DIRECTORY, "fileWithData*.txt")))
+
+# Texto con mayúsculas, acentos, apóstrofos, dígitos y puntuación.
+MIXED_TEXT = (
+    "Él dijo: ¡HOLA, hola!  l'été 2024 -- Straße\n"
+    "año3x año\tniño...NIÑO\n"
+    "\n"
+    "palabra_compuesta fin"
+)
+
+
+def legacy_pairs(filenames):
+    """Pares (palabra, conteo) del motor original: listas y bubble sort."""
+    words = []
+    for filename in filenames:
+        words.extend(read_words(filename))
+    word_list, word_counts = count_word_frequencies(words)
+    bubble_sort(word_list, word_counts)
+    return list(zip(word_list, word_counts))
+
+
+class WordCountCase(unittest.TestCase):
+    """
+    Crea un archivo temporal con MIXED_TEXT. Los pares esperados de todos
+    los archivos se calculan con el motor original una sola vez, porque
+    sus listas y bubble sort son cuadráticos.
+    """
+
+    expected_pairs = {}
+
+    def setUp(self):
+        """Crea el archivo de texto mezclado."""
+        self.directory = tempfile.mkdtemp()
+        self.mixed = os.path.join(self.directory, "mixed.txt")
+        with open(self.mixed, "w", encoding="utf-8") as file:
+            file.write(MIXED_TEXT)
+        self.files = SAMPLE_FILES + [self.mixed]
+        if not self.expected_pairs:
+            self.expected_pairs.update(legacy_pairs(self.files))
+        self.expected = sorted(self.expected_pairs.items())
+
+    def tearDown(self):
+        """Elimina los archivos temporales."""
+        shutil.rmtree(self.directory)
+
+
+class TestTokenizer(WordCountCase):
+    """Pruebas del tokenizador por bloques con str.translate."""
+
+    def test_same_words_as_legacy(self):
+        """translate genera las mismas palabras que read_words."""
+        for filename in self.files:
+            self.assertEqual(read_words_translate(filename), read_words(filename))
+        self.assertIn("straße", read_words(self.mixed))
+
+    def test_block_boundaries(self):
+        """Una palabra cortada entre bloques se entrega completa."""
+        expected = read_words(self.mixed)
+        for block_size in range(1, 12):
+            words = list(iter_words(io.StringIO(MIXED_TEXT), block_size))
+            self.assertEqual(words, expected, block_size)
+
+    def test_block_without_separator(self):
+        """Un bloque sin separadores se acumula hasta el siguiente."""
+        words = list(iter_words(io.StringIO("abcdefgh ij"), block_size=3))
+        self.assertEqual(words, ["abcdefgh", "ij"])
+
+
+class TestEngines(WordCountCase):
+    """Cada motor exacto coincide con el motor original."""
+
+    def test_hash_engine(self):
+        """Counter y orden alfabético dan los mismos pares."""
+        for filename in (SAMPLE_FILES[0], self.mixed):
+            counts = count_words(read_words_translate(filename))
+            self.assertEqual(sort_word_counts(counts), legacy_pairs([filename]))
+        counts = count_words(
+            word for filename in self.files for word in read_words_translate(filename)
+        )
+        self.assertEqual(sort_word_counts(counts), self.expected)
+
+    def test_stream_engine(self):
+        """El conteo en flujo de varios archivos coincide."""
+        with redirect_stdout(io.StringIO()):
+            counts = Counter(iter_file_words(self.files + ["missing.txt"]))
+        self.assertEqual(sort_word_counts(counts), self.expected)
+
+    def test_parallel_engine(self):
+        """Los fragmentos contados en paralelo suman lo mismo."""
+        counts = count_words_parallel(self.files, workers=2, chunk_size=64)
+        self.assertEqual(sort_word_counts(counts), self.expected)
+
+    def test_top_k(self):
+        """El heap da las k más frecuentes con empates alfabéticos."""
+        pairs = self.expected
+        expected = sorted(pairs, key=lambda item: (-item[1], item[0]))
+        counts = dict(pairs)
+        for k in (1, 5, 20, len(pairs) + 1):
+            self.assertEqual(top_k_words(counts, k), expected[:k])
+
+
+class TestSketch(WordCountCase):
+    """Pruebas del Count-Min Sketch y de las palabras más frecuentes."""
+
+    def test_error_bounds(self):
+        """La estimación nunca es menor al conteo ni lo pasa de epsilon * N."""
+        counts = Counter(iter_file_words(SAMPLE_FILES))
+        sketch = CountMinSketch.from_error(0.01, 0.01)
+        for word, count in counts.items():
+            sketch.add(word, count)
+        self.assertEqual(sketch.total, sum(counts.values()))
+        for word, count in counts.items():
+            self.assertGreaterEqual(sketch.estimate(word), count)
+            self.assertLessEqual(
+                sketch.estimate(word), count + sketch.epsilon * sketch.total
+            )
+
+    def test_heavy_hitters(self):
+        """Se conservan las palabras más frecuentes que el capacity-ésimo conteo."""
+        counts = Counter(iter_file_words(SAMPLE_FILES))
+        hitters = HeavyHitters(CountMinSketch.from_error(0.0001, 0.01), 10)
+        hitters.update(iter_file_words(SAMPLE_FILES), batch_size=100)
+        threshold = sorted(counts.values(), reverse=True)[9]
+        frequent = {word for word, count in counts.items() if count > threshold}
+        self.assertLessEqual(frequent, set(hitters.candidates))
+        self.assertEqual(len(hitters.candidates), 10)
+        for word, estimate in hitters.candidates.items():
+            self.assertEqual(estimate, counts[word])
+
+    def test_seed_reproducible(self):
+        """La misma seed da el mismo sketch en procesos distintos."""
+        script = (
+            "from word_count import CountMinSketch\n"
+            "sketch = CountMinSketch(50, 3, seed=7)\n"
+            "for word in ('hola', 'mundo', 'straße'):\n"
+            "    sketch.add(word)\n"
+            "print([list(row) for row in sketch.rows])\n"
+        )
+        outputs = set()
+        for hash_seed in ("1", "2"):
+            environment = dict(os.environ, PYTHONHASHSEED=hash_seed)
+            outputs.add(subprocess.run(
+                [sys.executable, "-c", script], cwd=DIRECTORY, env=environment,
+                capture_output=True, text=True, check=True
+            ).stdout)
+        self.assertEqual(len(outputs), 1)
+
+
+class TestReport(WordCountCase):
+    """El reporte de cada motor es igual al del motor original."""
+
+    def run_main(self, *arguments):
+        """Ejecuta main() y devuelve WordCountResults.txt sin el tiempo."""
+        current = os.getcwd()
+        os.chdir(self.directory)
+        try:
+            argv = ["word_count.py", *self.files, *arguments]
+            with mock.patch.object(sys, "argv", argv), \
+                    redirect_stdout(io.StringIO()):
+                word_count.main()
+            with open("WordCountResults.txt", "r", encoding="utf-8") as file:
+                return file.read().rsplit("\n", 1)[0]
+        finally:
+            os.chdir(current)
+
+    def test_engines_match_legacy(self):
+        """hash, stream, --workers y --tokenizer legacy igualan a list."""
+        expected = "\n".join(
+            ["Row Labels     Count of TC2"]
+            + [f"{word:<15} {count:>5}" for word, count in self.expected]
+        )
+        for arguments in (
+                (), ("--engine", "stream"), ("--workers", "2"),
+                ("--tokenizer", "legacy")):
+            self.assertEqual(self.run_main(*arguments), expected, arguments)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,8 +3,17 @@ Este script cuenta la frecuencia de palabras en un archivo de texto y
 formatea la salida para que coincida con el formato esperado.
 """
 
-import sys
+import argparse
+import hashlib
+import heapq
+import math
+import os
+import random
 import time
+from array import array
+from collections import Counter
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
 
 def clean_word(word):
     """Elimina caracteres no alfabéticos y convierte a minúsculas."""
@@ -34,6 +43,120 @@ def read_words(filename):
         return []
     return words
 
+class _AlphaLowerTable(dict):
+    """
+    Tabla para str.translate que deja cada letra en minúscula (char.lower())
+    y cambia cualquier otro carácter por un espacio. Cada carácter se
+    clasifica con isalpha() la primera vez que aparece y luego se reutiliza.
+    """
+
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        value = char.lower() if char.isalpha() else " "
+        self[codepoint] = value
+        return value
+
+ALPHA_LOWER_TABLE = _AlphaLowerTable()
+READ_BLOCK_SIZE = 1 << 20
+
+def iter_words(file, block_size=READ_BLOCK_SIZE):
+    """
+    Genera las palabras de un archivo abierto procesándolo por bloques con
+    str.translate: secuencias alfabéticas en minúsculas, igual que read_words.
+    """
+    carry = ""
+    while True:
+        block = file.read(block_size)
+        if not block:
+            break
+        # Una palabra cortada al final del bloque se completa con el siguiente.
+        cut = len(block)
+        while cut and block[cut - 1].isalpha():
+            cut -= 1
+        if not cut:
+            carry += block
+            continue
+        yield from (carry + block[:cut]).translate(ALPHA_LOWER_TABLE).split()
+        carry = block[cut:]
+    if carry:
+        yield from carry.translate(ALPHA_LOWER_TABLE).split()
+
+def read_words_translate(filename):
+    """Lee palabras desde un archivo usando el tokenizador por bloques."""
+    try:
+        with open(filename, "r", encoding="utf-8") as file:
+            return list(iter_words(file))
+    except FileNotFoundError:
+        print(f"Error: El archivo {filename} no existe.")
+        return []
+
+PARALLEL_CHUNK_SIZE = 32 << 20
+
+def split_chunks(filename, chunk_size=PARALLEL_CHUNK_SIZE):
+    """
+    Divide un archivo en rangos de bytes (inicio, fin) de unos chunk_size
+    bytes que terminan en un salto de línea, para que ninguna palabra
+    quede repartida entre dos rangos.
+    """
+    size = os.path.getsize(filename)
+    chunks = []
+    start = 0
+    with open(filename, "rb") as file:
+        while start < size:
+            file.seek(min(start + chunk_size, size))
+            file.readline()
+            end = min(file.tell(), size)
+            chunks.append((start, end))
+            start = end
+    return chunks
+
+def count_chunk(filename, start, end):
+    """Cuenta las palabras de un rango de bytes de un archivo."""
+    with open(filename, "rb") as file:
+        file.seek(start)
+        text = file.read(end - start).decode("utf-8")
+    return Counter(text.translate(ALPHA_LOWER_TABLE).split())
+
+def count_words_parallel(filenames, workers, chunk_size=PARALLEL_CHUNK_SIZE):
+    """
+    Cuenta las palabras de uno o más archivos repartiendo sus fragmentos
+    entre workers procesos y combinando los Counter parciales.
+    """
+    tasks = []
+    for filename in filenames:
+        try:
+            chunks = split_chunks(filename, chunk_size)
+        except FileNotFoundError:
+            print(f"Error: El archivo {filename} no existe.")
+            continue
+        tasks.extend((filename, start, end) for start, end in chunks)
+
+    counts = Counter()
+    if not tasks:
+        return counts
+    names, starts, ends = zip(*tasks)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for partial in executor.map(count_chunk, names, starts, ends):
+            counts.update(partial)
+    return counts
+
+TOKENIZERS = {
+    "translate": read_words_translate,
+    "legacy": read_words,
+}
+
+def benchmark_tokenizers(filename, repeat=3):
+    """Mide el rendimiento en MB/s de cada tokenizador sobre un archivo."""
+    megabytes = os.path.getsize(filename) / 1_000_000
+    print(f"{'Tokenizador':<12} {'MB/s':>10}")
+    for name, tokenizer in TOKENIZERS.items():
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            tokenizer(filename)
+            best = min(best, time.perf_counter() - start)
+        print(f"{name:<12} {megabytes / best:>10.2f}")
+
 def count_word_frequencies(words):
     """Cuenta la frecuencia de cada palabra usando listas en lugar de diccionarios."""
     word_list = []
@@ -60,23 +183,225 @@ def bubble_sort(words, counts):
                 words[j], words[j + 1] = words[j + 1], words[j]
                 counts[j], counts[j + 1] = counts[j + 1], counts[j]
 
-def main():
-    """Función principal que ejecuta el programa."""
-    start_time = time.time()
-    if len(sys.argv) != 2:
-        print("Uso: python wordCount.py fileWithData.txt")
-        return
-    filename = sys.argv[1]
-    words = read_words(filename)
-    if not words:
-        return
+def count_words(words):
+    """Cuenta la frecuencia de cada palabra con una tabla hash (Counter)."""
+    return Counter(words)
+
+def sort_word_counts(counts):
+    """Devuelve los pares (palabra, conteo) ordenados alfabéticamente."""
+    return sorted(counts.items())
+
+def top_k_words(counts, k):
+    """
+    Devuelve las k palabras más frecuentes usando un heap, sin ordenar todo
+    el vocabulario. Los empates se ordenan alfabéticamente.
+    """
+    return heapq.nsmallest(k, counts.items(), key=lambda item: (-item[1], item[0]))
+
+DEFAULT_SKETCH_TOP = 100
+
+def iter_file_words(filenames):
+    """
+    Genera en flujo las palabras de varios archivos, sin construir la lista
+    completa de palabras; avisa de los archivos que no existen.
+    """
+    for filename in filenames:
+        try:
+            with open(filename, "r", encoding="utf-8") as file:
+                yield from iter_words(file)
+        except FileNotFoundError:
+            print(f"Error: El archivo {filename} no existe.")
+
+class CountMinSketch:
+    """
+    Count-Min Sketch: estima frecuencias con memoria fija de depth filas por
+    width contadores. La estimación nunca es menor al conteo real y lo supera
+    en a lo más epsilon * N con probabilidad 1 - delta, donde
+    width = ceil(e / epsilon) y depth = ceil(ln(1 / delta)). Las palabras
+    se resumen con BLAKE2b (no con hash(), que cambia en cada ejecución),
+    así que con la misma seed los resultados se repiten entre ejecuciones.
+    """
 
-    word_list, word_counts = count_word_frequencies(words)
-    bubble_sort(word_list, word_counts)
+    PRIME = (1 << 61) - 1
 
+    def __init__(self, width, depth, seed=0):
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        rng = random.Random(seed)
+        self.hash_params = [
+            (rng.randrange(1, self.PRIME), rng.randrange(self.PRIME))
+            for _ in range(depth)
+        ]
+        self.rows = [array("q", bytes(8 * width)) for _ in range(depth)]
+
+    @classmethod
+    def from_error(cls, epsilon, delta, seed=0):
+        """Crea un sketch que cumple las cotas de error epsilon y delta."""
+        return cls(math.ceil(math.e / epsilon), math.ceil(math.log(1 / delta)), seed)
+
+    @classmethod
+    def from_memory(cls, memory_bytes, delta, seed=0):
+        """Crea un sketch que usa a lo más memory_bytes para sus contadores."""
+        depth = math.ceil(math.log(1 / delta))
+        return cls(max(1, memory_bytes // (8 * depth)), depth, seed)
+
+    @property
+    def epsilon(self):
+        """Error relativo garantizado por el ancho del sketch."""
+        return math.e / self.width
+
+    @property
+    def delta(self):
+        """Probabilidad de superar la cota de error."""
+        return math.exp(-self.depth)
+
+    def _positions(self, item):
+        """Devuelve la columna que corresponde a item en cada fila."""
+        value = int.from_bytes(
+            hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        return [
+            (a * value + b) % self.PRIME % self.width
+            for a, b in self.hash_params
+        ]
+
+    def add(self, item, count=1):
+        """Suma count al item y devuelve su nueva estimación."""
+        self.total += count
+        estimate = None
+        for row, position in zip(self.rows, self._positions(item)):
+            row[position] += count
+            if estimate is None or row[position] < estimate:
+                estimate = row[position]
+        return estimate
+
+    def estimate(self, item):
+        """Devuelve la frecuencia estimada de item."""
+        return min(
+            row[position]
+            for row, position in zip(self.rows, self._positions(item))
+        )
+
+class HeavyHitters:
+    """
+    Palabras más frecuentes de un flujo en memoria acotada: un Count-Min
+    Sketch estima los conteos y se conservan solo los capacity candidatos
+    con mayor estimación (estilo Space-Saving), usando un heap de mínimos.
+    """
+
+    def __init__(self, sketch, capacity):
+        self.sketch = sketch
+        self.capacity = capacity
+        self.candidates = {}
+        self.heap = []
+
+    def add(self, word, count=1):
+        """Procesa count apariciones de una palabra del flujo."""
+        estimate = self.sketch.add(word, count)
+        candidates = self.candidates
+        if word in candidates:
+            candidates[word] = estimate
+        elif len(candidates) < self.capacity:
+            candidates[word] = estimate
+            heapq.heappush(self.heap, (estimate, word))
+            return
+        else:
+            self._evict_below(estimate)
+            if len(candidates) >= self.capacity:
+                return
+            candidates[word] = estimate
+        heapq.heappush(self.heap, (estimate, word))
+        if len(self.heap) > 4 * self.capacity:
+            self.heap = [(count, key) for key, count in candidates.items()]
+            heapq.heapify(self.heap)
+
+    def _evict_below(self, estimate):
+        """Descarta el candidato de menor estimación si es menor que estimate."""
+        heap = self.heap
+        while heap:
+            count, word = heap[0]
+            if self.candidates.get(word) != count:
+                heapq.heappop(heap)  # Entrada desactualizada.
+                continue
+            if count < estimate:
+                heapq.heappop(heap)
+                del self.candidates[word]
+            return
+
+    def update(self, words, batch_size=65536):
+        """
+        Procesa todas las palabras de un iterable. Cada lote de batch_size
+        palabras se agrupa antes en un Counter, de modo que el sketch se
+        actualiza una vez por palabra distinta del lote y no por aparición.
+        """
+        words = iter(words)
+        while True:
+            batch = Counter(islice(words, batch_size))
+            if not batch:
+                return
+            for word, count in batch.items():
+                self.add(word, count)
+
+def parse_arguments():
+    """Lee los argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(
+        description="Cuenta la frecuencia de palabras en un archivo de texto."
+    )
+    parser.add_argument(
+        "filenames", nargs="+", metavar="filename",
+        help="archivo(s) de texto a procesar"
+    )
+    parser.add_argument(
+        "--engine", choices=("hash", "list", "stream", "sketch"), default="hash",
+        help=(
+            "hash: conteo con tabla hash y ordenamiento O(v log v); "
+            "list: conteo con listas y bubble sort; "
+            "stream: conteo exacto en flujo, sin lista de palabras; "
+            "sketch: conteo aproximado en memoria acotada (Count-Min Sketch)"
+        )
+    )
+    parser.add_argument(
+        "--top", type=int, default=None, metavar="K",
+        help="muestra solo las K palabras más frecuentes (usa un heap)"
+    )
+    parser.add_argument(
+        "--tokenizer", choices=tuple(TOKENIZERS), default="translate",
+        help=(
+            "translate: por bloques con str.translate; "
+            "legacy: carácter por carácter"
+        )
+    )
+    parser.add_argument(
+        "--benchmark", action="store_true",
+        help="mide el rendimiento en MB/s de cada tokenizador y termina"
+    )
+    parser.add_argument(
+        "--epsilon", type=float, default=0.0001,
+        help="con --engine sketch, error máximo relativo al total de palabras"
+    )
+    parser.add_argument(
+        "--delta", type=float, default=0.01,
+        help="con --engine sketch, probabilidad de superar el error máximo"
+    )
+    parser.add_argument(
+        "--memory-mb", type=float, default=None, metavar="MB",
+        help="con --engine sketch, memoria para el sketch (reemplaza --epsilon)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, metavar="N",
+        help=(
+            "divide los archivos en fragmentos y los cuenta en N procesos "
+            "(usa el tokenizador translate y el conteo hash)"
+        )
+    )
+    return parser.parse_args()
+
+def write_report(pairs, start_time):
+    """Muestra y guarda el reporte de frecuencias en WordCountResults.txt."""
     # Formatear la salida como la imagen
     output_lines = ["Row Labels     Count of TC2"]
-    for word, count in zip(word_list, word_counts):
+    for word, count in pairs:
         output_lines.append(f"{word:<15} {count:>5}")
 
     output_text = "\n".join(output_lines)
@@ -93,5 +418,80 @@ def main():
     with open("WordCountResults.txt", "a", encoding="utf-8") as file:
         file.write(f"\nTiempo de ejecución: {elapsed_time:.2f} segundos")
 
+def rank_counts(counts, top=None):
+    """Pares (palabra, conteo): los top más frecuentes o todos en orden alfabético."""
+    if top is not None:
+        return top_k_words(counts, top)
+    return sort_word_counts(counts)
+
+def parallel_pairs(args):
+    """Conteo en varios procesos; devuelve los pares del reporte o None."""
+    counts = count_words_parallel(args.filenames, args.workers)
+    return rank_counts(counts, args.top) if counts else None
+
+def stream_pairs(args):
+    """Conteo exacto en flujo; devuelve los pares del reporte o None."""
+    counts = Counter(iter_file_words(args.filenames))
+    return rank_counts(counts, args.top) if counts else None
+
+def sketch_pairs(args):
+    """Conteo aproximado con Count-Min Sketch; devuelve los pares o None."""
+    if args.memory_mb is not None:
+        sketch = CountMinSketch.from_memory(
+            int(args.memory_mb * 1_000_000), args.delta
+        )
+    else:
+        sketch = CountMinSketch.from_error(args.epsilon, args.delta)
+    top = args.top if args.top is not None else DEFAULT_SKETCH_TOP
+    hitters = HeavyHitters(sketch, top)
+    hitters.update(iter_file_words(args.filenames))
+    if not hitters.candidates:
+        return None
+    print(
+        f"Conteos aproximados: error máximo {sketch.epsilon * sketch.total:.0f} "
+        f"con probabilidad {1 - sketch.delta:.4f}"
+    )
+    return top_k_words(hitters.candidates, top)
+
+def word_list_pairs(args):
+    """
+    Conteo sobre la lista de palabras con el tokenizador elegido: con
+    --engine list y sin --top, con listas y bubble sort; si no, con
+    Counter. Devuelve los pares del reporte o None.
+    """
+    words = []
+    for filename in args.filenames:
+        words.extend(TOKENIZERS[args.tokenizer](filename))
+    if not words:
+        return None
+    if args.engine == "list" and args.top is None:
+        word_list, word_counts = count_word_frequencies(words)
+        bubble_sort(word_list, word_counts)
+        return zip(word_list, word_counts)
+    return rank_counts(count_words(words), args.top)
+
+ENGINES = {
+    "hash": word_list_pairs,
+    "list": word_list_pairs,
+    "stream": stream_pairs,
+    "sketch": sketch_pairs,
+}
+
+def main():
+    """Función principal que ejecuta el programa."""
+    start_time = time.time()
+    args = parse_arguments()
+    if args.benchmark:
+        for filename in args.filenames:
+            benchmark_tokenizers(filename)
+        return
+
+    if args.workers is not None and args.workers > 1:
+        pairs = parallel_pairs(args)
+    else:
+        pairs = ENGINES[args.engine](args)
+    if pairs is not None:
+        write_report(pairs, start_time)
+
 if __name__ == "__main__":
     main()
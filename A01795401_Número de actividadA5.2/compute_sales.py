@@ -4,9 +4,29 @@ y un registro de ventas. Genera un reporte con el total de ventas
 y los productos inválidos.
 """
 
+import argparse
+import hashlib
+import heapq
+import marshal
+import math
+import operator
+import os
 import sys
 import time
 import json
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from decimal import ROUND_HALF_EVEN, Context, Decimal
+from itertools import compress, islice, repeat
+from typing import Optional
+
+from json_stream import iter_json_records
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él se usa array y map.
+    np = None
 
 
 def load_json(filename):
@@ -81,39 +101,805 @@ def compute_total_sales(price_catalogue, sales_record):
     return total_sales, results
 
 
-def main():
-    """Función principal que ejecuta el cálculo de ventas."""
-    start_time = time.time()
+# Ventas procesadas por lote en modo flujo y detalles de registros inválidos
+# que se conservan como máximo.
+STREAM_BATCH_SIZE = 4096
+MAX_INVALID_DETAILS = 1000
 
-    if len(sys.argv) != 3:
-        print(
-            "Uso: python compute_sales.py "
-            "price_catalogue.json sales_record.json"
+
+@dataclass(frozen=True)
+class ReportOptions:
+    """
+    Opciones del reporte de ventas: línea por cada venta (details),
+    detalles de registros inválidos a conservar, productos a mostrar en
+    los totales agrupados (top_products) y montos en centavos (exact).
+    """
+
+    details: bool = True
+    max_invalid_details: int = MAX_INVALID_DETAILS
+    top_products: Optional[int] = None
+    exact: bool = False
+
+    @classmethod
+    def from_args(cls, args):
+        """Construye las opciones a partir de los argumentos de la línea."""
+        return cls(
+            details=not args.no_details,
+            max_invalid_details=args.max_invalid_details,
+            top_products=args.top_products,
+            exact=args.money == "cents"
         )
-        return
 
-    price_file, sales_file = sys.argv[1], sys.argv[2]
 
-    # Cargar datos
+# Contexto decimal fijo del modo de dinero exacto: los importes se
+# redondean a centavos con redondeo bancario.
+MONEY_CONTEXT = Context(prec=34, rounding=ROUND_HALF_EVEN)
+
+
+def to_cents(amount):
+    """
+    Convierte un precio o importe del JSON a centavos enteros. Los float se
+    toman por su representación decimal (28.1 → 2810), no por su valor
+    binario.
+    """
+    return int(MONEY_CONTEXT.multiply(Decimal(repr(amount)), 100)
+               .to_integral_value(context=MONEY_CONTEXT))
+
+
+def cents_to_decimal(cents):
+    """Convierte centavos enteros al Decimal exacto que se muestra."""
+    return Decimal(cents).scaleb(-2)
+
+
+class CatalogueIndex:
+    """
+    Índice del catálogo: asigna a cada título un código entero y guarda
+    precios y tipos en columnas indexadas por ese código, de modo que cada
+    producto se resuelve una sola vez con una búsqueda O(1). Los precios se
+    guardan también en centavos enteros para el modo de dinero exacto.
+    """
+
+    def __init__(self, titles, prices, types):
+        self.titles = titles
+        self.prices = array("d", prices)
+        self.price_cents = array("q", map(to_cents, self.prices))
+        self.types = types
+        self.codes = {title: code for code, title in enumerate(titles)}
+
+    @classmethod
+    def from_products(cls, product_list):
+        """Construye el índice a partir de la lista de productos del JSON."""
+        price_catalogue = build_price_catalogue(product_list)
+        types = {product["title"]: product.get("type") for product in product_list}
+        titles = list(price_catalogue)
+        return cls(
+            titles,
+            [price_catalogue[title] for title in titles],
+            [types[title] for title in titles]
+        )
+
+    def code(self, title):
+        """Devuelve el código de un título, o -1 si no está en el catálogo."""
+        return self.codes.get(title, -1)
+
+
+# Versión del formato del caché compilado del catálogo.
+CATALOGUE_CACHE_VERSION = 1
+
+
+def _file_sha256(filename):
+    """Calcula el hash SHA-256 del contenido de un archivo."""
+    digest = hashlib.sha256()
+    with open(filename, "rb") as file:
+        for block in iter(lambda: file.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_catalogue_cache(cache_path, stat):
+    """
+    Lee el caché compilado y devuelve (índice, hash) si corresponde al
+    catálogo, o None si no existe o está dañado. Si solo cambió la fecha de
+    modificación, el índice se devuelve con el hash para validarlo.
+    """
+    try:
+        with open(cache_path, "rb") as file:
+            (version, mtime_ns, size, sha256,
+             titles, prices, types) = marshal.load(file)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if version != CATALOGUE_CACHE_VERSION or size != stat.st_size:
+        return None
+    index = CatalogueIndex(list(titles), array("d", prices), list(types))
+    return index, (None if mtime_ns == stat.st_mtime_ns else sha256)
+
+
+def _write_catalogue_cache(cache_path, stat, sha256, index):
+    """Guarda el índice compilado de forma atómica (archivo temporal + rename)."""
+    temporary_path = cache_path + ".tmp"
+    with open(temporary_path, "wb") as file:
+        marshal.dump((
+            CATALOGUE_CACHE_VERSION, stat.st_mtime_ns, stat.st_size, sha256,
+            tuple(index.titles), index.prices.tobytes(), tuple(index.types)
+        ), file)
+    os.replace(temporary_path, cache_path)
+
+
+def load_catalogue_index(price_file, use_cache=False):
+    """
+    Devuelve el CatalogueIndex del catálogo, o None si no se puede cargar.
+    Con use_cache, usa el caché compilado <catálogo>.cache (marshal) cuando
+    coinciden el tamaño y la fecha de modificación, o el hash SHA-256 si
+    solo cambió la fecha; en otro caso reconstruye el índice desde el JSON
+    y regenera el caché.
+    """
+    cache_path = price_file + ".cache"
+    if use_cache:
+        try:
+            stat = os.stat(price_file)
+        except FileNotFoundError:
+            print(f"Error: El archivo '{price_file}' no existe.")
+            return None
+        cached = _read_catalogue_cache(cache_path, stat)
+        if cached is not None:
+            index, expected_sha256 = cached
+            if expected_sha256 is None:
+                return index
+            sha256 = _file_sha256(price_file)
+            if sha256 == expected_sha256:
+                _write_catalogue_cache(cache_path, stat, sha256, index)
+                return index
+
     product_list = load_json(price_file)
-    sales_record = load_json(sales_file)
+    if product_list is None:
+        return None
+    index = CatalogueIndex.from_products(product_list)
+    if use_cache:
+        _write_catalogue_cache(cache_path, stat, _file_sha256(price_file), index)
+    return index
+
+
+# Tipos de cantidad que acepta el JSON, para mostrar cada una como se leyó.
+QUANTITY_TYPES = (float, int, bool)
+QUANTITY_TYPE_CODES = {kind: code for code, kind in enumerate(QUANTITY_TYPES)}
+
+# Mayor entero que un float representa sin redondear.
+FLOAT_EXACT_LIMIT = 1 << 53
+
+
+@dataclass
+class SalesColumns:
+    """
+    Ventas válidas en columnas: códigos de producto, cantidades, el tipo
+    original de cada cantidad (índice en QUANTITY_TYPES), y el ticket
+    (SALE_ID) y la fecha (SALE_Date) de cada venta. Las cantidades enteras
+    que un float no representa exactamente (más de FLOAT_EXACT_LIMIT) se
+    guardan además, sin redondear, en wide_quantities (fila → entero).
+    """
+
+    codes: array = field(default_factory=lambda: array("q"))
+    quantities: array = field(default_factory=lambda: array("d"))
+    quantity_types: array = field(default_factory=lambda: array("b"))
+    sale_ids: list = field(default_factory=list)
+    dates: list = field(default_factory=list)
+    invalid_sales: list = field(default_factory=list)
+    wide_quantities: dict = field(default_factory=dict)
+
+    def __len__(self):
+        return len(self.codes)
+
+
+def load_sales_columns(index, sales_record, warn=True):
+    """
+    Valida las ventas y las carga en columnas, resolviendo cada producto
+    contra el índice del catálogo. Los campos se extraen por columna con
+    comprensiones y map; si min() y set() confirman que todo es válido no
+    se revisa fila por fila, y si no, solo los registros inválidos se
+    recorren uno a uno. Se reportan igual que en compute_total_sales; con
+    warn=False no se muestran advertencias.
+    """
+    if not isinstance(sales_record, list):
+        sales_record = list(sales_record)
+    products = [sale.get("Product") for sale in sales_record]
+    quantities = [sale.get("Quantity") for sale in sales_record]
+    codes = list(map(index.codes.get, products, repeat(-1)))
+    types = list(map(type, quantities))
+    kinds = set(types)
+
+    columns = SalesColumns()
+    # Un NaN al inicio hace que min() devuelva NaN: se va a la revisión
+    # por fila, que acepta NaN igual que compute_total_sales.
+    if not (kinds <= QUANTITY_TYPE_CODES.keys()
+            and min(codes, default=0) >= 0
+            and min(quantities, default=1) > 0):
+        valid = [
+            code >= 0 and kind in QUANTITY_TYPE_CODES and not quantity <= 0
+            for code, kind, quantity in zip(codes, types, quantities)
+        ]
+        for row in compress(range(len(valid)), map(operator.not_, valid)):
+            product, quantity = products[row], quantities[row]
+            if codes[row] < 0:
+                error_msg = f"Producto '{product}' no encontrado en el catálogo."
+            else:
+                error_msg = f"Cantidad inválida ({quantity}) para '{product}'."
+            if warn:
+                print(f"Advertencia: {error_msg}")
+            columns.invalid_sales.append(error_msg)
+        sales_record = list(compress(sales_record, valid))
+        codes = list(compress(codes, valid))
+        types = list(compress(types, valid))
+        quantities = list(compress(quantities, valid))
+
+    columns.codes.extend(codes)
+    columns.quantities.extend(quantities)
+    columns.quantity_types.frombytes(
+        bytes(map(QUANTITY_TYPE_CODES.__getitem__, types))
+    )
+    columns.sale_ids = [sale.get("SALE_ID") for sale in sales_record]
+    columns.dates = [sale.get("SALE_Date") for sale in sales_record]
+    if int in kinds:
+        columns.wide_quantities = _wide_quantities(columns.quantities, quantities)
+    return columns
+
+
+def _wide_quantities(column, quantities):
+    """
+    Devuelve {fila: entero} de las cantidades enteras que la columna de
+    float redondea. Solo esas filas quedan en FLOAT_EXACT_LIMIT o más
+    dentro de la columna, así que se buscan ahí en bloque.
+    """
+    if np is not None:
+        rows = np.flatnonzero(
+            np.frombuffer(column, dtype=np.float64) >= FLOAT_EXACT_LIMIT
+        ).tolist()
+    else:
+        rows = [row for row, value in enumerate(column) if value >= FLOAT_EXACT_LIMIT]
+    return {
+        row: quantities[row] for row in rows
+        if isinstance(quantities[row], int) and quantities[row] > FLOAT_EXACT_LIMIT
+    }
 
-    if product_list is None or sales_record is None:
-        return
 
-    # Construir catálogo de precios
-    price_catalogue = build_price_catalogue(product_list)
+def compute_subtotals(index, columns, exact=False):
+    """
+    Calcula los subtotales de todas las ventas en una sola pasada en bloque.
+    Con exact, los subtotales son centavos enteros: precio en centavos por
+    cantidad, exacto para cantidades enteras y redondeado a centavos para
+    cantidades fraccionarias.
+    """
+    if exact:
+        return compute_subtotal_cents(index, columns)
+    if np is not None:
+        prices = np.frombuffer(index.prices, dtype=np.float64)
+        codes = np.frombuffer(columns.codes, dtype=np.int64)
+        quantities = np.frombuffer(columns.quantities, dtype=np.float64)
+        return (prices[codes] * quantities).tolist()
+    return list(map(
+        operator.mul,
+        map(index.prices.__getitem__, columns.codes),
+        columns.quantities
+    ))
+
 
-    # Calcular ventas
-    _, sales_results = compute_total_sales(price_catalogue, sales_record)
+def _fractional_subtotal_cents(price_cents, quantity):
+    """Subtotal en centavos de una cantidad fraccionaria, redondeado."""
+    return int(MONEY_CONTEXT.multiply(price_cents, Decimal(repr(quantity)))
+               .to_integral_value(context=MONEY_CONTEXT))
 
-    # Mostrar resultados
-    output = "\n".join(sales_results)
-    print(output)
 
-    # Guardar resultados en archivo
+def compute_subtotal_cents(index, columns):
+    """
+    Calcula los subtotales en centavos enteros. Si todas las cantidades son
+    enteras (el caso normal), NumPy está disponible y el mayor precio por la
+    mayor cantidad cabe en int64, se multiplican en bloque en int64; si no,
+    con enteros de Python, tomando de wide_quantities las cantidades que la
+    columna de float redondea.
+    """
+    price_cents = index.price_cents
+    if np is not None and columns.codes and not columns.wide_quantities:
+        quantities = np.frombuffer(columns.quantities, dtype=np.float64)
+        if np.array_equal(quantities, np.trunc(quantities)):
+            prices = np.frombuffer(price_cents, dtype=np.int64)[
+                np.frombuffer(columns.codes, dtype=np.int64)
+            ]
+            largest = quantities.max()
+            if (math.isfinite(largest) and int(np.abs(prices).max()) * int(largest)
+                    <= np.iinfo(np.int64).max):
+                return (prices * quantities.astype(np.int64)).tolist()
+    subtotals = [
+        price_cents[code] * int(quantity) if quantity.is_integer()
+        else _fractional_subtotal_cents(price_cents[code], quantity)
+        for code, quantity in zip(columns.codes, columns.quantities)
+    ]
+    for row, quantity in columns.wide_quantities.items():
+        subtotals[row] = price_cents[columns.codes[row]] * quantity
+    return subtotals
+
+
+class SalesRollup:
+    """
+    Totales agrupados por fecha, por ticket (SALE_ID), por producto y por
+    tipo de producto, acumulados en la misma pasada que calcula los
+    subtotales. Los totales por producto se guardan en columnas indexadas
+    por el código del catálogo y los de tipo se derivan de ellas al final.
+    Con exact, los totales se acumulan en centavos como enteros de Python,
+    que no se desbordan como int64.
+    """
+
+    def __init__(self, index, exact=False):
+        self.index = index
+        self.exact = exact
+        self.by_date = {}
+        self.by_ticket = {}
+        self.product_quantities = array("d", bytes(8 * len(index.titles)))
+        if exact:
+            self.product_totals = [0] * len(index.titles)
+        else:
+            self.product_totals = array("d", bytes(8 * len(index.titles)))
+
+    def add(self, columns, subtotals):
+        """Agrega un lote de ventas válidas con sus subtotales."""
+        by_date = self.by_date
+        for date, subtotal in zip(columns.dates, subtotals):
+            by_date[date] = by_date.get(date, 0) + subtotal
+        by_ticket = self.by_ticket
+        for sale_id, subtotal in zip(columns.sale_ids, subtotals):
+            by_ticket[sale_id] = by_ticket.get(sale_id, 0) + subtotal
+
+        if np is not None:
+            codes = np.frombuffer(columns.codes, dtype=np.int64)
+            length = len(self.product_totals)
+            quantities = np.frombuffer(self.product_quantities, dtype=np.float64)
+            quantities += np.bincount(
+                codes, weights=np.frombuffer(columns.quantities, dtype=np.float64),
+                minlength=length
+            )
+            if not self.exact:
+                totals = np.frombuffer(self.product_totals, dtype=np.float64)
+                totals += np.bincount(codes, weights=subtotals, minlength=length)
+                return
+        else:
+            for code, quantity in zip(columns.codes, columns.quantities):
+                self.product_quantities[code] += quantity
+        product_totals = self.product_totals
+        for code, subtotal in zip(columns.codes, subtotals):
+            product_totals[code] += subtotal
+
+    def by_type(self):
+        """Devuelve los totales por tipo de producto del catálogo."""
+        totals = {}
+        for product_type, total in zip(self.index.types, self.product_totals):
+            if total:
+                totals[product_type] = totals.get(product_type, 0) + total
+        return totals
+
+    def top_products(self, limit=None):
+        """
+        Devuelve (título, cantidad, total) de los productos vendidos,
+        ordenados por total; con limit, solo los limit primeros (heap).
+        """
+        sold = [
+            (code, total)
+            for code, total in enumerate(self.product_totals) if total
+        ]
+        if limit is None:
+            ranked = sorted(sold, key=lambda item: item[1], reverse=True)
+        else:
+            ranked = heapq.nlargest(limit, sold, key=lambda item: item[1])
+        return [
+            (self.index.titles[code], self.product_quantities[code], total)
+            for code, total in ranked
+        ]
+
+    def format_lines(self, top_products=None):
+        """Devuelve las secciones del reporte con los totales agrupados."""
+        money = cents_to_decimal if self.exact else float
+        results = ["", "Totales por fecha", "-----------------"]
+        results.extend(
+            f"{date}: ${money(total):.2f}"
+            for date, total in self.by_date.items()
+        )
+        results.extend(["", "Totales por ticket (SALE_ID)", "-----------------"])
+        results.extend(
+            f"{sale_id}: ${money(total):.2f}"
+            for sale_id, total in self.by_ticket.items()
+        )
+        results.extend(["", "Totales por tipo", "-----------------"])
+        results.extend(
+            f"{product_type}: ${money(total):.2f}"
+            for product_type, total in sorted(
+                self.by_type().items(), key=lambda item: str(item[0])
+            )
+        )
+        results.extend(["", "Totales por producto", "-----------------"])
+        results.extend(
+            f"{title}: {quantity:g} unidades = ${money(total):.2f}"
+            for title, quantity, total in self.top_products(top_products)
+        )
+        return results
+
+
+def format_sale_lines(index, columns, subtotals, exact=False):
+    """
+    Genera la línea del reporte de cada venta válida de las columnas. Con
+    exact, precios y subtotales están en centavos enteros.
+    """
+    titles = index.titles
+    prices = index.prices
+    if exact:
+        prices = list(map(cents_to_decimal, index.price_cents))
+        subtotals = map(cents_to_decimal, subtotals)
+    # Cada precio se formatea una sola vez por lote, no por venta.
+    price_texts = [f"{price:.2f}" for price in prices]
+    wide_quantities = columns.wide_quantities
+    for row, (code, quantity, quantity_type, subtotal) in enumerate(zip(
+            columns.codes, columns.quantities,
+            columns.quantity_types, subtotals)):
+        if wide_quantities and row in wide_quantities:
+            shown_quantity = wide_quantities[row]
+        else:
+            shown_quantity = QUANTITY_TYPES[quantity_type](quantity)
+        yield (
+            f"{titles[code]}: {shown_quantity} x ${price_texts[code]} "
+            f"= ${subtotal:.2f}"
+        )
+
+
+def format_sales_summary(total_sales, invalid_count, invalid_details):
+    """
+    Devuelve las líneas finales del reporte: total y registros inválidos.
+    Si se guardaron menos detalles que registros inválidos, lo indica.
+    """
+    results = [
+        "-----------------",
+        f"Total de ventas: ${total_sales:.2f}",
+        f"Registros inválidos ignorados: {invalid_count}"
+    ]
+    if invalid_count:
+        results.append("Detalles de registros inválidos:")
+        results.extend(invalid_details)
+        if invalid_count > len(invalid_details):
+            results.append(
+                f"... y {invalid_count - len(invalid_details)} "
+                f"registros inválidos más."
+            )
+    return results
+
+
+def compute_total_sales_columnar(index, columns, options=ReportOptions(),
+                                 rollup=None):
+    """
+    Calcula el total de ventas a partir de las columnas. Produce el mismo
+    reporte que compute_total_sales; con options.details=False omite la
+    línea por venta y con un SalesRollup agrega al final los totales
+    agrupados. Con options.exact, suma centavos enteros y devuelve el total
+    como Decimal. Solo conviene sobre el motor dict con details=False: la
+    línea por venta se formatea desde las columnas y cuesta más que en
+    compute_total_sales, lo que se come lo ganado en el cálculo en bloque.
+    """
+    exact = options.exact
+    subtotals = compute_subtotals(index, columns, exact)
+    if exact:
+        total_sales = cents_to_decimal(sum(subtotals))
+    else:
+        total_sales = sum(subtotals, 0.0)
+    results = ["Resumen de Ventas", "-----------------"]
+    if options.details:
+        results.extend(format_sale_lines(index, columns, subtotals, exact))
+    invalid_sales = columns.invalid_sales
+    results.extend(
+        format_sales_summary(total_sales, len(invalid_sales), invalid_sales)
+    )
+    if rollup is not None:
+        rollup.add(columns, subtotals)
+        results.extend(rollup.format_lines(options.top_products))
+    return total_sales, results
+
+
+@dataclass
+class SalesTotals:
+    """
+    Total de ventas y cantidad de ventas válidas e inválidas acumulados por
+    lotes, con a lo más max_details detalles de registros inválidos. El
+    total es entero (centavos) si empieza en 0 y float si empieza en 0.0.
+    """
+
+    total: float = 0.0
+    valid_count: int = 0
+    invalid_count: int = 0
+    invalid_details: list = field(default_factory=list)
+    max_details: int = MAX_INVALID_DETAILS
+
+    def add(self, columns, subtotals):
+        """Agrega un lote de columnas con sus subtotales."""
+        self.total = sum(subtotals, self.total)
+        self.valid_count += len(columns)
+        self.invalid_count += len(columns.invalid_sales)
+        room = self.max_details - len(self.invalid_details)
+        self.invalid_details.extend(columns.invalid_sales[:room])
+
+    def row(self, name, money):
+        """Devuelve la fila del reporte por lotes con estos totales."""
+        return (
+            f"{name:<30} {self.valid_count:>8} {self.invalid_count:>10} "
+            f"{'$' + format(money(self.total), '.2f'):>16}"
+        )
+
+
+def iter_sales_batches(index, sales, batch_size=STREAM_BATCH_SIZE, warn=True,
+                       exact=False):
+    """
+    Genera (columnas, subtotales) por cada lote de batch_size ventas de un
+    iterable, usando el motor columnar; con exact, subtotales en centavos.
+    """
+    sales = iter(sales)
+    while True:
+        batch = list(islice(sales, batch_size))
+        if not batch:
+            return
+        columns = load_sales_columns(index, batch, warn)
+        yield columns, compute_subtotals(index, columns, exact)
+
+
+def iter_sales_report(index, sales, options=ReportOptions(), rollup=None,
+                      batch_size=STREAM_BATCH_SIZE):
+    """
+    Genera en flujo las líneas del reporte de ventas a partir de un iterable
+    de ventas (por ejemplo, iter_json_records). Procesa las ventas por lotes
+    de batch_size con el motor columnar y guarda a lo más
+    options.max_invalid_details detalles de registros inválidos, de modo que
+    la memoria usada no depende del tamaño del registro de ventas. Con un
+    SalesRollup, los totales agrupados se acumulan en la misma pasada. Con
+    options.exact, el total se acumula en centavos enteros.
+    """
+    exact = options.exact
+    yield "Resumen de Ventas"
+    yield "-----------------"
+    totals = SalesTotals(
+        0 if exact else 0.0, max_details=options.max_invalid_details
+    )
+    for columns, subtotals in iter_sales_batches(
+            index, sales, batch_size, exact=exact):
+        totals.add(columns, subtotals)
+        if rollup is not None:
+            rollup.add(columns, subtotals)
+        if options.details:
+            yield from format_sale_lines(index, columns, subtotals, exact)
+    total_sales = cents_to_decimal(totals.total) if exact else totals.total
+    yield from format_sales_summary(
+        total_sales, totals.invalid_count, totals.invalid_details
+    )
+    if rollup is not None:
+        yield from rollup.format_lines(options.top_products)
+
+
+# Índice del catálogo en cada proceso del modo por lotes; se recibe una sola
+# vez por proceso en init_worker en lugar de con cada archivo.
+_WORKER_INDEX = None
+
+
+def init_worker(index):
+    """Guarda el índice del catálogo compartido en el proceso trabajador."""
+    global _WORKER_INDEX  # pylint: disable=global-statement
+    _WORKER_INDEX = index
+
+
+def reconcile_sales_file(sales_file, options=ReportOptions()):
+    """
+    Calcula en flujo el total de un archivo de ventas con el índice del
+    proceso trabajador. Devuelve (archivo, SalesTotals) o (archivo,
+    mensaje de error). Con options.exact, el total está en centavos enteros.
+    """
+    totals = SalesTotals(
+        0 if options.exact else 0.0, max_details=options.max_invalid_details
+    )
+    try:
+        with open(sales_file, "r", encoding="utf-8") as file:
+            for columns, subtotals in iter_sales_batches(
+                    _WORKER_INDEX, iter_json_records(file), warn=False,
+                    exact=options.exact):
+                totals.add(columns, subtotals)
+    except FileNotFoundError:
+        return sales_file, f"Error: El archivo '{sales_file}' no existe."
+    except json.JSONDecodeError:
+        return sales_file, (
+            f"Error: El archivo '{sales_file}' no contiene un JSON válido."
+        )
+    return sales_file, totals
+
+
+def reconcile_sales_files(index, sales_files, workers=None,
+                          options=ReportOptions()):
+    """
+    Procesa varios archivos de ventas en paralelo compartiendo un único
+    índice del catálogo y devuelve las líneas del reporte por lotes:
+    una fila por archivo y una fila TOTAL. Con options.exact, los totales
+    se suman en centavos enteros.
+    """
+    money = cents_to_decimal if options.exact else float
+    results = [
+        f"{'ARCHIVO':<30} {'VENTAS':>8} {'INVÁLIDOS':>10} {'TOTAL':>16}"
+    ]
+    errors = []
+    grand = SalesTotals(0 if options.exact else 0.0)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(index,)) as executor:
+        futures = [
+            executor.submit(reconcile_sales_file, sales_file, options)
+            for sales_file in sales_files
+        ]
+        for future in futures:
+            sales_file, totals = future.result()
+            if isinstance(totals, str):
+                errors.append(totals)
+                continue
+            results.append(totals.row(sales_file, money))
+            grand.total += totals.total
+            grand.valid_count += totals.valid_count
+            grand.invalid_count += totals.invalid_count
+            grand.invalid_details.extend(
+                f"{sales_file}: {message}" for message in totals.invalid_details
+            )
+    results.append(grand.row("TOTAL", money))
+    if grand.invalid_details:
+        results.append("Detalles de registros inválidos:")
+        results.extend(grand.invalid_details)
+    results.extend(errors)
+    return results
+
+
+def write_sales_report(lines):
+    """
+    Muestra las líneas del reporte y las guarda en SalesResults.txt a medida
+    que se generan.
+    """
     with open("SalesResults.txt", "w", encoding="utf-8") as file:
-        file.write(output)
+        separator = ""
+        for line in lines:
+            file.write(separator + line)
+            sys.stdout.write(line + "\n")
+            separator = "\n"
+
+
+def parse_arguments():
+    """Lee los argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(
+        description="Calcula el total de ventas a partir de un catálogo de precios."
+    )
+    parser.add_argument("price_file", help="catálogo de productos (JSON)")
+    parser.add_argument(
+        "sales_files", nargs="+", metavar="sales_file",
+        help=(
+            "registro(s) de ventas (JSON); con varios archivos se procesan en "
+            "paralelo y se genera un reporte por archivo y combinado"
+        )
+    )
+    parser.add_argument(
+        "--engine", choices=("dict", "columnar", "stream"), default="dict",
+        help=(
+            "dict: recorre cada venta como diccionario; columnar: carga las "
+            "ventas en columnas con códigos de producto y calcula en bloque, "
+            "más rápido que dict solo con --no-details; "
+            "stream: lee las ventas una a una (arreglo JSON o JSON Lines) "
+            "en memoria constante"
+        )
+    )
+    parser.add_argument(
+        "--no-details", action="store_true",
+        help="con --engine columnar o stream, omite la línea por cada venta"
+    )
+    parser.add_argument(
+        "--max-invalid-details", type=int, default=MAX_INVALID_DETAILS,
+        metavar="N",
+        help="con --engine stream, detalles de registros inválidos a conservar"
+    )
+    parser.add_argument(
+        "--rollups", action="store_true",
+        help=(
+            "con --engine columnar o stream, agrega totales por fecha, "
+            "ticket, tipo y producto"
+        )
+    )
+    parser.add_argument(
+        "--top-products", type=int, default=None, metavar="N",
+        help="con --rollups, muestra solo los N productos con mayor total"
+    )
+    parser.add_argument(
+        "--money", choices=("float", "cents"), default="float",
+        help=(
+            "con --engine columnar o stream o con varios archivos, cents "
+            "convierte los precios a centavos enteros y suma de forma exacta"
+        )
+    )
+    parser.add_argument(
+        "--catalogue-cache", action="store_true",
+        help=(
+            "guarda el índice del catálogo en <catálogo>.cache y lo reutiliza "
+            "mientras el JSON no cambie"
+        )
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, metavar="N",
+        help=(
+            "con varios archivos de ventas, cantidad de procesos "
+            "(por defecto, uno por CPU)"
+        )
+    )
+    return parser.parse_args()
+
+
+def stream_sales(index, sales_file, args):
+    """
+    Ejecuta el motor en flujo y escribe el reporte mientras lee las ventas.
+    Devuelve False si el archivo de ventas no existe o no es JSON válido.
+    """
+    try:
+        with open(sales_file, "r", encoding="utf-8") as file:
+            options = ReportOptions.from_args(args)
+            write_sales_report(iter_sales_report(
+                index, iter_json_records(file), options,
+                rollup=(
+                    SalesRollup(index, options.exact) if args.rollups else None
+                )
+            ))
+    except FileNotFoundError:
+        print(f"Error: El archivo '{sales_file}' no existe.")
+        return False
+    except json.JSONDecodeError:
+        print(
+            f"\nError: El archivo '{sales_file}' no contiene "
+            f"un JSON válido."
+        )
+        return False
+    return True
+
+
+def main():
+    """Función principal que ejecuta el cálculo de ventas."""
+    start_time = time.time()
+    args = parse_arguments()
+    price_file, sales_file = args.price_file, args.sales_files[0]
+
+    # Cargar datos
+    if len(args.sales_files) > 1:
+        index = load_catalogue_index(price_file, args.catalogue_cache)
+        if index is None:
+            return
+        write_sales_report(reconcile_sales_files(
+            index, args.sales_files, args.workers, ReportOptions.from_args(args)
+        ))
+    elif args.engine == "stream":
+        index = load_catalogue_index(price_file, args.catalogue_cache)
+        if index is None or not stream_sales(index, sales_file, args):
+            return
+    else:
+        if args.engine == "columnar":
+            index = load_catalogue_index(price_file, args.catalogue_cache)
+        else:
+            product_list = load_json(price_file)
+        sales_record = load_json(sales_file)
+
+        if args.engine == "columnar":
+            if index is None or sales_record is None:
+                return
+            columns = load_sales_columns(index, sales_record)
+            options = ReportOptions.from_args(args)
+            _, sales_results = compute_total_sales_columnar(
+                index, columns, options,
+                rollup=SalesRollup(index, options.exact) if args.rollups else None
+            )
+        else:
+            if product_list is None or sales_record is None:
+                return
+
+            # Construir catálogo de precios
+            price_catalogue = build_price_catalogue(product_list)
+
+            # Calcular ventas
+            _, sales_results = compute_total_sales(price_catalogue, sales_record)
+
+        # Mostrar resultados y guardarlos en archivo
+        write_sales_report(sales_results)
 
     elapsed_time = time.time() - start_time
     print(f"\nTiempo de ejecución: {elapsed_time:.2f} segundos")
@@ -0,0 +1,124 @@
+"""
+Lectura en flujo de archivos JSON: los objetos de un arreglo de nivel
+superior o de un archivo JSON Lines se generan uno a uno, leyendo el
+archivo por bloques en memoria constante.
+"""
+
+import json
+import re
+
+
+# Primer carácter que no es espacio en blanco (los mismos que salta json).
+_NON_WHITESPACE = re.compile(r"[^ \t\n\r]")
+
+
+class _BlockReader:
+    """Lee un archivo de texto por bloques y mantiene la posición actual."""
+
+    def __init__(self, file, block_size):
+        self.file = file
+        self.block_size = block_size
+        self.buffer = ""
+        self.position = 0
+        self.at_end = False
+
+    def refill(self):
+        """Descarta lo ya consumido y agrega el siguiente bloque al buffer."""
+        block = self.file.read(self.block_size)
+        self.at_end = not block
+        self.buffer = self.buffer[self.position:] + block
+        self.position = 0
+
+    def peek(self):
+        """
+        Salta los espacios en blanco y devuelve el siguiente carácter,
+        o "" si el archivo terminó.
+        """
+        while True:
+            match = _NON_WHITESPACE.search(self.buffer, self.position)
+            if match:
+                self.position = match.start()
+                return match.group()
+            self.position = len(self.buffer)
+            if self.at_end:
+                return ""
+            self.refill()
+
+    def following(self, position):
+        """
+        Devuelve el primer carácter que no es espacio desde position sin
+        copiar el buffer, o "" si no hay ninguno en el bloque actual.
+        """
+        match = _NON_WHITESPACE.search(self.buffer, position)
+        return match.group() if match else ""
+
+
+def iter_json_records(file, block_size=1 << 16):
+    """
+    Genera uno a uno los objetos de un archivo abierto que contiene un
+    arreglo JSON de nivel superior, leyéndolo por bloques, o de un archivo
+    JSON Lines (un objeto por línea). Lanza json.JSONDecodeError si el
+    contenido no es válido.
+    """
+    reader = _BlockReader(file, block_size)
+    first_char = reader.peek()
+    if not first_char:
+        return
+    if first_char == "[":
+        reader.position += 1
+        yield from _iter_json_array(reader)
+    else:
+        yield from _iter_json_lines(reader)
+
+
+def _iter_json_lines(reader):
+    """Genera los objetos de un archivo JSON Lines (uno por línea no vacía)."""
+    pending = reader.buffer[reader.position:]
+    while True:
+        lines = pending.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+        block = reader.file.read(reader.block_size)
+        if not block:
+            break
+        pending += block
+    if pending.strip():
+        yield json.loads(pending)
+
+
+def _iter_json_array(reader):
+    """Genera los elementos de un arreglo JSON cuyo '[' ya se consumió."""
+    decoder = json.JSONDecoder()
+    first = True
+    while True:
+        char = reader.peek()
+        if char == "]":
+            reader.position += 1
+            return
+        if not first:
+            if char != ",":
+                raise json.JSONDecodeError(
+                    "Se esperaba ',' o ']'", reader.buffer, reader.position
+                )
+            reader.position += 1
+            char = reader.peek()
+        if not char:
+            raise json.JSONDecodeError(
+                "Arreglo JSON incompleto", reader.buffer, reader.position
+            )
+        # El valor puede continuar en el siguiente bloque (por ejemplo, un
+        # número cortado): solo se acepta si tras él ya se ve el separador.
+        while True:
+            try:
+                record, end = decoder.raw_decode(reader.buffer, reader.position)
+                if reader.at_end or reader.following(end) in (",", "]"):
+                    break
+            except json.JSONDecodeError:
+                if reader.at_end:
+                    raise
+            reader.refill()
+        reader.position = end
+        first = False
+        yield record
@@ -0,0 +1,467 @@
+"""
+Pruebas unitarias para los motores de compute_sales.
+"""
+
+import glob
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from decimal import Decimal
+from unittest import mock
+
+import compute_sales
+from compute_sales import (
+    CatalogueIndex, SalesRollup, build_price_catalogue, compute_subtotals,
+    compute_total_sales, compute_total_sales_columnar, format_sale_lines,
+    iter_sales_report, load_catalogue_index, load_sales_columns,
+    reconcile_sales_files, ReportOptions
+)
+from json_stream import iter_json_records
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+PRICE_FILE = os.path.join(DIRECTORY, "price_catalogue.json")
+SALES_FILES = sorted(glob.glob(os.path.join(DIRECTORY, "sales_record*.json")))
+
+
+def load_sample(filename):
+    """Carga un archivo JSON de ejemplo."""
+    with open(filename, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+class SalesCase(unittest.TestCase):
+    """
+    Copia el catálogo a un directorio temporal, donde se escriben el caché
+    y SalesResults.txt. Los reportes del motor dict de cada archivo se
+    calculan una sola vez.
+    """
+
+    dict_reports = {}
+
+    def setUp(self):
+        """Crea el directorio temporal con el catálogo."""
+        self.directory = tempfile.mkdtemp()
+        self.price_file = os.path.join(self.directory, "price_catalogue.json")
+        shutil.copy(PRICE_FILE, self.price_file)
+        self.index = CatalogueIndex.from_products(load_sample(PRICE_FILE))
+
+    def tearDown(self):
+        """Elimina los archivos temporales."""
+        shutil.rmtree(self.directory)
+
+    def run_main(self, *arguments):
+        """Ejecuta main() y devuelve SalesResults.txt sin el tiempo."""
+        current = os.getcwd()
+        os.chdir(self.directory)
+        try:
+            argv = ["compute_sales.py", *arguments]
+            with mock.patch.object(sys, "argv", argv), \
+                    redirect_stdout(io.StringIO()):
+                compute_sales.main()
+            with open("SalesResults.txt", "r", encoding="utf-8") as file:
+                return file.read().rsplit("\n", 1)[0]
+        finally:
+            os.chdir(current)
+
+    def dict_report(self, sales_file):
+        """Reporte del motor dict (el original) para un archivo de ventas."""
+        if sales_file not in self.dict_reports:
+            self.dict_reports[sales_file] = self.run_main(self.price_file, sales_file)
+        return self.dict_reports[sales_file]
+
+
+class TestEngines(SalesCase):
+    """Cada motor y combinación de opciones coincide con el motor dict."""
+
+    def test_same_report(self):
+        """columnar, stream, cents y el caché dan el reporte de dict."""
+        for sales_file in SALES_FILES:
+            expected = self.dict_report(sales_file)
+            for arguments in (
+                    ("--engine", "columnar"), ("--engine", "stream"),
+                    ("--engine", "columnar", "--money", "cents"),
+                    ("--engine", "stream", "--money", "cents"),
+                    ("--engine", "columnar", "--catalogue-cache"),
+                    ("--engine", "stream", "--catalogue-cache"),
+                    ("--catalogue-cache",)):
+                self.assertEqual(
+                    self.run_main(*arguments, self.price_file, sales_file),
+                    expected, (sales_file, arguments)
+                )
+
+    def test_no_details(self):
+        """--no-details solo omite la línea por cada venta."""
+        for sales_file in SALES_FILES:
+            expected = "\n".join(
+                line for line in self.dict_report(sales_file).split("\n")
+                if " x $" not in line
+            )
+            for engine in ("columnar", "stream"):
+                for money in ("float", "cents"):
+                    arguments = ("--engine", engine, "--money", money, "--no-details")
+                    self.assertEqual(
+                        self.run_main(*arguments, self.price_file, sales_file),
+                        expected, arguments
+                    )
+
+    def test_rollups_appended(self):
+        """--rollups agrega los totales agrupados al final del reporte."""
+        for sales_file in SALES_FILES:
+            expected = self.dict_report(sales_file) + "\n\nTotales por fecha\n"
+            for engine in ("columnar", "stream"):
+                for money in ("float", "cents"):
+                    arguments = ("--engine", engine, "--money", money, "--rollups")
+                    report = self.run_main(*arguments, self.price_file, sales_file)
+                    self.assertTrue(report.startswith(expected), arguments)
+
+
+class TestColumnar(SalesCase):
+    """Pruebas de la carga en columnas."""
+
+    def test_invalid_records(self):
+        """Los registros inválidos se reportan igual que en el motor dict."""
+        sales = [
+            {"Product": "Brown eggs", "Quantity": 2},
+            {"Product": "Nope", "Quantity": 1},
+            {"Product": "Brown eggs", "Quantity": "3"},
+            {"Product": "Brown eggs", "Quantity": -1},
+            {"Product": "Brown eggs", "Quantity": 0},
+            {"Product": "Brown eggs", "Quantity": None},
+            {"Product": "Brown eggs", "Quantity": True},
+            {"Product": "Brown eggs", "Quantity": 0.5},
+        ]
+        catalogue = build_price_catalogue(load_sample(PRICE_FILE))
+        with redirect_stdout(io.StringIO()) as dict_output:
+            expected_total, expected = compute_total_sales(catalogue, sales)
+        with redirect_stdout(io.StringIO()) as output:
+            columns = load_sales_columns(self.index, sales)
+            total, results = compute_total_sales_columnar(self.index, columns)
+        self.assertEqual(output.getvalue(), dict_output.getvalue())
+        self.assertEqual((total, results), (expected_total, expected))
+        self.assertEqual(len(columns), 3)
+        self.assertEqual(list(columns.quantity_types), [1, 2, 0])
+
+    def test_all_valid_batch(self):
+        """Un lote sin inválidos da las mismas columnas que revisado por fila."""
+        sales = load_sample(SALES_FILES[0])
+        valid = [
+            sale for sale in sales
+            if self.index.code(sale["Product"]) >= 0 and sale["Quantity"] > 0
+        ]
+        with redirect_stdout(io.StringIO()):
+            columns = load_sales_columns(self.index, sales)
+        valid_columns = load_sales_columns(self.index, iter(valid), warn=False)
+        self.assertEqual(valid_columns.invalid_sales, [])
+        for name in ("codes", "quantities", "quantity_types", "sale_ids", "dates"):
+            self.assertEqual(getattr(valid_columns, name), getattr(columns, name))
+
+    def test_nan_quantity(self):
+        """NaN pasa la validación igual que en el motor dict."""
+        sales = [{"Product": "Brown eggs", "Quantity": float("nan")},
+                 {"Product": "Brown eggs", "Quantity": -2}]
+        with redirect_stdout(io.StringIO()):
+            columns = load_sales_columns(self.index, sales)
+        self.assertEqual(len(columns), 1)
+        self.assertEqual(len(columns.invalid_sales), 1)
+
+
+class TestJsonStream(unittest.TestCase):
+    """Pruebas del lector en flujo con raw_decode."""
+
+    def setUp(self):
+        """Lee el texto del primer archivo de ventas."""
+        with open(SALES_FILES[0], "r", encoding="utf-8") as file:
+            self.text = file.read()
+        self.records = json.loads(self.text)
+
+    def test_block_boundaries(self):
+        """Un valor cortado entre bloques se decodifica completo."""
+        for block_size in (1, 2, 3, 7, 64, 1 << 16):
+            records = list(iter_json_records(io.StringIO(self.text), block_size))
+            self.assertEqual(records, self.records, block_size)
+
+    def test_split_number(self):
+        """Un número cortado al final de un bloque no se lee a medias."""
+        for block_size in range(1, 12):
+            records = list(iter_json_records(io.StringIO("[12345, 678]"), block_size))
+            self.assertEqual(records, [12345, 678], block_size)
+
+    def test_json_lines(self):
+        """Un archivo JSON Lines se lee objeto por objeto."""
+        text = "\n".join(json.dumps(record) for record in self.records) + "\n\n"
+        records = list(iter_json_records(io.StringIO(text), block_size=5))
+        self.assertEqual(records, self.records)
+
+    def test_empty(self):
+        """Un archivo vacío o un arreglo vacío no generan objetos."""
+        for text in ("", "  \n", "[]", " [ ] "):
+            self.assertEqual(list(iter_json_records(io.StringIO(text))), [])
+
+    def test_truncated_stream(self):
+        """Un arreglo cortado lanza JSONDecodeError tras los objetos completos."""
+        for cut in (1, len(self.text) // 3, len(self.text) // 2, len(self.text) - 2):
+            records = []
+            with self.assertRaises(json.JSONDecodeError):
+                for record in iter_json_records(io.StringIO(self.text[:cut]), 64):
+                    records.append(record)
+            self.assertEqual(records, self.records[:len(records)])
+
+    def test_missing_separator(self):
+        """Dos valores sin coma entre ellos son un error."""
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_records(io.StringIO('[{"a": 1} {"b": 2}]')))
+
+
+class TestTruncatedReport(SalesCase):
+    """El motor stream reporta un archivo cortado como JSON inválido."""
+
+    def test_stream_engine(self):
+        """main() informa el error en lugar de fallar."""
+        truncated = os.path.join(self.directory, "truncated.json")
+        with open(SALES_FILES[0], "r", encoding="utf-8") as source, \
+                open(truncated, "w", encoding="utf-8") as file:
+            file.write(source.read()[:-20])
+        current = os.getcwd()
+        os.chdir(self.directory)
+        try:
+            argv = ["compute_sales.py", "--engine", "stream", self.price_file, truncated]
+            with mock.patch.object(sys, "argv", argv), \
+                    redirect_stdout(io.StringIO()) as output:
+                compute_sales.main()
+        finally:
+            os.chdir(current)
+        self.assertIn("no contiene un JSON válido", output.getvalue())
+
+
+class TestCatalogueCache(SalesCase):
+    """Pruebas del caché compilado del catálogo (marshal)."""
+
+    def load(self):
+        """Carga el índice con caché y devuelve sus columnas."""
+        index = load_catalogue_index(self.price_file, use_cache=True)
+        return index.titles, list(index.prices), index.types
+
+    def test_cache_reused(self):
+        """Con el catálogo sin cambios no se vuelve a leer el JSON."""
+        expected = self.load()
+        self.assertTrue(os.path.exists(self.price_file + ".cache"))
+        with mock.patch.object(compute_sales, "load_json") as load_json, \
+                mock.patch.object(compute_sales, "_file_sha256") as file_sha256:
+            self.assertEqual(self.load(), expected)
+        load_json.assert_not_called()
+        file_sha256.assert_not_called()
+
+    def test_touched_catalogue(self):
+        """Si solo cambia la fecha, el hash valida el caché y se actualiza."""
+        expected = self.load()
+        stat = os.stat(self.price_file)
+        os.utime(self.price_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        with mock.patch.object(compute_sales, "load_json") as load_json:
+            self.assertEqual(self.load(), expected)
+            with mock.patch.object(compute_sales, "_file_sha256") as file_sha256:
+                self.assertEqual(self.load(), expected)
+        load_json.assert_not_called()
+        file_sha256.assert_not_called()
+
+    def test_changed_catalogue(self):
+        """Un precio nuevo, aun con el mismo tamaño y fecha, invalida el caché."""
+        self.load()
+        stat = os.stat(self.price_file)
+        with open(self.price_file, "r", encoding="utf-8") as file:
+            text = file.read()
+        with open(self.price_file, "w", encoding="utf-8") as file:
+            file.write(text.replace('"price": 28.1', '"price": 29.1', 1))
+        os.utime(self.price_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertEqual(self.load()[1][0], 29.1)
+
+    def test_corrupt_cache(self):
+        """Un caché dañado o de otra versión se reconstruye."""
+        expected = self.load()
+        for content in (b"", b"basura", compute_sales.marshal.dumps((0,) * 7)):
+            with open(self.price_file + ".cache", "wb") as file:
+                file.write(content)
+            self.assertEqual(self.load(), expected)
+
+
+class TestRollups(SalesCase):
+    """Los totales agrupados suman lo mismo que las ventas."""
+
+    def test_groups_add_up(self):
+        """Cada agrupación suma el total y los productos coinciden."""
+        catalogue = build_price_catalogue(load_sample(PRICE_FILE))
+        for sales_file in SALES_FILES:
+            sales = load_sample(sales_file)
+            expected = {}
+            for sale in sales:
+                if sale["Product"] in catalogue and sale["Quantity"] > 0:
+                    expected[sale["Product"]] = (
+                        expected.get(sale["Product"], 0)
+                        + catalogue[sale["Product"]] * sale["Quantity"]
+                    )
+            with redirect_stdout(io.StringIO()):
+                columns = load_sales_columns(self.index, sales)
+            rollup = SalesRollup(self.index)
+            total, _ = compute_total_sales_columnar(
+                self.index, columns, rollup=rollup
+            )
+            for groups in (rollup.by_date, rollup.by_ticket, rollup.by_type()):
+                self.assertAlmostEqual(sum(groups.values()), total, places=6)
+            products = {title: amount for title, _, amount in rollup.top_products()}
+            self.assertEqual(products.keys(), expected.keys())
+            for title, amount in expected.items():
+                self.assertAlmostEqual(products[title], amount, places=6)
+
+    def test_cents_groups_exact(self):
+        """En centavos las agrupaciones suman exactamente el total."""
+        sales = load_sample(SALES_FILES[0])
+        with redirect_stdout(io.StringIO()):
+            columns = load_sales_columns(self.index, sales)
+        rollup = SalesRollup(self.index, exact=True)
+        total, _ = compute_total_sales_columnar(
+            self.index, columns, ReportOptions(exact=True), rollup
+        )
+        for groups in (rollup.by_date, rollup.by_ticket, rollup.by_type()):
+            self.assertEqual(Decimal(sum(groups.values())).scaleb(-2), total)
+
+    def test_top_products(self):
+        """top_products(limit) da los primeros de la lista completa."""
+        with redirect_stdout(io.StringIO()):
+            columns = load_sales_columns(self.index, load_sample(SALES_FILES[0]))
+        rollup = SalesRollup(self.index)
+        rollup.add(columns, compute_subtotals(self.index, columns))
+        ranked = rollup.top_products()
+        self.assertEqual(rollup.top_products(3), ranked[:3])
+        totals = [amount for _, _, amount in ranked]
+        self.assertEqual(totals, sorted(totals, reverse=True))
+
+    def test_batches_same_as_whole(self):
+        """Acumular por lotes en flujo da los mismos totales agrupados."""
+        sales = load_sample(SALES_FILES[0])
+        with redirect_stdout(io.StringIO()):
+            columns = load_sales_columns(self.index, sales)
+            whole = SalesRollup(self.index, exact=True)
+            whole.add(columns, compute_subtotals(self.index, columns, exact=True))
+            batched = SalesRollup(self.index, exact=True)
+            list(iter_sales_report(
+                self.index, sales, ReportOptions(exact=True), batched, batch_size=5
+            ))
+        self.assertEqual(batched.by_date, whole.by_date)
+        self.assertEqual(batched.by_ticket, whole.by_ticket)
+        self.assertEqual(batched.product_totals, whole.product_totals)
+
+
+class TestReconcile(SalesCase):
+    """Pruebas de la conciliación por lotes de varios archivos."""
+
+    def test_total_row(self):
+        """Cada fila y la fila TOTAL coinciden con el motor dict."""
+        catalogue = build_price_catalogue(load_sample(PRICE_FILE))
+        missing = os.path.join(self.directory, "missing.json")
+        results = reconcile_sales_files(
+            self.index, SALES_FILES + [missing], workers=2
+        )
+        grand_total = 0.0
+        grand_valid = 0
+        for sales_file, row in zip(SALES_FILES, results[1:]):
+            sales = load_sample(sales_file)
+            with redirect_stdout(io.StringIO()):
+                total, lines = compute_total_sales(catalogue, sales)
+            valid = sum(" x $" in line for line in lines)
+            self.assertEqual(row.split()[-3:], [
+                str(valid), str(len(sales) - valid), f"${total:.2f}"
+            ])
+            grand_total += total
+            grand_valid += valid
+        total_row = results[len(SALES_FILES) + 1].split()
+        self.assertEqual(total_row[0], "TOTAL")
+        self.assertEqual(total_row[1], str(grand_valid))
+        self.assertEqual(total_row[3], f"${grand_total:.2f}")
+        self.assertEqual(results[-1], f"Error: El archivo '{missing}' no existe.")
+
+    def test_cents_matches_float(self):
+        """En centavos las filas dan los mismos montos con dos decimales."""
+        float_rows = reconcile_sales_files(self.index, SALES_FILES, workers=2)
+        cents_rows = reconcile_sales_files(
+            self.index, SALES_FILES, workers=2, options=ReportOptions(exact=True)
+        )
+        self.assertEqual(cents_rows, float_rows)
+
+    def test_cli_report(self):
+        """Con varios archivos main() escribe el reporte por lotes."""
+        report = self.run_main(self.price_file, *SALES_FILES, "--workers", "2")
+        self.assertEqual(
+            report.split("\n"),
+            reconcile_sales_files(self.index, SALES_FILES, workers=2)
+        )
+
+
+class TestCentsOverflow(unittest.TestCase):
+    """Centavos exactos con cantidades enteras grandes."""
+
+    def setUp(self):
+        """Crea un catálogo con un precio y ventas que pasan de int64."""
+        self.index = CatalogueIndex.from_products([
+            {"title": "Leche", "type": "dairy", "price": 28.1},
+            {"title": "Pan", "type": "bakery", "price": 0.5},
+        ])
+        self.sales = [
+            {"SALE_ID": 1, "SALE_Date": "01/01/23", "Product": "Leche",
+             "Quantity": 2 ** 53 + 1},
+            {"SALE_ID": 2, "SALE_Date": "01/01/23", "Product": "Pan",
+             "Quantity": 3},
+            {"SALE_ID": 3, "SALE_Date": "02/01/23", "Product": "Leche",
+             "Quantity": 10 ** 17},
+        ]
+        self.expected = [2810 * (2 ** 53 + 1), 150, 2810 * 10 ** 17]
+
+    def compute(self):
+        """Devuelve los subtotales en centavos, el rollup y las líneas."""
+        columns = load_sales_columns(self.index, self.sales)
+        subtotals = compute_subtotals(self.index, columns, exact=True)
+        rollup = SalesRollup(self.index, exact=True)
+        rollup.add(columns, subtotals)
+        lines = list(format_sale_lines(self.index, columns, subtotals, exact=True))
+        return subtotals, rollup, lines
+
+    def test_wide_quantities_kept(self):
+        """Las cantidades que un float redondea se guardan como enteros."""
+        columns = load_sales_columns(self.index, self.sales)
+        self.assertEqual(
+            columns.wide_quantities, {0: 2 ** 53 + 1, 2: 10 ** 17}
+        )
+
+    def test_exact_subtotals(self):
+        """Los subtotales y el rollup no se desbordan ni se redondean."""
+        subtotals, rollup, lines = self.compute()
+        self.assertEqual(subtotals, self.expected)
+        self.assertEqual(
+            rollup.product_totals, [self.expected[0] + self.expected[2], 150]
+        )
+        self.assertEqual(
+            lines[0],
+            "Leche: 9007199254740993 x $28.10 = $253102299058221903.30"
+        )
+
+    def test_int64_overflow_without_wide_quantities(self):
+        """Un producto fuera de int64 usa enteros aunque quepa en un float."""
+        self.sales = [self.sales[1], {"Product": "Leche", "Quantity": 2 ** 53}]
+        subtotals, _, _ = self.compute()
+        self.assertEqual(subtotals, [150, 2810 * 2 ** 53])
+
+    def test_without_numpy(self):
+        """Sin NumPy los subtotales, el rollup y las líneas son los mismos."""
+        subtotals, rollup, lines = self.compute()
+        with mock.patch.object(compute_sales, "np", None):
+            plain_subtotals, plain_rollup, plain_lines = self.compute()
+        self.assertEqual(plain_subtotals, subtotals)
+        self.assertEqual(plain_rollup.product_totals, rollup.product_totals)
+        self.assertEqual(plain_lines, lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
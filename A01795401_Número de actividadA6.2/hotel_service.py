@@ -0,0 +1,371 @@
+"""
+Servicio de reservas asíncrono sobre hotel_system.
+Mantiene hoteles, clientes y reservas en memoria y atiende peticiones JSON
+(una por línea) por TCP o por un socket Unix.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+from contextlib import ExitStack, redirect_stdout
+
+from hotel_system import Hotel, Customer, Reservation, Repository, ConflictError
+
+
+# Tiempo (segundos) que una escritura espera para agruparse con las demás
+# escrituras concurrentes en un mismo commit.
+COMMIT_DELAY = 0.002
+
+# Operaciones de escritura: función de hotel_system, clase cuyos FIELDS
+# validan la petición, campos de la petición que recibe como argumentos y
+# campos opcionales (None si faltan).
+WRITE_OPERATIONS = {
+    "create_hotel": (
+        Hotel.create_hotel, Hotel,
+        ("hotel_id", "name", "location", "rooms_available"), ()
+    ),
+    "create_customer": (
+        Customer.create_customer, Customer, ("customer_id", "name", "email"), ()
+    ),
+    "reserve": (
+        Reservation.create_reservation, Reservation,
+        ("reservation_id", "customer_id", "hotel_id"),
+        ("check_in", "check_out")
+    ),
+    "cancel": (
+        Reservation.cancel_reservation, Reservation, ("reservation_id",), ()
+    ),
+}
+
+# Campos de las peticiones que identifican a cada clase de entidad.
+ENTITY_FIELDS = (
+    (Hotel, "hotel_id"), (Customer, "customer_id"),
+    (Reservation, "reservation_id"),
+)
+
+
+def _capture(function, *args):
+    """
+    Ejecuta una operación de hotel_system y devuelve (resultado, mensajes),
+    donde mensajes es lo que la operación mostró en pantalla.
+    """
+    output = io.StringIO()
+    with redirect_stdout(output):
+        result = function(*args)
+    return result, output.getvalue().strip()
+
+
+def _affected_keys(row):
+    """
+    Entidades (clase, llave) que puede modificar una escritura con los
+    campos de row: las que nombra y el hotel de la reserva que nombra.
+    """
+    keys = [
+        (entity_class, row[field])
+        for entity_class, field in ENTITY_FIELDS if field in row
+    ]
+    reservation = Reservation.get(row.get("reservation_id"))
+    if reservation is not None:
+        keys.append((Hotel, reservation.hotel_id))
+    return keys
+
+
+def _read_hotels(request):
+    """Hoteles, opcionalmente de una ubicación y con min_rooms disponibles."""
+    min_rooms = request.get("min_rooms", 0)
+    if "location" in request:
+        hotels = Hotel.find_hotels_by_location(request["location"], min_rooms)
+    else:
+        hotels = [
+            hotel for hotel in Hotel.load_hotels()
+            if hotel.rooms_available >= min_rooms
+        ]
+    return [hotel.to_dict() for hotel in hotels]
+
+
+def _read_reservations(request):
+    """Reservas de un cliente (customer_id) o de un hotel (hotel_id)."""
+    if "customer_id" in request:
+        reservations = Reservation.find_reservations_by_customer(
+            request["customer_id"]
+        )
+    else:
+        reservations = Reservation.find_reservations_by_hotel(request["hotel_id"])
+    return [res.to_dict() for res in reservations]
+
+
+def _read_available(request):
+    """
+    Hoteles (de location, si se indica) con al menos rooms habitaciones
+    libres todas las noches de check_in a check_out.
+    """
+    hotels = Hotel.find_available_hotels(
+        request["check_in"], request["check_out"], request.get("rooms", 1),
+        request.get("location")
+    )
+    return [hotel.to_dict() for hotel in hotels]
+
+
+def _read_entity(entity_class, field):
+    """Lectura de una entidad por su llave; None si no existe."""
+    def read(request):
+        entity = entity_class.get(request[field])
+        return None if entity is None else entity.to_dict()
+    return read
+
+
+READ_OPERATIONS = {
+    "hotel": _read_entity(Hotel, "hotel_id"),
+    "customer": _read_entity(Customer, "customer_id"),
+    "hotels": _read_hotels,
+    "reservations": _read_reservations,
+    "available": _read_available,
+}
+
+
+class GroupCommit:
+    """
+    Commit de grupo de un Repository: las escrituras que llegan durante
+    delay segundos esperan juntas a una sola confirmación. La escritura
+    (y su fsync) corre en un hilo aparte sin tomar el lock del
+    Repository, así que las lecturas se siguen atendiendo; idle() hace
+    esperar a las escrituras nuevas sin bloquear el ciclo de eventos.
+    """
+
+    def __init__(self, repository, delay=COMMIT_DELAY):
+        self.repository = repository
+        self.delay = delay
+        self.commits = 0
+        self._waiters = []
+        self._task = None
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    async def idle(self):
+        """Espera a que no haya un commit en curso."""
+        await self._idle.wait()
+
+    async def wait(self):
+        """Espera al próximo commit de grupo; lanza su error si falla."""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._delayed_commit())
+        await future
+
+    async def _delayed_commit(self):
+        await asyncio.sleep(self.delay)
+        await self.commit()
+
+    async def commit(self):
+        """
+        Confirma en una sola escritura los cambios de las escrituras que
+        esperan. Si la escritura falla (otro proceso cambió los archivos o
+        un error de disco), esas escrituras reciben el error y el
+        Repository descarta sus cambios, que se vuelven a leer del disco.
+        Como las escrituras nuevas esperan a idle(), los cambios
+        descartados son solo los de este grupo.
+        """
+        task, self._task = self._task, None
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+        waiters, self._waiters = self._waiters, []
+        self._idle.clear()
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.repository.commit
+            )
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(error)
+            return
+        finally:
+            self._idle.set()
+        self.commits += 1
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+
+class BookingService:
+    """
+    Servicio que conserva el estado en un Repository residente. Las
+    lecturas se responden desde memoria, sin esperar a un commit en curso;
+    las escrituras se aplican en memoria en el orden en que llegan y
+    esperan a un commit de grupo: todas las escrituras recibidas durante
+    commit_delay segundos se confirman con una sola escritura del diario
+    (y un solo fsync) antes de responder.
+    """
+
+    def __init__(self, journal=True, commit_delay=COMMIT_DELAY):
+        self.repository = Repository(journal=journal)
+        self.group = GroupCommit(self.repository, commit_delay)
+        self._session = ExitStack()
+        self._server = None
+        self._writers = set()
+
+    @property
+    def commits(self):
+        """Número de commits de grupo realizados."""
+        return self.group.commits
+
+    async def start(self, host="127.0.0.1", port=0, path=None):
+        """
+        Carga los datos y empieza a atender conexiones por TCP o, con path,
+        por un socket Unix. Devuelve el servidor de asyncio.
+        """
+        self._session.enter_context(self.repository)
+        for entity_class in (Hotel, Customer, Reservation):
+            self.repository.table(entity_class)
+        if path is not None:
+            self._server = await asyncio.start_unix_server(
+                self.handle_connection, path
+            )
+        else:
+            self._server = await asyncio.start_server(
+                self.handle_connection, host, port
+            )
+        return self._server
+
+    async def close(self):
+        """Deja de atender conexiones y confirma las escrituras pendientes."""
+        if self._server is None:
+            return
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+        self._server = None
+        await self.group.idle()
+        await self.group.commit()
+        self._session.close()
+
+    async def handle_connection(self, reader, writer):
+        """
+        Atiende una conexión: cada línea es una petición JSON y cada
+        respuesta se escribe en una línea, con el mismo "id" de la petición.
+        Las peticiones de una conexión se atienden de forma concurrente.
+        """
+        tasks = set()
+        self._writers.add(writer)
+        try:
+            while line := await reader.readline():
+                task = asyncio.create_task(self._respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _respond(self, line, writer):
+        try:
+            request = json.loads(line)
+        except ValueError:
+            response = {"ok": False, "error": "Error: Petición JSON inválida."}
+        else:
+            response = await self.handle_request(request)
+            if isinstance(request, dict) and "id" in request:
+                response["id"] = request["id"]
+        writer.write(json.dumps(response).encode("utf-8") + b"\n")
+        await writer.drain()
+
+    async def handle_request(self, request):
+        """
+        Ejecuta una petición y devuelve la respuesta como diccionario.
+        Cualquier error se responde con "ok": false; la conexión sigue
+        abierta para las demás peticiones.
+        """
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "Error: La petición debe ser un objeto JSON."}
+        operation = request.get("op")
+        try:
+            if operation in READ_OPERATIONS:
+                return {"ok": True, "result": READ_OPERATIONS[operation](request)}
+            if operation in WRITE_OPERATIONS:
+                await self.group.idle()
+                return await self._write(operation, request)
+            raise ValueError(f"Error: Operación desconocida: {operation}.")
+        except KeyError as error:
+            return {"ok": False, "error": f"Error: Falta el campo {error}."}
+        except (ValueError, ConflictError) as error:
+            return {"ok": False, "error": str(error)}
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            return {
+                "ok": False,
+                "error": f"Error: No se pudo atender la petición "
+                         f"({type(error).__name__}: {error})."
+            }
+
+    async def _write(self, operation, request):
+        """
+        Valida los tipos de los campos de una escritura con los FIELDS de
+        su clase y la aplica en memoria. Si la operación falla, sus
+        entidades vuelven al estado previo antes de propagar el error.
+        """
+        function, entity_class, fields, optional = WRITE_OPERATIONS[operation]
+        row = {field: request[field] for field in fields}
+        row.update((field, request.get(field)) for field in optional)
+        problems = entity_class.row_errors(row, tuple(row))
+        if problems:
+            return {"ok": False, "error": f"Error: {'; '.join(problems)}."}
+        snapshot = self.repository.snapshot(_affected_keys(row))
+        try:
+            result, message = _capture(function, *row.values())
+        except Exception:
+            self.repository.restore(snapshot)
+            raise
+        if result:
+            await self.group.wait()
+        return {"ok": bool(result), "message": message}
+
+
+def parse_arguments():
+    """Lee los argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(
+        description="Servicio de reservas de hotel (JSON por línea)."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="dirección TCP")
+    parser.add_argument("--port", type=int, default=8765, help="puerto TCP")
+    parser.add_argument(
+        "--socket", default=None, metavar="RUTA",
+        help="atiende por un socket Unix en lugar de TCP"
+    )
+    parser.add_argument(
+        "--commit-delay", type=float, default=COMMIT_DELAY, metavar="SEG",
+        help="espera máxima para agrupar escrituras en un commit"
+    )
+    parser.add_argument(
+        "--no-journal", action="store_true",
+        help="reescribe los archivos JSON en cada commit en lugar del diario"
+    )
+    return parser.parse_args()
+
+
+async def serve(args):
+    """Ejecuta el servicio hasta que se interrumpa."""
+    service = BookingService(
+        journal=not args.no_journal, commit_delay=args.commit_delay
+    )
+    server = await service.start(args.host, args.port, args.socket)
+    addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"Servicio de reservas escuchando en {addresses}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.close()
+
+
+def main():
+    """Función principal que inicia el servicio."""
+    try:
+        asyncio.run(serve(parse_arguments()))
+    except KeyboardInterrupt:
+        print("\nServicio detenido.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,766 @@
+"""
+Persistencia del sistema de reservas de hotel: archivos JSON con diario
+de operaciones, bloqueo entre procesos y la sesión en memoria (Repository)
+con sus índices secundarios y de ocupación por noche.
+"""
+
+import json
+import os
+import threading
+from array import array
+from datetime import date
+
+try:
+    import fcntl
+except ImportError:  # Windows: el bloqueo entre procesos usa msvcrt.
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # POSIX: el bloqueo entre procesos usa fcntl.
+    msvcrt = None
+
+
+# Archivo de bloqueo compartido por todos los procesos que escriben los
+# archivos JSON del sistema.
+LOCK_PATH = "hotel_system.lock"
+
+# Operaciones registradas en el diario a partir de las cuales se compacta
+# el diario en el archivo JSON.
+COMPACT_EVERY = 1000
+
+# Límites de una estancia con fechas: noches como máximo y primera y última
+# noche que se pueden reservar. Acotan el arreglo de ocupación por noche
+# de cada hotel.
+MAX_STAY_NIGHTS = 365
+FIRST_NIGHT = date(2000, 1, 1)
+LAST_NIGHT = date(2099, 12, 31)
+
+# Repositorio activo de cada hilo: dentro de un bloque "with Repository()",
+# las operaciones de las clases trabajan sobre él en lugar de leer y
+# escribir los archivos JSON en cada llamada.
+_LOCAL = threading.local()
+
+
+def active_repository():
+    """Devuelve el repositorio activo del hilo actual, o None."""
+    return getattr(_LOCAL, "repository", None)
+
+
+class ConflictError(Exception):
+    """Los archivos cambiaron en otro proceso desde que la sesión los leyó."""
+
+
+class FileLock:
+    """
+    Bloqueo exclusivo entre procesos y entre hilos sobre LOCK_PATH. Es
+    reentrante dentro del mismo hilo. El archivo de bloqueo guarda además
+    un contador de versión por clase de entidades, que se incrementa con
+    cada escritura confirmada.
+    """
+
+    def __init__(self, path=LOCK_PATH):
+        self.path = path
+        self._file = None
+        self._depth = 0
+        self._mutex = threading.RLock()
+
+    def __enter__(self):
+        self._mutex.acquire()
+        if self._depth == 0:
+            self._file = open(self.path, "a+b")  # pylint: disable=consider-using-with
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            self._file.close()
+            self._file = None
+        self._mutex.release()
+        return False
+
+    def read_versions(self):
+        """Lee los contadores de versión; requiere tener el bloqueo."""
+        self._file.seek(0)
+        try:
+            return json.loads(self._file.read() or b"{}")
+        except json.JSONDecodeError:
+            return {}
+
+    def increment_version(self, name):
+        """Incrementa el contador de versión de una clase y lo devuelve."""
+        versions = self.read_versions()
+        versions[name] = versions.get(name, 0) + 1
+        self._file.seek(0)
+        self._file.truncate()
+        self._file.write(json.dumps(versions).encode("utf-8"))
+        self._file.flush()
+        return versions[name]
+
+
+def stay_nights(check_in, check_out):
+    """
+    Convierte las fechas de entrada y salida (AAAA-MM-DD) en el rango de
+    noches [inicio, fin) como ordinales de fecha. Lanza ValueError si las
+    fechas son inválidas, la salida no es posterior a la entrada, la
+    estancia pasa de MAX_STAY_NIGHTS noches o sale de FIRST_NIGHT a
+    LAST_NIGHT.
+    """
+    try:
+        start = date.fromisoformat(check_in).toordinal()
+        end = date.fromisoformat(check_out).toordinal()
+    except (TypeError, ValueError):
+        raise ValueError(
+            f"Error: Fechas inválidas: {check_in} a {check_out}."
+        ) from None
+    if end <= start:
+        raise ValueError(
+            f"Error: La salida ({check_out}) debe ser posterior "
+            f"a la entrada ({check_in})."
+        )
+    if end - start > MAX_STAY_NIGHTS:
+        raise ValueError(
+            f"Error: La estancia del {check_in} al {check_out} pasa de "
+            f"{MAX_STAY_NIGHTS} noches."
+        )
+    if start < FIRST_NIGHT.toordinal() or end > LAST_NIGHT.toordinal() + 1:
+        raise ValueError(
+            f"Error: Solo se puede reservar del {FIRST_NIGHT} al {LAST_NIGHT}."
+        )
+    return start, end
+
+
+class DayOccupancy:
+    """
+    Ocupación por noche de un hotel: arreglo con las habitaciones ocupadas
+    cada noche, indexado por el ordinal de la fecha a partir de origin. La
+    ocupación máxima de un rango se obtiene con max() sobre una rebanada
+    del arreglo, sin recorrer las reservas.
+    """
+
+    def __init__(self):
+        self.origin = None
+        self.counts = array("l")
+
+    def add(self, start, end, rooms=1):
+        """Suma rooms habitaciones a las noches [start, end)."""
+        if self.origin is None:
+            self.origin = start
+        if start < self.origin:
+            self.counts[0:0] = array(
+                "l", bytes(self.counts.itemsize * (self.origin - start))
+            )
+            self.origin = start
+        missing = end - self.origin - len(self.counts)
+        if missing > 0:
+            self.counts.extend(array("l", bytes(self.counts.itemsize * missing)))
+        counts = self.counts
+        for night in range(start - self.origin, end - self.origin):
+            counts[night] += rooms
+
+    def at(self, night):
+        """Habitaciones ocupadas la noche night (ordinal de fecha)."""
+        if self.origin is None or not 0 <= night - self.origin < len(self.counts):
+            return 0
+        return self.counts[night - self.origin]
+
+    def end(self):
+        """Ordinal siguiente a la última noche registrada."""
+        return 0 if self.origin is None else self.origin + len(self.counts)
+
+    def peak(self, start, end=None):
+        """Máximo de habitaciones ocupadas en una noche de [start, end)."""
+        if self.origin is None:
+            return 0
+        first = max(start - self.origin, 0)
+        last = len(self.counts) if end is None else min(
+            end - self.origin, len(self.counts)
+        )
+        return max(self.counts[first:last], default=0)
+
+
+class Repository:  # pylint: disable=too-many-instance-attributes
+    """
+    Sesión en memoria sobre los archivos JSON. Cada archivo se carga una
+    sola vez en un diccionario indexado por la llave de la entidad; los
+    cambios marcan el archivo como modificado y se escriben con commit(),
+    al salir del bloque with o, con flush_interval (segundos), en segundo
+    plano (write-behind) después del primer cambio. Si el commit en
+    segundo plano falla, su error se lanza en el siguiente commit() (o al
+    salir del bloque with), que descarta la sesión.
+
+    Los campos de INDEXES de cada clase tienen además un índice secundario
+    valor → {llave: entidad}, construido en la primera consulta y
+    mantenido por insert, remove y update. Las clases con DATE_RANGE
+    (grupo, entrada, salida) tienen también un índice de ocupación por
+    noche (DayOccupancy) de cada grupo, mantenido de la misma forma.
+
+    Con journal, commit() no reescribe los archivos: agrega las operaciones
+    (create, modify, delete, reserve, release, cancel) al diario JSON Lines
+    de cada clase, y cada compact_every operaciones compacta el diario en
+    el archivo JSON. El diario se reproduce al cargar cada archivo, también
+    sin journal. Las operaciones fuera de una sesión usan el diario solo si
+    JOURNAL_BY_DEFAULT (de hotel_system) es True; si no, cada una reescribe
+    los archivos que cambia.
+
+    Los archivos se leen y escriben con el bloqueo entre procesos FileLock.
+    Al cargar cada clase se guarda la versión de sus archivos; commit()
+    verifica que ningún otro proceso los haya cambiado (control optimista)
+    y, si cambiaron, descarta la sesión y lanza ConflictError. Si la
+    escritura falla por otro motivo (por ejemplo, un error de disco), la
+    sesión también se descarta, para que un commit posterior no escriba
+    cambios que ya se informaron como fallidos.
+    """
+
+    def __init__(self, flush_interval=None, journal=False,
+                 compact_every=COMPACT_EVERY):
+        self.flush_interval = flush_interval
+        self.journal = journal
+        self.compact_every = compact_every
+        self.lock = threading.RLock()
+        self.file_lock = FileLock()
+        self._commit_lock = threading.RLock()
+        self._versions = {}
+        self._tables = {}
+        self._indexes = {}
+        self._occupancies = {}
+        self._journal_lengths = {}
+        self._pending = {}
+        self._rewrite = set()
+        self._dirty = set()
+        self._writing = False
+        self._timer = None
+        self._flush_error = None
+        self._previous = None
+
+    def table(self, entity_class):
+        """Devuelve el diccionario llave → entidad, cargándolo una sola vez."""
+        with self.lock:
+            table = self._tables.get(entity_class)
+            if table is None:
+                with self.file_lock:
+                    table = self._keyed_table(entity_class, entity_class.read_file())
+                    operations = entity_class.read_journal()
+                    self._versions[entity_class] = self._current_version(
+                        entity_class
+                    )
+                for operation in operations:
+                    entity_class.apply_operation(table, operation)
+                self._journal_lengths[entity_class] = len(operations)
+                self._tables[entity_class] = table
+            return table
+
+    def replace(self, entity_class, entities):
+        """Reemplaza todas las entidades de una clase y la marca modificada."""
+        with self.lock:
+            self._tables[entity_class] = self._keyed_table(entity_class, entities)
+            self._indexes.pop(entity_class, None)
+            self._occupancies.pop(entity_class, None)
+            self._rewrite.add(entity_class)
+            self.mark_dirty(entity_class)
+
+    @staticmethod
+    def _keyed_table(entity_class, entities):
+        """
+        Construye el diccionario llave → entidad. Si varias entidades
+        repiten una llave se conserva la primera y se muestra una
+        advertencia, porque las demás no se escribirán al guardar.
+        """
+        table = {}
+        repeated = []
+        for entity in entities:
+            if table.setdefault(entity.key(), entity) is not entity:
+                repeated.append(entity.key())
+        if repeated:
+            keys = ", ".join(str(key) for key in dict.fromkeys(repeated))
+            print(
+                f"Advertencia: {entity_class.FILE_PATH} tiene registros "
+                f"repetidos con ID {keys}; se conserva el primero de cada "
+                f"uno y los demás se descartarán al guardar."
+            )
+        return table
+
+    def index(self, entity_class, field):
+        """Devuelve el índice secundario valor → {llave: entidad} de un campo."""
+        with self.lock:
+            indexes = self._indexes.setdefault(entity_class, {})
+            index = indexes.get(field)
+            if index is None:
+                index = {}
+                for key, entity in self.table(entity_class).items():
+                    index.setdefault(getattr(entity, field), {})[key] = entity
+                indexes[field] = index
+            return index
+
+    def lookup(self, entity_class, field, value):
+        """Devuelve las entidades cuyo campo vale value, sin recorrer la tabla."""
+        with self.lock:
+            return list(self.index(entity_class, field).get(value, {}).values())
+
+    def occupancy(self, entity_class, group):
+        """
+        Devuelve la ocupación por noche (DayOccupancy) de un grupo según el
+        DATE_RANGE de la clase; por ejemplo, la de un hotel según sus
+        reservas con fechas. Se construye la primera vez que se consulta
+        cada grupo, solo con las entidades del grupo (índice secundario del
+        campo de grupo).
+        """
+        with self.lock:
+            occupancies = self._occupancies.setdefault(entity_class, {})
+            occupancy = occupancies.get(group)
+            if occupancy is None:
+                occupancy = DayOccupancy()
+                index = self.index(entity_class, entity_class.DATE_RANGE[0])
+                for entity in index.get(group, {}).values():
+                    self._occupy(occupancy, entity_class, entity, 1)
+                occupancies[group] = occupancy
+            return occupancy
+
+    @staticmethod
+    def _occupy(occupancy, entity_class, entity, rooms):
+        _, check_in, check_out = (
+            getattr(entity, field) for field in entity_class.DATE_RANGE
+        )
+        if check_in is not None:
+            occupancy.add(*stay_nights(check_in, check_out), rooms)
+
+    def _update_occupancy(self, entity_class, entity, fields, rooms):
+        occupancies = self._occupancies.get(entity_class)
+        if occupancies is None or not (
+                fields is None
+                or any(field in fields for field in entity_class.DATE_RANGE)):
+            return
+        occupancy = occupancies.get(getattr(entity, entity_class.DATE_RANGE[0]))
+        if occupancy is not None:
+            self._occupy(occupancy, entity_class, entity, rooms)
+
+    def _add_to_indexes(self, entity_class, entity, fields=None):
+        for field, index in self._indexes.get(entity_class, {}).items():
+            if fields is None or field in fields:
+                index.setdefault(getattr(entity, field), {})[entity.key()] = entity
+        self._update_occupancy(entity_class, entity, fields, 1)
+
+    def _remove_from_indexes(self, entity_class, entity, fields=None):
+        for field, index in self._indexes.get(entity_class, {}).items():
+            if fields is None or field in fields:
+                bucket = index.get(getattr(entity, field))
+                if bucket is not None:
+                    bucket.pop(entity.key(), None)
+                    if not bucket:
+                        del index[getattr(entity, field)]
+        self._update_occupancy(entity_class, entity, fields, -1)
+
+    def insert(self, entity_class, entity):
+        """
+        Agrega una entidad nueva y devuelve True, o False si ya existe una
+        con la misma llave.
+        """
+        with self.lock:
+            table = self.table(entity_class)
+            if entity.key() in table:
+                return False
+            table[entity.key()] = entity
+            self._add_to_indexes(entity_class, entity)
+            self.mark_dirty(
+                entity_class, {"op": "create", "entity": entity.to_dict()}
+            )
+            return True
+
+    def remove(self, entity_class, key, operation="delete"):
+        """Elimina una entidad por su llave y la devuelve, o None si no existe."""
+        with self.lock:
+            entity = self.table(entity_class).pop(key, None)
+            if entity is not None:
+                self._remove_from_indexes(entity_class, entity)
+                self.mark_dirty(entity_class, {"op": operation, "key": key})
+            return entity
+
+    def update(self, entity_class, entity, operation="modify", **changes):
+        """Modifica los campos de una entidad manteniendo sus índices."""
+        with self.lock:
+            self._remove_from_indexes(entity_class, entity, changes)
+            for field, value in changes.items():
+                setattr(entity, field, value)
+            self._add_to_indexes(entity_class, entity, changes)
+            self.mark_dirty(entity_class, {
+                "op": operation, "key": entity.key(), "changes": changes
+            })
+
+    def snapshot(self, keys):
+        """
+        Guarda el estado de las entidades (clase, llave) de keys, junto con
+        las operaciones pendientes, para deshacer con restore() una
+        operación que falle antes de confirmarse.
+        """
+        with self.lock:
+            entities = {}
+            for entity_class, key in keys:
+                entity = self.table(entity_class).get(key)
+                entities[entity_class, key] = (
+                    None if entity is None else entity.to_dict()
+                )
+            pending = {
+                entity_class: len(operations)
+                for entity_class, operations in self._pending.items()
+            }
+            return entities, pending, set(self._dirty)
+
+    def restore(self, snapshot):
+        """Deshace los cambios hechos desde snapshot() en sus entidades."""
+        entities, pending, dirty = snapshot
+        with self.lock:
+            for (entity_class, key), saved in entities.items():
+                table = self.table(entity_class)
+                current = table.pop(key, None)
+                if current is not None:
+                    self._remove_from_indexes(entity_class, current)
+                if saved is not None:
+                    entity = entity_class(**saved)
+                    table[key] = entity
+                    self._add_to_indexes(entity_class, entity)
+            for entity_class in list(self._pending):
+                del self._pending[entity_class][pending.get(entity_class, 0):]
+            self._dirty = dirty
+
+    def mark_dirty(self, entity_class, operation=None):
+        """
+        Marca una clase como modificada y programa el write-behind. Con
+        journal, la operación se guarda para agregarla al diario.
+        """
+        with self.lock:
+            if operation is not None and self.journal:
+                self._pending.setdefault(entity_class, []).append(operation)
+            self._dirty.add(entity_class)
+            if self.flush_interval is not None and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush(self):
+        """
+        Commit del write-behind. Como corre en otro hilo, un error no se
+        puede lanzar a quien hizo los cambios: se guarda para commit().
+        """
+        with self._commit_lock:
+            try:
+                self.commit()
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                self._flush_error = error
+
+    def is_dirty(self):
+        """Indica si hay cambios pendientes o en curso de escribirse."""
+        return bool(self._dirty) or self._writing
+
+    def commit(self):
+        """
+        Escribe los cambios de las clases modificadas: agrega sus
+        operaciones al diario o, sin journal, al compactar o tras replace,
+        reescribe el archivo JSON y vacía el diario. Los cambios se toman
+        con lock y se escriben sin él, así que las lecturas no esperan a la
+        escritura ni a su fsync; los cambios hechos mientras tanto quedan
+        para el siguiente commit. Si la escritura falla, se quitan de los
+        diarios las operaciones de este commit que alcanzaron a agregarse,
+        la sesión se descarta (rollback) y el error se propaga. Si falló el
+        commit en segundo plano, se descarta la sesión y se lanza su error.
+        """
+        with self._commit_lock:
+            error, self._flush_error = self._flush_error, None
+            if error is not None:
+                self.rollback()
+                raise error
+            with self.lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                batch = self._stage()
+                self._writing = True
+            try:
+                with self.file_lock:
+                    self._check_versions()
+                    self._write_batch(batch)
+            except Exception:
+                self.rollback()
+                raise
+            finally:
+                self._writing = False
+
+    def _write_batch(self, batch):
+        """
+        Escribe los cambios tomados por _stage(). Si una escritura falla,
+        recorta los diarios ya agregados a su tamaño previo antes de
+        propagar el error, para que el commit no quede escrito a medias.
+        """
+        appended = []
+        try:
+            for entity_class, operations, records in batch:
+                if records is None:
+                    appended.append((entity_class, entity_class.journal_size()))
+                    entity_class.append_journal(operations)
+                    self._journal_lengths[entity_class] += len(operations)
+                else:
+                    entity_class.write_records(records)
+                    entity_class.clear_journal()
+                    self._journal_lengths[entity_class] = 0
+                self._record_write(entity_class)
+        except Exception:
+            for entity_class, size in appended:
+                entity_class.truncate_journal(size)
+            raise
+
+    def _stage(self):
+        """
+        Toma los cambios pendientes para escribirlos: una lista de (clase,
+        operaciones del diario, registros del archivo JSON), con
+        operaciones None si el archivo se reescribe y registros None si
+        solo se agregan operaciones al diario.
+        """
+        batch = []
+        for entity_class in self._dirty:
+            operations = self._pending.pop(entity_class, [])
+            # Tras replace() la clase puede no haberse cargado, así que no
+            # tiene longitud de diario: se reescribe completa.
+            if (self.journal and entity_class not in self._rewrite
+                    and self._journal_lengths[entity_class] + len(operations)
+                    < self.compact_every):
+                batch.append((entity_class, operations, None))
+            else:
+                batch.append((entity_class, None, [
+                    entity.to_dict() for entity in self.table(entity_class).values()
+                ]))
+        self._dirty.clear()
+        self._rewrite.clear()
+        return batch
+
+    def compact(self, entity_class):
+        """Escribe el archivo JSON con el estado actual y vacía el diario."""
+        with self.lock, self.file_lock:
+            try:
+                self._check_versions()
+            except ConflictError:
+                self.rollback()
+                raise
+            entity_class.write_file(self.table(entity_class).values())
+            entity_class.clear_journal()
+            self._journal_lengths[entity_class] = 0
+            self._record_write(entity_class)
+
+    def _check_versions(self):
+        """
+        Verifica, con el bloqueo tomado, que ninguna clase cargada haya
+        cambiado desde que se leyó; si cambió, lanza ConflictError. Quien
+        llama descarta la sesión después.
+        """
+        changed = [
+            entity_class.__name__
+            for entity_class, version in self._versions.items()
+            if self._current_version(entity_class) != version
+        ]
+        if changed:
+            raise ConflictError(
+                f"Error: {', '.join(changed)} cambió en otro proceso; "
+                f"se descartaron los cambios de la sesión."
+            )
+
+    def _current_version(self, entity_class):
+        """Versión actual de una clase: contador del bloqueo y archivos."""
+        counter = self.file_lock.read_versions().get(entity_class.__name__, 0)
+        return counter, entity_class.version()
+
+    def _record_write(self, entity_class):
+        """Incrementa la versión de una clase tras escribirla y la recuerda."""
+        self.file_lock.increment_version(entity_class.__name__)
+        self._versions[entity_class] = self._current_version(entity_class)
+
+    def rollback(self):
+        """Descarta los cambios pendientes y las entidades cargadas."""
+        with self.lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._tables.clear()
+            self._versions.clear()
+            self._indexes.clear()
+            self._occupancies.clear()
+            self._journal_lengths.clear()
+            self._pending.clear()
+            self._rewrite.clear()
+            self._dirty.clear()
+
+    def __enter__(self):
+        self._previous = active_repository()
+        _LOCAL.repository = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _LOCAL.repository = self._previous
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+
+def run_transaction(operation, retries=10, **options):
+    """
+    Ejecuta operation() en una sesión Repository(**options) y la confirma.
+    Si otro proceso cambió los archivos (ConflictError), la repite con los
+    datos actualizados hasta retries veces.
+    """
+    for attempt in range(retries + 1):
+        try:
+            with Repository(**options):
+                return operation()
+        except ConflictError:
+            if attempt == retries:
+                raise
+    return None
+
+
+class StoredEntity:
+    """
+    Lectura y escritura del archivo JSON y del diario de una clase de
+    entidades. Las subclases definen to_dict().
+    """
+
+    FILE_PATH = None
+    KEY = None
+    INDEXES = ()
+    # (grupo, entrada, salida) para el índice de ocupación por noche.
+    DATE_RANGE = None
+
+    def key(self):
+        """Devuelve la llave primaria de la entidad."""
+        return getattr(self, self.KEY)
+
+    @classmethod
+    def read_file(cls):
+        """Lee las entidades del archivo JSON; vacío o inválido → []."""
+        if not os.path.exists(cls.FILE_PATH) or os.stat(cls.FILE_PATH).st_size == 0:
+            return []
+        try:
+            with open(cls.FILE_PATH, "r", encoding="utf-8") as file:
+                return [cls(**entity) for entity in json.load(file)]
+        except json.JSONDecodeError:
+            return []
+
+    @classmethod
+    def write_file(cls, entities):
+        """Escribe las entidades en el archivo JSON."""
+        cls.write_records([entity.to_dict() for entity in entities])
+
+    @classmethod
+    def write_records(cls, records):
+        """
+        Escribe en el archivo JSON registros ya convertidos a diccionario.
+        Se escribe primero un archivo temporal que luego reemplaza al
+        original, de modo que una falla a mitad de la escritura no deja el
+        archivo truncado.
+        """
+        temporary_path = cls.FILE_PATH + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(records, file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, cls.FILE_PATH)
+
+    @classmethod
+    def version(cls):
+        """
+        Devuelve la versión de los archivos de la clase: inodo, fecha de
+        modificación y tamaño del archivo JSON y del diario. Cualquier
+        escritura (reemplazo del JSON o agregado al diario) la cambia.
+        """
+        version = []
+        for path in (cls.FILE_PATH, cls.journal_path()):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                version.append(None)
+            else:
+                version.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+        return tuple(version)
+
+    @classmethod
+    def journal_path(cls):
+        """Devuelve la ruta del diario de operaciones de la clase."""
+        return os.path.splitext(cls.FILE_PATH)[0] + ".journal.jsonl"
+
+    @classmethod
+    def read_journal(cls):
+        """
+        Lee las operaciones del diario. Una última línea incompleta (por
+        una falla al escribirla) se descarta y se recorta del archivo.
+        """
+        path = cls.journal_path()
+        if not os.path.exists(path):
+            return []
+        with open(path, "rb") as file:
+            data = file.read()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            with open(path, "r+b") as file:
+                file.truncate(end)
+        return [json.loads(line) for line in data[:end].splitlines() if line]
+
+    @classmethod
+    def append_journal(cls, operations):
+        """Agrega operaciones al final del diario, una por línea."""
+        if not operations:
+            return
+        with open(cls.journal_path(), "a", encoding="utf-8") as file:
+            file.write("".join(
+                json.dumps(operation) + "\n" for operation in operations
+            ))
+            file.flush()
+            os.fsync(file.fileno())
+
+    @classmethod
+    def journal_size(cls):
+        """Tamaño en bytes del diario; 0 si no existe."""
+        path = cls.journal_path()
+        return os.path.getsize(path) if os.path.exists(path) else 0
+
+    @classmethod
+    def truncate_journal(cls, size):
+        """Recorta el diario a size bytes, quitando lo agregado después."""
+        path = cls.journal_path()
+        if os.path.exists(path):
+            with open(path, "r+b") as file:
+                file.truncate(size)
+
+    @classmethod
+    def clear_journal(cls):
+        """Elimina el diario, ya incluido en el archivo JSON."""
+        if os.path.exists(cls.journal_path()):
+            os.remove(cls.journal_path())
+
+    @classmethod
+    def apply_operation(cls, table, operation):
+        """
+        Reproduce una operación del diario sobre una tabla llave → entidad.
+        Las operaciones guardan valores finales, así que reproducirlas de
+        nuevo sobre un archivo ya compactado no cambia el resultado.
+        """
+        if operation["op"] == "create":
+            entity = cls(**operation["entity"])
+            table[entity.key()] = entity
+        elif "changes" in operation:
+            entity = table.get(operation["key"])
+            if entity is not None:
+                for field, value in operation["changes"].items():
+                    setattr(entity, field, value)
+        else:
+            table.pop(operation["key"], None)
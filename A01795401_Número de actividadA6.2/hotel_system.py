@@ -1,16 +1,306 @@
 """
 Sistema de reservas de hotel con clientes y reservas.
-Maneja la persistencia en archivos y permite operaciones CRUD.
+Permite operaciones CRUD sobre los archivos JSON, cuya persistencia
+(diario, bloqueo entre procesos y sesión en memoria) está en hotel_storage.
 """
 
+import csv
 import json
-import os
+from datetime import date
+
+from hotel_storage import (
+    COMPACT_EVERY, FIRST_NIGHT, LAST_NIGHT, LOCK_PATH, MAX_STAY_NIGHTS,
+    ConflictError, DayOccupancy, FileLock, Repository, StoredEntity,
+    active_repository, run_transaction, stay_nights,
+)
+
+__all__ = [
+    "COMPACT_EVERY", "FIRST_NIGHT", "LAST_NIGHT", "LOCK_PATH",
+    "MAX_STAY_NIGHTS", "JOURNAL_BY_DEFAULT", "ConflictError", "DayOccupancy",
+    "FileLock", "Repository", "run_transaction", "stay_nights",
+    "Hotel", "Customer", "Reservation",
+]
+
+
+# Con True, las operaciones fuera de una sesión (por ejemplo, las de los
+# scripts main_*.py) agregan una línea al diario en lugar de reescribir el
+# archivo JSON completo. Por defecto es False para que los archivos JSON
+# estén siempre al día para quien los lea directamente.
+JOURNAL_BY_DEFAULT = False
+
+
+class _Scope:
+    """
+    Repositorio para una operación: el activo, o uno temporal que lee los
+    archivos al empezar, queda activo para las operaciones anidadas y
+    escribe los cambios al terminar. El repositorio temporal mantiene el
+    bloqueo entre procesos de principio a fin, así que operaciones como
+    reservar y registrar la reserva son atómicas.
+    """
+
+    def __init__(self):
+        self.repository = active_repository()
+        self.temporary = self.repository is None
+        if self.temporary:
+            self.repository = Repository(journal=JOURNAL_BY_DEFAULT)
+
+    def __enter__(self):
+        if self.temporary:
+            self.repository.file_lock.__enter__()
+            self.repository.__enter__()
+        self.repository.lock.acquire()
+        return self.repository
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.repository.lock.release()
+        if self.temporary:
+            try:
+                self.repository.__exit__(exc_type, exc_value, traceback)
+            finally:
+                self.repository.file_lock.__exit__(
+                    exc_type, exc_value, traceback
+                )
+        return False
+
+
+class _Entity(StoredEntity):
+    """Operaciones comunes a las clases de entidades del sistema."""
+
+    # Campos de la entidad con su tipo, los que pueden faltar (None) y los
+    # que modify_many puede cambiar.
+    FIELDS = {}
+    OPTIONAL = ()
+    MODIFIABLE = ()
 
+    def to_dict(self):
+        """Convierte la entidad en un diccionario."""
+        raise NotImplementedError
+
+    @classmethod
+    def load_all(cls):
+        """Devuelve las entidades del repositorio activo o del archivo."""
+        with _Scope() as repository:
+            return list(repository.table(cls).values())
+
+    @classmethod
+    def save_all(cls, entities):
+        """Guarda las entidades en el repositorio activo o en el archivo."""
+        with _Scope() as repository:
+            repository.replace(cls, entities)
+
+    @classmethod
+    def add(cls, entity, label):
+        """
+        Agrega una entidad nueva. Si ya existe una con la misma llave,
+        muestra un error y devuelve False.
+        """
+        with _Scope() as repository:
+            if not repository.insert(cls, entity):
+                print(f"Error: Ya existe {label} con ID {entity.key()}.")
+                return False
+            return True
+
+    @classmethod
+    def get(cls, key):
+        """Busca una entidad por su llave; devuelve None si no existe."""
+        with _Scope() as repository:
+            return repository.table(cls).get(key)
+
+    @classmethod
+    def find_by(cls, field, value):
+        """Devuelve las entidades cuyo campo indexado vale value."""
+        if field not in cls.INDEXES:
+            raise ValueError(f"Error: El campo {field} no está indexado.")
+        with _Scope() as repository:
+            return repository.lookup(cls, field, value)
+
+    @classmethod
+    def row_errors(cls, row, fields=None):
+        """
+        Valida un registro (diccionario) para la clase y devuelve la lista
+        de problemas encontrados. Con fields, solo se exigen esos campos
+        y se aceptan, además, los de MODIFIABLE.
+        """
+        if not isinstance(row, dict):
+            return ["no es un objeto JSON"]
+        if fields is None:
+            required = [field for field in cls.FIELDS if field not in cls.OPTIONAL]
+            allowed = cls.FIELDS
+        else:
+            required, allowed = fields, (*fields, *cls.MODIFIABLE)
+        problems = [f"falta el campo {field}" for field in required if field not in row]
+        for field, value in row.items():
+            if field not in allowed:
+                problems.append(
+                    f"el campo {field} no existe" if field not in cls.FIELDS
+                    else f"el campo {field} no se puede modificar"
+                )
+            elif value is None and field in cls.OPTIONAL:
+                continue
+            elif not isinstance(value, cls.FIELDS[field]):
+                problems.append(
+                    f"el campo {field} debe ser {cls.FIELDS[field].__name__}"
+                )
+        return problems
+
+    @classmethod
+    def validate_rows(cls, rows, check):
+        """
+        Valida en una sola pasada los registros de una operación en bloque.
+        check(row) devuelve los problemas de un registro. Muestra los
+        errores y devuelve None si hay alguno; si no, la lista de registros.
+        """
+        valid = []
+        errors = []
+        for number, row in enumerate(rows, 1):
+            problems = check(row)
+            if problems:
+                errors.append(f"Error: Registro {number}: {'; '.join(problems)}.")
+            else:
+                valid.append(row)
+        for error in errors:
+            print(error)
+        return None if errors else valid
+
+    @classmethod
+    def create_many(cls, rows):
+        """
+        Crea varias entidades a partir de diccionarios en una sola
+        transacción, que se escribe una vez. Si algún registro es inválido
+        o repite un ID, no se crea ninguno y devuelve False.
+        """
+        with _Scope() as repository:
+            table = repository.table(cls)
+            seen = set()
+
+            def check(row):
+                problems = cls.row_errors(row)
+                if not problems:
+                    if row[cls.KEY] in table or row[cls.KEY] in seen:
+                        problems.append(f"ya existe el ID {row[cls.KEY]}")
+                    seen.add(row[cls.KEY])
+                return problems
+
+            rows = cls.validate_rows(rows, check)
+            if rows is None:
+                return False
+            for row in rows:
+                repository.insert(cls, cls(**row))
+            return True
 
-class Hotel:
+    @classmethod
+    def modify_many(cls, rows):
+        """
+        Modifica varias entidades en una sola transacción. Cada registro
+        tiene la llave y los campos de MODIFIABLE a cambiar. Si alguno es
+        inválido o no existe, no se modifica ninguno y devuelve False.
+        """
+        with _Scope() as repository:
+            table = repository.table(cls)
+
+            def check(row):
+                problems = cls.row_errors(row, (cls.KEY,))
+                if not problems and row[cls.KEY] not in table:
+                    problems.append(f"no existe el ID {row[cls.KEY]}")
+                return problems
+
+            rows = cls.validate_rows(rows, check)
+            if rows is None:
+                return False
+            for row in rows:
+                changes = {
+                    field: value for field, value in row.items() if field != cls.KEY
+                }
+                repository.update(cls, table[row[cls.KEY]], **changes)
+            return True
+
+    @classmethod
+    def delete_many(cls, keys):
+        """
+        Elimina varias entidades por su llave en una sola transacción. Si
+        alguna no existe, no se elimina ninguna y devuelve False.
+        """
+        with _Scope() as repository:
+            table = repository.table(cls)
+            keys = cls.validate_rows(keys, cls._existing_key_check(table))
+            if keys is None:
+                return False
+            for key in keys:
+                repository.remove(cls, key)
+            return True
+
+    @staticmethod
+    def _existing_key_check(table):
+        """Validación de llaves a eliminar: deben existir y no repetirse."""
+        seen = set()
+
+        def check(key):
+            if key in seen:
+                return [f"el ID {key} está repetido"]
+            seen.add(key)
+            return [] if key in table else [f"no existe el ID {key}"]
+        return check
+
+    @classmethod
+    def iter_records(cls, path):
+        """
+        Lee en flujo los registros de un archivo CSV (con encabezado) o
+        JSON Lines, según su extensión. Los valores del CSV se convierten
+        al tipo de FIELDS (vacío → None en los campos de OPTIONAL); una
+        línea JSON inválida se entrega como None.
+        """
+        with open(path, "r", encoding="utf-8", newline="") as file:
+            if path.endswith(".csv"):
+                for row in csv.DictReader(file):
+                    for field, value in row.items():
+                        if value == "" and field in cls.OPTIONAL:
+                            row[field] = None
+                            continue
+                        try:
+                            row[field] = cls.FIELDS[field](value)
+                        except (KeyError, ValueError):
+                            pass
+                    yield row
+                return
+            for line in file:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        yield None
+
+    @classmethod
+    def import_file(cls, path):
+        """Importa con create_many los registros de un archivo CSV o JSON Lines."""
+        return cls.create_many(cls.iter_records(path))
+
+    @classmethod
+    def export_file(cls, path):
+        """
+        Exporta las entidades a un archivo CSV o JSON Lines, según su
+        extensión, y devuelve cuántas se escribieron.
+        """
+        entities = cls.load_all()
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            if path.endswith(".csv"):
+                writer = csv.DictWriter(file, fieldnames=list(cls.FIELDS))
+                writer.writeheader()
+                writer.writerows(entity.to_dict() for entity in entities)
+            else:
+                file.writelines(
+                    json.dumps(entity.to_dict()) + "\n" for entity in entities
+                )
+        return len(entities)
+
+
+class Hotel(_Entity):
     """Clase que representa un hotel y maneja su información."""
 
     FILE_PATH = "hotels.json"
+    KEY = "hotel_id"
+    INDEXES = ("location",)
+    FIELDS = {"hotel_id": int, "name": str, "location": str, "rooms_available": int}
+    MODIFIABLE = ("name", "location", "rooms_available")
 
     def __init__(self, hotel_id, name, location, rooms_available):
         self.hotel_id = hotel_id
@@ -30,69 +320,117 @@ class Hotel:
     @classmethod
     def save_hotels(cls, hotels):
         """Guarda la lista de hoteles en un archivo JSON."""
-        with open(cls.FILE_PATH, "w", encoding="utf-8") as file:
-            json.dump(
-                [hotel.to_dict() for hotel in hotels],
-                file,
-                indent=4
-            )
+        cls.save_all(hotels)
 
     @classmethod
     def load_hotels(cls):
         """Carga la lista de hoteles desde el
         archivo JSON y maneja archivos vacíos.
         """
-        if (not os.path.exists(cls.FILE_PATH) or os.stat(cls.FILE_PATH).st_size == 0):
-            return []
-        try:
-            with open(cls.FILE_PATH, "r", encoding="utf-8") as file:
-                return [cls(**hotel) for hotel in json.load(file)]
-        except json.JSONDecodeError:
-            return []
+        return cls.load_all()
 
     @classmethod
     def create_hotel(cls, hotel_id, name, location, rooms_available):
         """Crea un nuevo hotel y lo guarda en la lista."""
-        hotels = cls.load_hotels()
-        hotels.append(cls(hotel_id, name, location, rooms_available))
-        cls.save_hotels(hotels)
+        return cls.add(cls(hotel_id, name, location, rooms_available), "un hotel")
 
     @classmethod
     def delete_hotel(cls, hotel_id):
         """Elimina un hotel de la lista."""
-        hotels = cls.load_hotels()
-        hotels = [hotel for hotel in hotels if hotel.hotel_id != hotel_id]
-        cls.save_hotels(hotels)
+        with _Scope() as repository:
+            repository.remove(cls, hotel_id)
 
     @classmethod
     def modify_hotel(cls, hotel_id, new_name, new_location, new_rooms_available):
         """Modifica la información de un hotel."""
-        hotels = cls.load_hotels()
-        for hotel in hotels:
-            if hotel.hotel_id == hotel_id:
-                hotel.name = new_name
-                hotel.location = new_location
-                hotel.rooms_available = new_rooms_available
-        cls.save_hotels(hotels)
+        with _Scope() as repository:
+            hotel = repository.table(cls).get(hotel_id)
+            if hotel is not None:
+                repository.update(
+                    cls, hotel, name=new_name, location=new_location,
+                    rooms_available=new_rooms_available
+                )
 
     @classmethod
     def reserve_room(cls, hotel_id, rooms_requested):
         """Reserva habitaciones en un hotel si hay disponibilidad,
         o lanza un ValueError si el hotel no existe.
         """
-        hotels = cls.load_hotels()
-        for hotel in hotels:
-            if hotel.hotel_id == hotel_id:
-                if hotel.rooms_available >= rooms_requested:
-                    hotel.rooms_available -= rooms_requested
-                    cls.save_hotels(hotels)
-                    return True
-                print("Error: No hay suficientes habitaciones disponibles.")
-                return False
+        with _Scope() as repository:
+            hotel = repository.table(cls).get(hotel_id)
+            if hotel is None:
+                raise ValueError(
+                    f"Error: Hotel con ID {hotel_id} no encontrado."
+                )
+            booked = repository.occupancy(Reservation, hotel_id).peak(
+                date.today().toordinal()
+            )
+            if hotel.rooms_available - booked >= rooms_requested:
+                repository.update(
+                    cls, hotel, "reserve",
+                    rooms_available=hotel.rooms_available - rooms_requested
+                )
+                return True
+            print("Error: No hay suficientes habitaciones disponibles.")
+            return False
 
-        raise ValueError(
-            f"Error: Hotel con ID {hotel_id} no encontrado."
-        )
+    @classmethod
+    def release_rooms(cls, hotel_id, rooms_released):
+        """Devuelve habitaciones a un hotel, si existe."""
+        with _Scope() as repository:
+            hotel = repository.table(cls).get(hotel_id)
+            if hotel is not None:
+                repository.update(
+                    cls, hotel, "release",
+                    rooms_available=hotel.rooms_available + rooms_released
+                )
+
+    @classmethod
+    def available_rooms(cls, hotel_id, check_in, check_out):
+        """
+        Devuelve las habitaciones libres todas las noches de check_in a
+        check_out (AAAA-MM-DD), o lanza un ValueError si el hotel no existe
+        o las fechas son inválidas.
+        """
+        start, end = stay_nights(check_in, check_out)
+        with _Scope() as repository:
+            hotel = repository.table(cls).get(hotel_id)
+            if hotel is None:
+                raise ValueError(
+                    f"Error: Hotel con ID {hotel_id} no encontrado."
+                )
+            booked = repository.occupancy(Reservation, hotel_id).peak(start, end)
+            return hotel.rooms_available - booked
+
+    @classmethod
+    def find_available_hotels(cls, check_in, check_out, rooms=1, location=None):
+        """
+        Devuelve los hoteles (de location, si se indica) con al menos rooms
+        habitaciones libres todas las noches de check_in a check_out.
+        """
+        start, end = stay_nights(check_in, check_out)
+        with _Scope() as repository:
+            if location is None:
+                hotels = repository.table(cls).values()
+            else:
+                hotels = repository.lookup(cls, "location", location)
+            return [
+                hotel for hotel in hotels
+                if hotel.rooms_available
+                - repository.occupancy(Reservation, hotel.hotel_id).peak(start, end)
+                >= rooms
+            ]
+
+    @classmethod
+    def find_hotels_by_location(cls, location, min_rooms=0):
+        """
+        Devuelve los hoteles de una ubicación con al menos min_rooms
+        habitaciones disponibles, usando el índice por ubicación.
+        """
+        return [
+            hotel for hotel in cls.find_by("location", location)
+            if hotel.rooms_available >= min_rooms
+        ]
 
     @classmethod
     def display_hotels(cls):
@@ -105,10 +443,13 @@ class Hotel:
             )
 
 
-class Customer:
+class Customer(_Entity):
     """Clase que representa un cliente del sistema de reservas."""
 
     FILE_PATH = "customers.json"
+    KEY = "customer_id"
+    FIELDS = {"customer_id": int, "name": str, "email": str}
+    MODIFIABLE = ("name", "email")
 
     def __init__(self, customer_id, name, email):
         self.customer_id = customer_id
@@ -126,41 +467,26 @@ class Customer:
     @classmethod
     def save_customers(cls, customers):
         """Guarda los clientes en un archivo JSON."""
-        with open(cls.FILE_PATH, "w", encoding="utf-8") as file:
-            json.dump(
-                [customer.to_dict() for customer in customers],
-                file,
-                indent=4
-            )
+        cls.save_all(customers)
 
     @classmethod
     def load_customers(cls):
         """Carga los clientes desde el
         archivo JSON y maneja archivos vacíos."""
-        if not os.path.exists(cls.FILE_PATH) or os.stat(cls.FILE_PATH).st_size == 0:
-            return []
-        try:
-            with open(cls.FILE_PATH, "r", encoding="utf-8") as file:
-                return [cls(**customer) for customer in json.load(file)]
-        except json.JSONDecodeError:
-            return []
+        return cls.load_all()
 
     @classmethod
     def create_customer(cls, customer_id, name, email):
         """Crea un nuevo cliente."""
-        customers = cls.load_customers()
-        customers.append(cls(customer_id, name, email))
-        cls.save_customers(customers)
+        return cls.add(cls(customer_id, name, email), "un cliente")
 
     @classmethod
     def modify_customer(cls, customer_id, new_name, new_email):
         """Modifica la información de un cliente."""
-        customers = cls.load_customers()
-        for customer in customers:
-            if customer.customer_id == customer_id:
-                customer.name = new_name
-                customer.email = new_email
-        cls.save_customers(customers)
+        with _Scope() as repository:
+            customer = repository.table(cls).get(customer_id)
+            if customer is not None:
+                repository.update(cls, customer, name=new_name, email=new_email)
 
     @classmethod
     def display_customers(cls):
@@ -172,77 +498,225 @@ class Customer:
             )
 
 
-class Reservation:
-    """Clase que maneja las reservas de hotel."""
+class _BatchRooms:
+    """
+    Disponibilidad de habitaciones durante Reservation.create_many: suma a
+    la ocupación del repositorio las reservas del lote ya aceptadas, sin
+    fechas (requested, por hotel) y con fechas (pending, por noche).
+    """
+
+    def __init__(self, repository):
+        self.repository = repository
+        self.requested = {}
+        self.pending = {}
+        self.today = date.today().toordinal()
+
+    def booked(self, hotel_id, start, end):
+        """Máximo de habitaciones con fecha ocupadas en [start, end)."""
+        existing = self.repository.occupancy(Reservation, hotel_id)
+        batch = self.pending.get(hotel_id)
+        if batch is None:
+            return existing.peak(start, end)
+        if end is None:
+            end = max(existing.end(), batch.end())
+        return max(
+            (existing.at(night) + batch.at(night) for night in range(start, end)),
+            default=0
+        )
 
-    FILE_PATH = "reservations.json"
+    def check(self, row, hotel):
+        """
+        Indica si queda habitación para la reserva row en hotel y, si
+        queda, la cuenta; lanza ValueError si sus fechas son inválidas.
+        """
+        hotel_id = row["hotel_id"]
+        undated = self.requested.get(hotel_id, 0)
+        if row.get("check_in") is None and row.get("check_out") is None:
+            self.requested[hotel_id] = undated + 1
+            free = hotel.rooms_available - self.booked(hotel_id, self.today, None)
+            return undated < free
+        start, end = stay_nights(row.get("check_in"), row.get("check_out"))
+        if hotel.rooms_available - undated - self.booked(hotel_id, start, end) < 1:
+            return False
+        self.pending.setdefault(hotel_id, DayOccupancy()).add(start, end)
+        return True
+
+
+class Reservation(_Entity):
+    """
+    Clase que maneja las reservas de hotel. Una reserva sin fechas ocupa
+    una habitación del hotel (rooms_available) hasta cancelarse; una
+    reserva con check_in y check_out (AAAA-MM-DD) ocupa una habitación solo
+    esas noches, según el índice de ocupación por noche del hotel.
+    """
 
-    def __init__(self, reservation_id, customer_id, hotel_id):
+    FILE_PATH = "reservations.json"
+    KEY = "reservation_id"
+    INDEXES = ("customer_id", "hotel_id")
+    FIELDS = {
+        "reservation_id": int, "customer_id": int, "hotel_id": int,
+        "check_in": str, "check_out": str
+    }
+    OPTIONAL = ("check_in", "check_out")
+    MODIFIABLE = ("customer_id",)
+    DATE_RANGE = ("hotel_id", "check_in", "check_out")
+
+    def __init__(self, reservation_id, customer_id, hotel_id,
+                 check_in=None, check_out=None):
         self.reservation_id = reservation_id
         self.customer_id = customer_id
         self.hotel_id = hotel_id
+        self.check_in = check_in
+        self.check_out = check_out
 
     def to_dict(self):
         """Convierte una reserva en diccionario."""
-        return {
+        result = {
             "reservation_id": self.reservation_id,
             "customer_id": self.customer_id,
             "hotel_id": self.hotel_id
         }
+        if self.check_in is not None:
+            result["check_in"] = self.check_in
+            result["check_out"] = self.check_out
+        return result
 
     @classmethod
     def save_reservations(cls, reservations):
         """Guarda las reservas en un archivo JSON."""
-        with open(cls.FILE_PATH, "w", encoding="utf-8") as file:
-            json.dump(
-                [res.to_dict() for res in reservations],
-                file,
-                indent=4
-            )
+        cls.save_all(reservations)
 
     @classmethod
     def load_reservations(cls):
         """Carga las reservas desde el archivo
         JSON y maneja archivos vacíos."""
-        if not os.path.exists(cls.FILE_PATH) or os.stat(cls.FILE_PATH).st_size == 0:
-            return []
-        try:
-            with open(cls.FILE_PATH, "r", encoding="utf-8") as file:
-                return [cls(**res) for res in json.load(file)]
-        except json.JSONDecodeError:
-            return []
-
-    @classmethod
-    def create_reservation(cls, reservation_id, customer_id, hotel_id):
-        """Crea una nueva reserva."""
-        if Hotel.reserve_room(hotel_id, 1):
-            reservations = cls.load_reservations()
-            reservations.append(cls(reservation_id, customer_id, hotel_id))
-            cls.save_reservations(reservations)
-        else:
-            print("No se pudo reservar la habitación.")
+        return cls.load_all()
 
     @classmethod
-    def cancel_reservation(cls, reservation_id):
-        """Cancela una reserva y devuelve la habitación al hotel."""
-        reservations = cls.load_reservations()
-        new_reservations = []
-        canceled = False
-
-        for res in reservations:
-            if res.reservation_id == reservation_id:
-                canceled = True
-                hotels = Hotel.load_hotels()
-                for hotel in hotels:
-                    if hotel.hotel_id == res.hotel_id:
-                        hotel.rooms_available += 1
-                        break
-                Hotel.save_hotels(hotels)
-            else:
-                new_reservations.append(res)
+    def find_reservations_by_customer(cls, customer_id):
+        """Devuelve las reservas de un cliente usando el índice por cliente."""
+        return cls.find_by("customer_id", customer_id)
 
-        if canceled:
-            cls.save_reservations(new_reservations)
-            print(f"✅ Reserva {reservation_id} cancelada correctamente.")
-        else:
-            print(f"⚠️ No se encontró la reserva {reservation_id}.")
+    @classmethod
+    def find_reservations_by_hotel(cls, hotel_id):
+        """Devuelve las reservas de un hotel usando el índice por hotel."""
+        return cls.find_by("hotel_id", hotel_id)
+
+    @classmethod
+    def create_reservation(cls, reservation_id, customer_id, hotel_id,
+                           check_in=None, check_out=None):
+        """
+        Crea una nueva reserva; devuelve True si se registró. Con fechas,
+        verifica que quede una habitación libre todas esas noches.
+        """
+        if check_in is not None or check_out is not None:
+            with _Scope():
+                if Hotel.available_rooms(hotel_id, check_in, check_out) < 1:
+                    print(
+                        f"Error: No hay habitaciones disponibles del "
+                        f"{check_in} al {check_out}."
+                    )
+                    print("No se pudo reservar la habitación.")
+                    return False
+                return cls.add(
+                    cls(reservation_id, customer_id, hotel_id,
+                        check_in, check_out),
+                    "una reserva"
+                )
+        with _Scope():
+            if not Hotel.reserve_room(hotel_id, 1):
+                print("No se pudo reservar la habitación.")
+                return False
+            if not cls.add(
+                    cls(reservation_id, customer_id, hotel_id), "una reserva"):
+                Hotel.release_rooms(hotel_id, 1)
+                return False
+            return True
+
+    @classmethod
+    def create_many(cls, rows):
+        """
+        Crea varias reservas en una sola transacción, reservando una
+        habitación por reserva sin fechas con una sola actualización por
+        hotel. Si algún registro es inválido, repite un ID, su hotel no
+        existe o no alcanzan las habitaciones (considerando también las
+        reservas con fechas del mismo lote), no se crea ninguna y devuelve
+        False.
+        """
+        with _Scope() as repository:
+            table = repository.table(cls)
+            hotels = repository.table(Hotel)
+            seen = set()
+            batch = _BatchRooms(repository)
+
+            def check(row):
+                problems = cls.row_errors(row)
+                if problems:
+                    return problems
+                if row["reservation_id"] in table or row["reservation_id"] in seen:
+                    problems.append(f"ya existe el ID {row['reservation_id']}")
+                seen.add(row["reservation_id"])
+                hotel = hotels.get(row["hotel_id"])
+                if hotel is None:
+                    problems.append(f"no existe el hotel {row['hotel_id']}")
+                    return problems
+                try:
+                    if not batch.check(row, hotel):
+                        problems.append(
+                            f"no hay habitaciones disponibles en el hotel "
+                            f"{row['hotel_id']}"
+                        )
+                except ValueError as error:
+                    problems.append(str(error).removeprefix("Error: ").rstrip("."))
+                return problems
+
+            rows = cls.validate_rows(rows, check)
+            if rows is None:
+                return False
+            for hotel_id, count in batch.requested.items():
+                hotel = hotels[hotel_id]
+                repository.update(
+                    Hotel, hotel, "reserve",
+                    rooms_available=hotel.rooms_available - count
+                )
+            for row in rows:
+                repository.insert(cls, cls(**row))
+            return True
+
+    @classmethod
+    def delete_many(cls, keys):
+        """
+        Cancela varias reservas en una sola transacción y devuelve las
+        habitaciones de las reservas sin fechas con una sola actualización
+        por hotel. Si alguna no existe, no se cancela ninguna y devuelve
+        False.
+        """
+        with _Scope() as repository:
+            table = repository.table(cls)
+            keys = cls.validate_rows(keys, cls._existing_key_check(table))
+            if keys is None:
+                return False
+            released = {}
+            for key in keys:
+                res = repository.remove(cls, key, "cancel")
+                if res.check_in is None:
+                    released[res.hotel_id] = released.get(res.hotel_id, 0) + 1
+            for hotel_id, count in released.items():
+                Hotel.release_rooms(hotel_id, count)
+            return True
+
+    @classmethod
+    def cancel_reservation(cls, reservation_id):
+        """
+        Cancela una reserva y devuelve la habitación al hotel (o, si tiene
+        fechas, libera esas noches); devuelve True si la reserva existía.
+        """
+        with _Scope() as repository:
+            res = repository.remove(cls, reservation_id, "cancel")
+            if res is None:
+                print(f"⚠️ No se encontró la reserva {reservation_id}.")
+                return False
+            if res.check_in is None:
+                Hotel.release_rooms(res.hotel_id, 1)
+        print(f"✅ Reserva {reservation_id} cancelada correctamente.")
+        return True
@@ -3,10 +3,28 @@ Pruebas unitarias para el sistema de reservas de hotel.
 Usamos unittest para validar el comportamiento de las funciones principales.
 """
 
+import asyncio
 import unittest
+import io
 import os
 import json
-from hotel_system import Hotel, Customer, Reservation
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from unittest import mock
+from hotel_system import (
+    Hotel, Customer, Reservation, Repository, ConflictError, LOCK_PATH,
+    run_transaction, stay_nights
+)
+from hotel_service import BookingService
+
+
+def book_rooms(first_id, attempts):
+    """Intenta reservar attempts habitaciones del hotel 1 (en otro proceso)."""
+    with redirect_stdout(io.StringIO()):
+        for reservation_id in range(first_id, first_id + attempts):
+            Reservation.create_reservation(reservation_id, reservation_id, 1)
 
 
 class TestHotelSystem(unittest.TestCase):
@@ -122,6 +140,14 @@ class TestHotelSystem(unittest.TestCase):
         reservations = Reservation.load_reservations()
         self.assertEqual(len(reservations), 0)  # No debe cambiar nada
 
+    def test_create_duplicate_hotel(self):
+        """Prueba que no se creen dos hoteles con el mismo ID."""
+        self.assertTrue(Hotel.create_hotel(7, "Costa del Sol", "Tumbes", 8))
+        self.assertFalse(Hotel.create_hotel(7, "Otro Hotel", "Piura", 3))
+        hotels = Hotel.load_hotels()
+        self.assertEqual(len(hotels), 1)
+        self.assertEqual(hotels[0].name, "Costa del Sol")
+
     def test_load_invalid_json(self):
         """Prueba cargar un JSON corrupto."""
         with open(Hotel.FILE_PATH, "w", encoding="utf-8") as file:
@@ -130,6 +156,21 @@ class TestHotelSystem(unittest.TestCase):
         hotels = Hotel.load_hotels()
         self.assertEqual(len(hotels), 0)  # Debe manejar el error y devolver lista vacía
 
+    def test_load_duplicate_ids(self):
+        """Prueba que un archivo con IDs repetidos muestre una advertencia."""
+        rows = [
+            Hotel(8, "Costa del Sol", "Tumbes", 8).to_dict(),
+            Hotel(8, "Otro Hotel", "Piura", 3).to_dict(),
+        ]
+        with open(Hotel.FILE_PATH, "w", encoding="utf-8") as file:
+            json.dump(rows, file)
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            hotels = Hotel.load_hotels()
+        self.assertEqual([hotel.name for hotel in hotels], ["Costa del Sol"])
+        self.assertIn("repetidos con ID 8", output.getvalue())
+
     def tearDown(self):
         """Se ejecuta después de cada prueba para eliminar los archivos de prueba."""
         if os.path.exists(Hotel.FILE_PATH):
@@ -138,6 +179,609 @@ class TestHotelSystem(unittest.TestCase):
             os.remove(Customer.FILE_PATH)
         if os.path.exists(Reservation.FILE_PATH):
             os.remove(Reservation.FILE_PATH)
+        if os.path.exists(LOCK_PATH):
+            os.remove(LOCK_PATH)
+
+
+class RepositoryCase(unittest.TestCase):
+    """Base de las pruebas del repositorio: archivos vacíos y limpieza."""
+
+    def setUp(self):
+        """Se ejecuta antes de cada prueba para limpiar los datos."""
+        open(Hotel.FILE_PATH, "w").close()
+        open(Customer.FILE_PATH, "w").close()
+        open(Reservation.FILE_PATH, "w").close()
+
+    def tearDown(self):
+        """Se ejecuta después de cada prueba para eliminar los archivos de prueba."""
+        for entity_class in (Hotel, Customer, Reservation):
+            for file_path in (entity_class.FILE_PATH, entity_class.journal_path()):
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+        if os.path.exists(LOCK_PATH):
+            os.remove(LOCK_PATH)
+
+
+class TestSession(RepositoryCase):
+    """Pruebas de la sesión en memoria: commit, rollback, write-behind y concurrencia."""
+
+    def test_session_writes_on_commit(self):
+        """Prueba que los cambios se escriban solo al confirmar la sesión."""
+        with Repository() as repository:
+            Hotel.create_hotel(1, "JW Marriott", "Lima", 20)
+            Customer.create_customer(101, "Luis Rodríguez", "luis@email.com")
+            Reservation.create_reservation(2001, 101, 1)
+            self.assertEqual(Hotel.load_hotels()[0].rooms_available, 19)
+            self.assertEqual(os.stat(Hotel.FILE_PATH).st_size, 0)
+            self.assertTrue(repository.is_dirty())
+
+        self.assertEqual(Hotel.load_hotels()[0].rooms_available, 19)
+        self.assertEqual(len(Customer.load_customers()), 1)
+        self.assertEqual(Reservation.load_reservations()[0].hotel_id, 1)
+
+    def test_session_rollback_on_error(self):
+        """Prueba que una excepción descarte los cambios pendientes."""
+        with self.assertRaises(ValueError):
+            with Repository():
+                Hotel.create_hotel(2, "Casa Andina", "Arequipa", 10)
+                Hotel.reserve_room(999, 1)
+        self.assertEqual(len(Hotel.load_hotels()), 0)
+
+    def test_write_behind(self):
+        """Prueba que el temporizador escriba los cambios en segundo plano."""
+        with Repository(flush_interval=0.05) as repository:
+            Hotel.create_hotel(3, "Hotel Libertador", "Cusco", 5)
+            for _ in range(100):
+                if not repository.is_dirty():
+                    break
+                time.sleep(0.01)
+            with open(Hotel.FILE_PATH, "r", encoding="utf-8") as file:
+                self.assertEqual(json.load(file)[0]["hotel_id"], 3)
+
+    def test_write_behind_conflict_reported(self):
+        """
+        Prueba que un conflicto del commit en segundo plano se lance en el
+        siguiente commit en lugar de descartar los cambios en silencio.
+        """
+        Hotel.create_hotel(1, "JW Marriott", "Lima", 10)
+        repository = Repository(flush_interval=0.05)
+        hotel = repository.table(Hotel)[1]
+        Hotel.reserve_room(1, 4)
+        repository.update(Hotel, hotel, rooms_available=hotel.rooms_available - 1)
+        for _ in range(100):
+            if not repository.is_dirty():
+                break
+            time.sleep(0.01)
+        with self.assertRaises(ConflictError):
+            repository.commit()
+        repository.commit()
+        self.assertEqual(Hotel.load_hotels()[0].rooms_available, 6)
+
+        with self.assertRaises(ConflictError):
+            with Repository(flush_interval=0.05) as session:
+                hotel = session.table(Hotel)[1]
+                run_transaction(lambda: Hotel.reserve_room(1, 1))
+                session.update(Hotel, hotel, rooms_available=0)
+                for _ in range(100):
+                    if not session.is_dirty():
+                        break
+                    time.sleep(0.01)
+        self.assertEqual(Hotel.load_hotels()[0].rooms_available, 5)
+
+    def test_conflict_detected(self):
+        """Prueba que una sesión desactualizada no sobrescriba otro cambio."""
+        Hotel.create_hotel(1, "JW Marriott", "Lima", 10)
+        repository = Repository()
+        hotel = repository.table(Hotel)[1]
+        Hotel.reserve_room(1, 4)
+        repository.update(Hotel, hotel, rooms_available=hotel.rooms_available - 1)
+        with self.assertRaises(ConflictError):
+            repository.commit()
+        self.assertEqual(Hotel.load_hotels()[0].rooms_available, 6)
+
+    def test_failed_commit_discarded(self):
+        """
+        Prueba que si falla la escritura de un diario se quiten las
+        operaciones ya agregadas a otros y se descarte la sesión.
+        """
+        Hotel.create_hotel(1, "JW Marriott", "Lima", 10)
+        appended = []
+
+        def fail_second(entity_class):
+            append_journal = entity_class.append_journal
+
+            def append(operations):
+                appended.append(entity_class)
+                if len(appended) == 2:
+                    raise OSError("disco lleno")
+                append_journal(operations)
+            return append
+
+        with Repository(journal=True) as repository:
+            Reservation.create_reservation(2001, 101, 1)
+            with mock.patch.object(
+                    Hotel, "append_journal", side_effect=fail_second(Hotel)), \
+                    mock.patch.object(
+                        Reservation, "append_journal",
+                        side_effect=fail_second(Reservation)):
+                with self.assertRaises(OSError):
+                    repository.commit()
+            self.assertFalse(repository.is_dirty())
+            self.assertEqual(Hotel.get(1).rooms_available, 10)
+        self.assertEqual(len(appended), 2)
+        for entity_class in (Hotel, Reservation):
+            self.assertEqual(entity_class.read_journal(), [])
+        self.assertEqual(Hotel.load_hotels()[0].rooms_available, 10)
+        self.assertEqual(Reservation.load_reservations(), [])
+
+    def test_concurrent_booking_processes(self):
+        """Prueba que varios procesos reservando a la vez no sobrevendan."""
+        Hotel.create_hotel(1, "JW Marriott", "Lima", 10)
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            list(executor.map(book_rooms, range(1000, 5000, 1000), [6] * 4))
+        self.assertEqual(len(Reservation.load_reservations()), 10)
+        self.assertEqual(Hotel.load_hotels()[0].rooms_available, 0)
+
+    def test_concurrent_booking_threads(self):
+        """Prueba reservas en hilos con sesiones y reintentos por conflicto."""
+        Hotel.create_hotel(1, "JW Marriott", "Lima", 10)
+
+        def book(first_id):
+            for reservation_id in range(first_id, first_id + 6):
+                run_transaction(
+                    lambda reservation_id=reservation_id:
+                    Reservation.create_reservation(reservation_id, 1, 1),
+                    retries=100, journal=True
+                )
+
+        threads = [
+            threading.Thread(target=book, args=(first_id,))
+            for first_id in range(1000, 5000, 1000)
+        ]
+        with redirect_stdout(io.StringIO()):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(Reservation.load_reservations()), 10)
+        self.assertEqual(Hotel.load_hotels()[0].rooms_available, 0)
+
+
+class TestJournal(RepositoryCase):
+    """Pruebas del diario de operaciones y su compactación."""
+
+    def test_journal_replay(self):
+        """Prueba que el diario guarde las operaciones y se reproduzca al cargar."""
+        with Repository(journal=True):
+            Hotel.create_hotel(6, "Inkaterra Machu Picchu", "Machu Picchu", 10)
+            Reservation.create_reservation(4001, 105, 6)
+            Reservation.create_reservation(4002, 106, 6)
+            Reservation.cancel_reservation(4001)
+        self.assertEqual(os.stat(Hotel.FILE_PATH).st_size, 0)
+        with open(Reservation.journal_path(), "r", encoding="utf-8") as file:
+            operations = [json.loads(line)["op"] for line in file]
+        self.assertEqual(operations, ["create", "create", "cancel"])
+
+        self.assertEqual(Hotel.load_hotels()[0].rooms_available, 9)
+        reservations = Reservation.load_reservations()
+        self.assertEqual([res.reservation_id for res in reservations], [4002])
+
+    def test_journal_outside_session(self):
+        """Prueba el diario en operaciones sueltas con JOURNAL_BY_DEFAULT."""
+        with mock.patch("hotel_system.JOURNAL_BY_DEFAULT", True):
+            Hotel.create_hotel(7, "Costa del Sol", "Tumbes", 8)
+            Reservation.create_reservation(5001, 107, 7)
+        self.assertEqual(os.stat(Hotel.FILE_PATH).st_size, 0)
+        with open(Hotel.journal_path(), "r", encoding="utf-8") as file:
+            operations = [json.loads(line)["op"] for line in file]
+        self.assertEqual(operations, ["create", "reserve"])
+        self.assertEqual(Hotel.get(7).rooms_available, 7)
+
+    def test_save_on_fresh_repository(self):
+        """Prueba save_* sin cargar antes la clase, con y sin diario."""
+        for options in ({}, {"journal": True}):
+            with Repository(**options):
+                Hotel.save_hotels([Hotel(1, "JW Marriott", "Lima", 10)])
+                Customer.save_customers([Customer(101, "Ana", "ana@mail.com")])
+                Reservation.save_reservations([Reservation(1001, 101, 1)])
+            Hotel.save_hotels([Hotel(2, "Casa Andina", "Cusco", 5)])
+            Customer.save_customers([Customer(102, "Luis", "luis@mail.com")])
+            Reservation.save_reservations([Reservation(1002, 102, 2)])
+            self.assertEqual([hotel.hotel_id for hotel in Hotel.load_hotels()], [2])
+            self.assertEqual(Customer.get(102).name, "Luis")
+            self.assertEqual(Reservation.get(1002).hotel_id, 2)
+
+    def test_journal_compaction(self):
+        """Prueba que el diario se compacte en el archivo JSON."""
+        with Repository(journal=True, compact_every=3):
+            for hotel_id in range(1, 5):
+                Hotel.create_hotel(hotel_id, f"Hotel {hotel_id}", "Lima", 5)
+        self.assertFalse(os.path.exists(Hotel.journal_path()))
+        with open(Hotel.FILE_PATH, "r", encoding="utf-8") as file:
+            self.assertEqual(len(json.load(file)), 4)
+
+    def test_journal_torn_write(self):
+        """Prueba que una última línea incompleta del diario se descarte."""
+        with Repository(journal=True):
+            Hotel.create_hotel(1, "JW Marriott", "Lima", 20)
+        with open(Hotel.journal_path(), "a", encoding="utf-8") as file:
+            file.write('{"op": "create", "entity": {"hotel_id": 2')
+        self.assertEqual(len(Hotel.load_hotels()), 1)
+        with Repository(journal=True):
+            Hotel.reserve_room(1, 2)
+        self.assertEqual(Hotel.load_hotels()[0].rooms_available, 18)
+
+
+class TestIndexes(RepositoryCase):
+    """Pruebas de los índices secundarios y de ocupación por noche."""
+
+    def test_find_hotels_by_location(self):
+        """Prueba la búsqueda de hoteles por ubicación con disponibilidad."""
+        with Repository():
+            Hotel.create_hotel(1, "JW Marriott", "Lima", 20)
+            Hotel.create_hotel(2, "Belmond Miraflores Park", "Lima", 1)
+            Hotel.create_hotel(3, "Casa Andina", "Arequipa", 10)
+            self.assertEqual(len(Hotel.find_hotels_by_location("Lima")), 2)
+            Hotel.reserve_room(2, 1)
+            hotels = Hotel.find_hotels_by_location("Lima", min_rooms=1)
+            self.assertEqual([hotel.hotel_id for hotel in hotels], [1])
+            Hotel.modify_hotel(3, "Casa Andina", "Lima", 10)
+            self.assertEqual(len(Hotel.find_hotels_by_location("Lima")), 3)
+            self.assertEqual(Hotel.find_hotels_by_location("Arequipa"), [])
+
+    def test_find_reservations(self):
+        """Prueba la búsqueda de reservas por cliente y por hotel."""
+        with Repository():
+            Hotel.create_hotel(4, "Hotel Libertador", "Cusco", 5)
+            Hotel.create_hotel(5, "Tambo del Inka", "Urubamba", 5)
+            Reservation.create_reservation(3001, 104, 4)
+            Reservation.create_reservation(3002, 104, 5)
+            Reservation.create_reservation(3003, 105, 5)
+            by_customer = Reservation.find_reservations_by_customer(104)
+            self.assertEqual(len(by_customer), 2)
+            Reservation.cancel_reservation(3002)
+            by_hotel = Reservation.find_reservations_by_hotel(5)
+            self.assertEqual([res.reservation_id for res in by_hotel], [3003])
+            self.assertEqual(Hotel.get(5).rooms_available, 4)
+        self.assertEqual(len(Reservation.find_reservations_by_customer(104)), 1)
+
+    def test_dated_reservations(self):
+        """Prueba reservas con fechas y la disponibilidad por rango."""
+        Hotel.create_hotel(1, "JW Marriott", "Lima", 2)
+        Hotel.create_hotel(2, "Casa Andina", "Lima", 1)
+        with redirect_stdout(io.StringIO()):
+            self.assertTrue(Reservation.create_reservation(
+                1, 101, 1, "2030-03-03", "2030-03-07"))
+            self.assertTrue(Reservation.create_reservation(
+                2, 102, 1, "2030-03-05", "2030-03-09"))
+            self.assertFalse(Reservation.create_reservation(
+                3, 103, 1, "2030-03-06", "2030-03-07"))
+            self.assertTrue(Reservation.create_reservation(
+                4, 104, 1, "2030-03-07", "2030-03-08"))
+            with self.assertRaises(ValueError):
+                Reservation.create_reservation(5, 105, 1, "2030-03-08", "2030-03-08")
+
+        self.assertEqual(Hotel.get(1).rooms_available, 2)
+        self.assertEqual(Hotel.available_rooms(1, "2030-03-01", "2030-03-04"), 1)
+        self.assertEqual(Hotel.available_rooms(1, "2030-03-09", "2030-03-12"), 2)
+        hotels = Hotel.find_available_hotels("2030-03-05", "2030-03-07")
+        self.assertEqual([hotel.hotel_id for hotel in hotels], [2])
+        with redirect_stdout(io.StringIO()):
+            self.assertFalse(Hotel.reserve_room(1, 1))
+            Reservation.cancel_reservation(2)
+        self.assertEqual(Hotel.available_rooms(1, "2030-03-05", "2030-03-07"), 1)
+        self.assertEqual(Reservation.get(1).to_dict()["check_out"], "2030-03-07")
+
+    def test_stay_limits(self):
+        """Prueba que se rechacen estancias muy largas o fuera del rango."""
+        Hotel.create_hotel(1, "JW Marriott", "Lima", 2)
+        start, end = stay_nights("2030-01-01", "2030-12-31")
+        self.assertEqual(end - start, 364)
+        for check_in, check_out in (
+                ("0001-01-01", "9999-12-31"), ("2030-01-01", "2031-06-01"),
+                ("1999-12-31", "2000-01-02"), ("2099-12-31", "2100-01-02")):
+            with self.assertRaises(ValueError):
+                Hotel.available_rooms(1, check_in, check_out)
+        with redirect_stdout(io.StringIO()), self.assertRaises(ValueError):
+            Reservation.create_reservation(1, 101, 1, "2030-01-01", "2032-01-01")
+        self.assertEqual(Reservation.load_reservations(), [])
+
+    def test_undated_booking_skips_dates(self):
+        """Prueba que una reserva sin fechas no revise las reservas de otros hoteles."""
+        Hotel.create_hotel(1, "JW Marriott", "Lima", 2)
+        Hotel.create_hotel(2, "Casa Andina", "Lima", 2)
+        with redirect_stdout(io.StringIO()):
+            Reservation.create_reservation(1, 101, 2, "2030-03-03", "2030-03-07")
+            with mock.patch("hotel_storage.stay_nights") as nights:
+                self.assertTrue(Reservation.create_reservation(2, 102, 1))
+        nights.assert_not_called()
+        self.assertEqual(Hotel.get(1).rooms_available, 1)
+
+
+class TestBulk(RepositoryCase):
+    """Pruebas de las operaciones por lotes y de importación y exportación."""
+
+    def test_bulk_create_modify_delete(self):
+        """Prueba las operaciones en bloque y su validación todo o nada."""
+        hotels = [
+            {"hotel_id": hotel_id, "name": f"Hotel {hotel_id}",
+             "location": "Lima", "rooms_available": 5}
+            for hotel_id in range(1, 101)
+        ]
+        self.assertTrue(Hotel.create_many(hotels))
+        with redirect_stdout(io.StringIO()) as output:
+            self.assertFalse(Hotel.create_many([
+                {"hotel_id": 101, "name": "Nuevo", "location": "Cusco",
+                 "rooms_available": 3},
+                {"hotel_id": 1, "name": "Repetido", "location": "Lima",
+                 "rooms_available": "3"},
+            ]))
+        self.assertIn("Registro 2", output.getvalue())
+        self.assertEqual(len(Hotel.load_hotels()), 100)
+
+        self.assertTrue(Hotel.modify_many([
+            {"hotel_id": 1, "location": "Cusco"},
+            {"hotel_id": 2, "rooms_available": 0},
+        ]))
+        self.assertEqual(len(Hotel.find_hotels_by_location("Cusco")), 1)
+        with redirect_stdout(io.StringIO()):
+            self.assertFalse(Hotel.modify_many([{"hotel_id": 3, "hotel_id2": 1}]))
+            self.assertFalse(Hotel.delete_many([4, 999]))
+        self.assertTrue(Hotel.delete_many(range(50, 101)))
+        self.assertEqual(len(Hotel.load_hotels()), 49)
+
+    def test_bulk_reservations(self):
+        """Prueba reservas y cancelaciones en bloque sin sobrevender."""
+        Hotel.create_many([
+            {"hotel_id": 1, "name": "JW Marriott", "location": "Lima",
+             "rooms_available": 3},
+            {"hotel_id": 2, "name": "Casa Andina", "location": "Arequipa",
+             "rooms_available": 3},
+        ])
+        rows = [
+            {"reservation_id": reservation_id, "customer_id": 101,
+             "hotel_id": 1 + reservation_id % 2}
+            for reservation_id in range(1, 7)
+        ]
+        with redirect_stdout(io.StringIO()):
+            self.assertFalse(Reservation.create_many(rows + [
+                {"reservation_id": 7, "customer_id": 101, "hotel_id": 1}
+            ]))
+        self.assertEqual(Hotel.get(1).rooms_available, 3)
+        self.assertTrue(Reservation.create_many(rows))
+        self.assertEqual(Hotel.get(1).rooms_available, 0)
+        self.assertTrue(Reservation.delete_many([1, 3, 2]))
+        self.assertEqual(Hotel.get(1).rooms_available, 1)
+        self.assertEqual(Hotel.get(2).rooms_available, 2)
+        self.assertEqual(len(Reservation.load_reservations()), 3)
+
+    def test_bulk_dated_reservations(self):
+        """Prueba reservas en bloque con fechas dentro del mismo lote."""
+        Hotel.create_hotel(1, "JW Marriott", "Lima", 2)
+        rows = [
+            {"reservation_id": 1, "customer_id": 101, "hotel_id": 1,
+             "check_in": "2030-01-01", "check_out": "2030-01-05"},
+            {"reservation_id": 2, "customer_id": 102, "hotel_id": 1},
+            {"reservation_id": 3, "customer_id": 103, "hotel_id": 1,
+             "check_in": "2030-01-04", "check_out": "2030-01-06"},
+        ]
+        with redirect_stdout(io.StringIO()):
+            self.assertFalse(Reservation.create_many(rows))
+        self.assertTrue(Reservation.create_many(rows[:2]))
+        self.assertEqual(Hotel.get(1).rooms_available, 1)
+        self.assertEqual(Hotel.available_rooms(1, "2030-01-05", "2030-01-06"), 1)
+        self.assertTrue(Reservation.delete_many([1, 2]))
+        self.assertEqual(Hotel.available_rooms(1, "2030-01-01", "2030-01-06"), 2)
+
+    def test_import_export(self):
+        """Prueba importar y exportar clientes en CSV y JSON Lines."""
+        with open("customers_import.csv", "w", encoding="utf-8") as file:
+            file.write("customer_id,name,email\n")
+            file.writelines(
+                f"{customer_id},Cliente {customer_id},c{customer_id}@email.com\n"
+                for customer_id in range(1, 1001)
+            )
+        try:
+            self.assertTrue(Customer.import_file("customers_import.csv"))
+            self.assertEqual(Customer.get(500).name, "Cliente 500")
+            self.assertEqual(Customer.export_file("customers_export.jsonl"), 1000)
+            os.remove(Customer.FILE_PATH)
+            self.assertTrue(Customer.import_file("customers_export.jsonl"))
+            self.assertEqual(len(Customer.load_customers()), 1000)
+            with open("customers_import.csv", "a", encoding="utf-8") as file:
+                file.write("x,Sin ID,sin.id@email.com\n")
+            with redirect_stdout(io.StringIO()) as output:
+                self.assertFalse(Customer.import_file("customers_import.csv"))
+            self.assertIn("customer_id debe ser int", output.getvalue())
+        finally:
+            for file_path in ("customers_import.csv", "customers_export.jsonl"):
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+
+
+class TestBookingService(unittest.IsolatedAsyncioTestCase):
+    """Pruebas del servicio de reservas asíncrono."""
+
+    async def asyncSetUp(self):
+        """Inicia el servicio sobre archivos vacíos."""
+        open(Hotel.FILE_PATH, "w").close()
+        open(Customer.FILE_PATH, "w").close()
+        open(Reservation.FILE_PATH, "w").close()
+        Hotel.create_hotel(1, "JW Marriott", "Lima", 30)
+        self.service = BookingService()
+        server = await self.service.start()
+        self.port = server.sockets[0].getsockname()[1]
+
+    async def call(self, requests):
+        """Envía peticiones por una conexión y devuelve las respuestas."""
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        for request in requests:
+            writer.write(json.dumps(request).encode("utf-8") + b"\n")
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in requests]
+        writer.close()
+        await writer.wait_closed()
+        return responses
+
+    async def test_group_commit_without_overbooking(self):
+        """Prueba que reservas concurrentes se agrupen sin sobrevender."""
+        batches = [
+            [
+                {"id": reservation_id, "op": "reserve",
+                 "reservation_id": reservation_id, "customer_id": 101,
+                 "hotel_id": 1}
+                for reservation_id in range(first_id, first_id + 10)
+            ]
+            for first_id in range(1000, 6000, 1000)
+        ]
+        results = await asyncio.gather(*(self.call(batch) for batch in batches))
+        responses = [response for batch in results for response in batch]
+        self.assertEqual(sum(response["ok"] for response in responses), 30)
+        self.assertLess(self.service.commits, 30)
+
+        hotel, = await self.call([{"op": "hotel", "hotel_id": 1}])
+        self.assertEqual(hotel["result"]["rooms_available"], 0)
+        await self.service.close()
+        self.assertEqual(len(Reservation.load_reservations()), 30)
+
+    async def test_reads_and_errors(self):
+        """Prueba lecturas desde memoria y respuestas de error."""
+        responses = await self.call([
+            {"op": "hotels", "location": "Lima", "min_rooms": 1},
+            {"op": "reserve", "reservation_id": 1, "customer_id": 2,
+             "hotel_id": 999},
+            {"op": "reservations"},
+            {"op": "unknown"},
+        ])
+        self.assertEqual(responses[0]["result"][0]["name"], "JW Marriott")
+        self.assertFalse(responses[1]["ok"])
+        self.assertIn("no encontrado", responses[1]["error"])
+        self.assertIn("hotel_id", responses[2]["error"])
+        self.assertIn("desconocida", responses[3]["error"])
+
+    async def test_dated_booking(self):
+        """Prueba reservas con fechas y consultas de disponibilidad."""
+        responses = await self.call([
+            {"op": "reserve", "reservation_id": 1, "customer_id": 2,
+             "hotel_id": 1, "check_in": "2030-05-01", "check_out": "2030-05-03"},
+        ])
+        self.assertTrue(responses[0]["ok"])
+        responses = await self.call([
+            {"op": "available", "check_in": "2030-05-02",
+             "check_out": "2030-05-04", "rooms": 30},
+            {"op": "available", "check_in": "2030-05-03",
+             "check_out": "2030-05-04", "rooms": 30, "location": "Lima"},
+        ])
+        self.assertEqual(responses[0]["result"], [])
+        self.assertEqual(len(responses[1]["result"]), 1)
+
+    async def test_invalid_requests(self):
+        """Prueba que peticiones mal formadas se respondan sin cambiar datos."""
+        responses = await self.call([
+            [1, 2],
+            {"op": "reserve", "reservation_id": [1], "customer_id": 2,
+             "hotel_id": 1},
+            {"op": "create_hotel", "hotel_id": 2, "name": "Hilton",
+             "location": "Lima", "rooms_available": "abc"},
+            {"op": "hotel", "hotel_id": [1]},
+            {"op": "hotel", "hotel_id": 1},
+            {"op": "hotel", "hotel_id": 2},
+        ])
+        self.assertIn("objeto JSON", responses[0]["error"])
+        self.assertIn("reservation_id debe ser int", responses[1]["error"])
+        self.assertIn("rooms_available debe ser int", responses[2]["error"])
+        self.assertFalse(responses[3]["ok"])
+        self.assertEqual(responses[4]["result"]["rooms_available"], 30)
+        self.assertIsNone(responses[5]["result"])
+
+    async def test_failed_write_restored(self):
+        """Prueba que una escritura que falla a medias se deshaga."""
+        with mock.patch.object(Reservation, "add", side_effect=RuntimeError("falla")):
+            responses = await self.call([
+                {"op": "reserve", "reservation_id": 1, "customer_id": 2,
+                 "hotel_id": 1},
+            ])
+        self.assertIn("RuntimeError", responses[0]["error"])
+        responses = await self.call([
+            {"op": "reserve", "reservation_id": 2, "customer_id": 2,
+             "hotel_id": 1},
+        ])
+        self.assertTrue(responses[0]["ok"])
+        responses = await self.call([{"op": "hotel", "hotel_id": 1}])
+        self.assertEqual(responses[0]["result"]["rooms_available"], 29)
+        await self.service.close()
+        self.assertEqual(Hotel.load_hotels()[0].rooms_available, 29)
+        self.assertEqual(len(Reservation.load_reservations()), 1)
+
+    async def test_commit_error_rolled_back(self):
+        """
+        Prueba que una falla de disco al confirmar se responda como error y
+        que el siguiente commit no escriba los cambios fallidos.
+        """
+        with mock.patch.object(
+                Reservation, "append_journal", side_effect=OSError("disco lleno")):
+            responses = await self.call([
+                {"op": "reserve", "reservation_id": 1, "customer_id": 2,
+                 "hotel_id": 1},
+            ])
+        self.assertFalse(responses[0]["ok"])
+        self.assertIn("disco lleno", responses[0]["error"])
+
+        responses = await self.call([
+            {"op": "create_customer", "customer_id": 2, "name": "Ana",
+             "email": "ana@example.com"},
+        ])
+        self.assertTrue(responses[0]["ok"])
+        responses = await self.call([
+            {"op": "hotel", "hotel_id": 1},
+            {"op": "reservations", "hotel_id": 1},
+        ])
+        self.assertEqual(responses[0]["result"]["rooms_available"], 30)
+        self.assertEqual(responses[1]["result"], [])
+        await self.service.close()
+        self.assertEqual(Reservation.load_reservations(), [])
+        self.assertEqual(Hotel.load_hotels()[0].rooms_available, 30)
+        self.assertEqual(len(Customer.load_customers()), 1)
+
+    async def test_reads_during_commit(self):
+        """Prueba que las lecturas se respondan mientras un commit escribe."""
+        started, release = threading.Event(), threading.Event()
+        append_journal = Customer.append_journal
+
+        def slow_append(operations):
+            started.set()
+            release.wait(5)
+            append_journal(operations)
+
+        loop = asyncio.get_running_loop()
+        with mock.patch.object(Customer, "append_journal", side_effect=slow_append):
+            write = asyncio.ensure_future(self.call([
+                {"op": "create_customer", "customer_id": 5, "name": "Luis",
+                 "email": "luis@example.com"},
+            ]))
+            await loop.run_in_executor(None, started.wait, 5)
+            try:
+                responses = await asyncio.wait_for(self.call([
+                    {"op": "hotel", "hotel_id": 1},
+                    {"op": "customer", "customer_id": 5},
+                ]), 2)
+                self.assertFalse(write.done())
+            finally:
+                release.set()
+            written = await write
+        self.assertEqual(responses[0]["result"]["name"], "JW Marriott")
+        self.assertEqual(responses[1]["result"]["name"], "Luis")
+        self.assertTrue(written[0]["ok"])
+
+    async def asyncTearDown(self):
+        """Detiene el servicio y elimina los archivos de prueba."""
+        await self.service.close()
+        for entity_class in (Hotel, Customer, Reservation):
+            for file_path in (entity_class.FILE_PATH, entity_class.journal_path()):
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+        if os.path.exists(LOCK_PATH):
+            os.remove(LOCK_PATH)
 
 
 if __name__ == "__main__":